@@ -0,0 +1,443 @@
+from collections import Counter
+from itertools import groupby, repeat
+from typing import Iterator, Tuple
+from AVLTree.AVLTree import AVLTree, LeanNode, Node, Q, Iq
+from AVLTree.EytzingerTree import dump_keys, load_keys
+from AVLTree.FrozenAVLTree import FrozenAVLTree
+"""Sorted multiset built on AVLTree, copies of an item counted on a single node.
+
+"""
+
+
+class LeanCountedNode(LeanNode):
+
+    """LeanNode counting the copies of its data.
+
+    """
+
+    __slots__ = ('count',)
+
+    def __init__(self, data: Q, count: int = 1) -> None:
+        """Instantiates LeanCountedNode object for AVLMultiset.
+
+        :param data: int, float, str.
+        :param count: Number of copies of data.
+        """
+        self.data = data
+        self.count = count
+        self.left = None
+        self.right = None
+        self.tallness = 1
+        self.size = 1
+
+    def _replace_data(self, cur_node: 'LeanCountedNode', source: 'LeanCountedNode') -> None:
+        """Gives cur_node the data and count of source.
+
+        :param cur_node: Node receiving data and count.
+        :param source: Node providing data and count.
+        """
+        cur_node.data = source.data
+        cur_node.count = source.count
+
+    def union(self, first: 'LeanCountedNode', second: 'LeanCountedNode') -> 'LeanCountedNode':
+        """Merges two sub-trees into one holding the larger count of each item, made of first's nodes where both
+        hold an item.
+
+        :param first: Root of sub-tree, or None.
+        :param second: Root of sub-tree, or None.
+        :return: Root of the union.
+        """
+        if not first:
+            return second
+        if not second:
+            return first
+        left, found, right = self.split(second, first.data)
+        if found:
+            first.count = max(first.count, found.count)
+        left = self.union(first.left, left)
+        right = self.union(first.right, right)
+        return self.join(left, first, right)
+
+    def intersection(self, first: 'LeanCountedNode', second: 'LeanCountedNode') -> 'LeanCountedNode':
+        """Merges two sub-trees into one holding the smaller count of each item found in both.
+
+        :param first: Root of sub-tree, or None.
+        :param second: Root of sub-tree, or None.
+        :return: Root of the intersection, or None.
+        """
+        if not first or not second:
+            return None
+        left, found, right = self.split(second, first.data)
+        left = self.intersection(first.left, left)
+        right = self.intersection(first.right, right)
+        if found:
+            first.count = min(first.count, found.count)
+            return self.join(left, first, right)
+        return self.join2(left, right)
+
+    def difference(self, first: 'LeanCountedNode', second: 'LeanCountedNode') -> 'LeanCountedNode':
+        """Subtracts second's count of each item from first's, dropping items left with no copies.
+
+        :param first: Root of sub-tree, or None.
+        :param second: Root of sub-tree, or None.
+        :return: Root of the difference, or None.
+        """
+        if not first or not second:
+            return first
+        left, found, right = self.split(first, second.data)
+        left = self.difference(left, second.left)
+        right = self.difference(right, second.right)
+        if found and found.count > second.count:
+            found.count -= second.count
+            return self.join(left, found, right)
+        return self.join2(left, right)
+
+    def symmetric_difference(self, first: 'LeanCountedNode', second: 'LeanCountedNode') -> 'LeanCountedNode':
+        """Merges two sub-trees into one holding each item as many times as its counts differ.
+
+        :param first: Root of sub-tree, or None.
+        :param second: Root of sub-tree, or None.
+        :return: Root of the symmetric difference, or None.
+        """
+        if not first:
+            return second
+        if not second:
+            return first
+        left, found, right = self.split(second, first.data)
+        left = self.symmetric_difference(first.left, left)
+        right = self.symmetric_difference(first.right, right)
+        if found:
+            if found.count == first.count:
+                return self.join2(left, right)
+            first.count = abs(first.count - found.count)
+        return self.join(left, first, right)
+
+
+class CountedNode(Node):
+
+    """Node counting the copies of its data.
+
+    """
+
+    __slots__ = ('count',)
+
+    def __init__(self, data: Q, count: int = 1) -> None:
+        """Instantiates CountedNode object for AVLMultiset.
+
+        :param data: int, float, str.
+        :param count: Number of copies of data.
+        """
+        self.data = data
+        self.count = count
+        self.parent = None
+        self.left = None
+        self.right = None
+        self.tallness = 1
+        self.size = 1
+
+    _replace_data = LeanCountedNode._replace_data
+    union = LeanCountedNode.union
+    intersection = LeanCountedNode.intersection
+    difference = LeanCountedNode.difference
+    symmetric_difference = LeanCountedNode.symmetric_difference
+
+
+class AVLMultiset(AVLTree):
+
+    """Sorted multiset. Each distinct item has one node, counting its copies, so a repeat costs no new node.
+
+    len, iteration, dump and freeze take every copy into account. Size, order statistics (rank, select, tree[i],
+    islice, count_range), batch lookups and join work on distinct items. split reports the copies of the item split
+    around. Set algebra works on counts as collections.Counter does: union keeps the larger count of each item,
+    intersection the smaller, difference subtracts counts and symmetric_difference keeps how far they differ.
+    split, join and set algebra restructure the tree as AVLTree's do, then count the copies of each result in O(n),
+    as nodes keep the copies of their own item, not of their sub-tree.
+
+    """
+
+    def __init__(self, data: Iq = None, parent_pointers: bool = True) -> None:
+        """Multiset is represented by its root node, initially None, and its number of copies.
+
+            Create a new multiset:
+                bag = AVLMultiset()
+                bag = AVLMultiset(data)
+
+            Count copies:
+                bag.insert(data)  # adds a copy
+                bag.count(data)  # number of copies
+                bag.remove_one(data), bag.delete(data)  # removes a copy
+                bag.remove_all(data)  # removes every copy
+                len(bag)  # number of copies of all items
+                bag.irange_counts(low, high)  # (item, count) pairs from low to high
+
+        :param data: Optional iterable of data to insert, repeats included.
+        :param parent_pointers: Set to False to build the multiset from LeanCountedNodes.
+        """
+        super().__init__(parent_pointers=parent_pointers)
+        self.node_type = CountedNode if parent_pointers else LeanCountedNode
+        self.total = 0
+        if data is not None:
+            self.insert_many(data)
+
+    def __len__(self) -> int:
+        return self.total
+
+    @classmethod
+    def from_sorted(cls, data: Iq, parent_pointers: bool = True) -> 'AVLMultiset':
+        """Creates a perfectly balanced multiset from data in ascending order in O(n), counting repeats.
+
+        :param data: Iterable[int, float, str] in ascending order.
+        :param parent_pointers: Passed to AVLMultiset.
+        :return: New multiset holding data.
+        """
+        runs = [(x, sum(1 for _ in run)) for x, run in groupby(data)]
+        tree = super().from_sorted((x for x, _ in runs), parent_pointers)
+        for cur_node, (_, count) in zip(tree._in_order_nodes(), runs):
+            cur_node.count = count
+        tree.total = sum(count for _, count in runs)
+        return tree
+
+    @classmethod
+    def from_iterable(cls, data: Iq, parent_pointers: bool = True) -> 'AVLMultiset':
+        """Creates a perfectly balanced multiset from data in any order, counting repeats.
+
+        :param data: Iterable[int, float, str].
+        :param parent_pointers: Passed to AVLMultiset.
+        :return: New multiset holding data.
+        """
+        counts = Counter(data)
+        tree = cls(parent_pointers=parent_pointers)
+        tree._build([tree.node_type(x, counts[x]) for x in sorted(counts)])
+        return tree
+
+    def _build(self, nodes: list) -> None:
+        """Replaces the multiset's contents with a perfectly balanced tree of nodes, counting their copies.
+
+        :param nodes: Nodes of distinct data in ascending order.
+        """
+        super()._build(nodes)
+        self.total = sum(cur_node.count for cur_node in nodes)
+
+    def _adopt(self, root: 'CountedNode') -> 'AVLMultiset':
+        """Wraps a detached sub-tree in a new multiset, counting its copies in O(n).
+
+        :param root: Root of sub-tree, or None.
+        :return: New multiset.
+        """
+        tree = super()._adopt(root)
+        tree.total = sum(cur_node.count for cur_node in tree._in_order_nodes())
+        return tree
+
+    def dump(self, path: str) -> None:
+        """Writes every copy of the multiset's data to path, as AVLTree.dump does.
+
+        :param path: File to write.
+        """
+        dump_keys(path, list(self))
+
+    @classmethod
+    def load(cls, path: str, parent_pointers: bool = True) -> 'AVLMultiset':
+        """Creates a perfectly balanced multiset from a file written by dump in O(n), counting repeats.
+
+        :param path: File written by dump.
+        :param parent_pointers: Passed to AVLMultiset.
+        :return: New multiset holding the file's data.
+        """
+        return cls.from_sorted(load_keys(path), parent_pointers)
+
+    def freeze(self) -> FrozenAVLTree:
+        """Copies every copy of the multiset's data into an immutable tree, as AVLTree.freeze does.
+
+        :return: FrozenAVLTree holding the multiset's data.
+        """
+        return FrozenAVLTree(list(self))
+
+    def split(self, data: Q) -> tuple:
+        """Splits multiset around data as AVLTree.split does, then counts the copies on each side in O(n).
+
+        :param data: Data to split around, need not be in multiset.
+        :return: (multiset of items < data, number of copies of data, multiset of items > data)
+        """
+        copies = self.count(data)
+        left, _, right = super().split(data)
+        return left, copies, right
+
+    def count(self, data: Q) -> int:
+        """Counts copies of data in O(log n).
+
+        :param data: Data to be counted, need not be in multiset.
+        :return: int. Number of copies.
+        """
+        cur_node = self._find_node(self.root, data)
+        return cur_node.count if cur_node else 0
+
+    def _insert(self, root: 'CountedNode', data: Q, copies: int = 1) -> None:
+        """Adds copies of data, on data's node if it is already in multiset.
+
+        :param root: Root node.
+        :param data: Data to be inserted.
+        :param copies: Number of copies to add.
+        """
+        self.total += copies
+        if not root:
+            self.root = self.min_node = self.max_node = self.node_type(data, copies)
+            self.size += 1
+            self.counts['insertions'] += 1
+            return
+
+        repeated_data = []
+        self.root = root.insert(root, data, repeated_data, copies, counts=self.counts)
+        if repeated_data:
+            repeated_data[0].count += copies
+        else:
+            self.size += 1
+            self._extend_extremes(data)
+
+    def insert_many(self, data: Iq) -> int:
+        """Adds every copy in a batch of data.
+
+        Copies are counted first, so each distinct item costs one descent, or one step of a rebuild, however many
+        copies of it the batch holds.
+
+        :param data: Iterable[int, float, str].
+        :return: Number of copies inserted.
+        """
+        counts = Counter(data)
+        before = self.total
+        self._insert_batch(sorted(counts), counts)
+        return self.total - before
+
+    def _insert_batch(self, batch: list, values: dict = None) -> int:
+        """Adds copies of distinct data in ascending order, one item at a time or by rebuilding as in
+        AVLTree.insert_many. Copies of items already in multiset are added to their nodes.
+
+        :param batch: Distinct data in ascending order.
+        :param values: dict of each item of batch to its number of copies.
+        :return: Number of items inserted, ie. not already in multiset.
+        """
+        before = self.size
+        if not self._rebuild_pays(len(batch)):
+            for x in batch:
+                self._insert(self.root, x, values[x])
+            return self.size - before
+
+        merged = []
+        i = 0
+        for cur_node in self._in_order_nodes():
+            while i < len(batch) and batch[i] < cur_node.data:
+                merged.append(self.node_type(batch[i], values[batch[i]]))
+                i += 1
+            if i < len(batch) and batch[i] == cur_node.data:
+                cur_node.count += values[batch[i]]
+                i += 1
+            merged.append(cur_node)
+        merged.extend(self.node_type(x, values[x]) for x in batch[i:])
+        self._build(merged)
+        return self.size - before
+
+    def delete(self, data: Q) -> None:
+        """Removes a copy of data. Alerts user if data is not in multiset.
+
+        :param data: Data to delete.
+        """
+        if not self.remove_one(data):
+            print(f'{data} not in tree, Cannot delete.')
+
+    def remove_one(self, data: Q) -> bool:
+        """Removes a copy of data, and data's node with its last copy.
+
+        :param data: Data to remove.
+        :return: True if data was in multiset, else, False.
+        """
+        nodes = []
+        cur_node = self._find_node(self.root, data, nodes)
+        if not cur_node:
+            return False
+        self.total -= 1
+        if cur_node.count > 1:
+            cur_node.count -= 1
+        else:
+            self.size -= 1
+            self._delete(cur_node, nodes)
+        return True
+
+    def remove_all(self, data: Q) -> int:
+        """Removes every copy of data.
+
+        :param data: Data to remove.
+        :return: Number of copies removed.
+        """
+        nodes = []
+        cur_node = self._find_node(self.root, data, nodes)
+        if not cur_node:
+            return 0
+        copies = cur_node.count
+        self.total -= copies
+        self.size -= 1
+        self._delete(cur_node, nodes)
+        return copies
+
+    def delete_many(self, data: Iq) -> int:
+        """Removes a copy per item in a batch of data. Data not in multiset is ignored silently.
+
+        Nodes left with no copies are deleted as in AVLTree.delete_many.
+
+        :param data: Iterable[int, float, str].
+        :return: Number of copies removed.
+        """
+        before = self.total
+        removed = 0
+        emptied = []
+        for x, copies in Counter(data).items():
+            cur_node = self._find_node(self.root, x)
+            if not cur_node:
+                continue
+            if cur_node.count > copies:
+                cur_node.count -= copies
+                removed += copies
+            else:
+                emptied.append(x)
+                removed += cur_node.count
+        super().delete_many(emptied)
+        self.total = before - removed
+        return removed
+
+    def _pop_edge(self, rightmost: bool) -> 'CountedNode':
+        """Removes a copy of the smallest or largest item, and its node with its last copy.
+
+        :param rightmost: Removes a copy of the largest item if True, else the smallest.
+        :return: Node of the item removed.
+        """
+        cur_node = self.max_node if rightmost else self.min_node
+        if not cur_node:
+            raise ValueError('Tree is empty.')
+        self.total -= 1
+        if cur_node.count > 1:
+            cur_node.count -= 1
+            return cur_node
+        return super()._pop_edge(rightmost)
+
+    def clear_tree(self) -> None:
+        """Clears multiset of all data.
+
+        """
+        super().clear_tree()
+        self.total = 0
+
+    def irange(self, low: Q = None, high: Q = None, inclusive: tuple = (True, True),
+               reverse: bool = False) -> Iterator[Q]:
+        """Yields every copy of data between low and high lazily. Parameters as in AVLTree.irange.
+
+        :return: Iterator over data in range.
+        """
+        for cur_node in self._irange_nodes(low, high, inclusive, reverse):
+            yield from repeat(cur_node.data, cur_node.count)
+
+    def irange_counts(self, low: Q = None, high: Q = None, inclusive: tuple = (True, True),
+                      reverse: bool = False) -> Iterator[Tuple[Q, int]]:
+        """Yields (item, count) for distinct data between low and high lazily. Parameters as in AVLTree.irange.
+
+        :return: Iterator over items in range and their counts.
+        """
+        for cur_node in self._irange_nodes(low, high, inclusive, reverse):
+            yield cur_node.data, cur_node.count
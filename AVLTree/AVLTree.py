@@ -1,4 +1,12 @@
-from typing import TypeVar, Any, Iterable
+from collections import Counter
+from typing import TypeVar, Any, Iterable, Iterator
+from AVLTree.BalancedTree import BalancedTree
+from AVLTree.EytzingerTree import dump_keys, load_keys
+from AVLTree.FrozenAVLTree import FrozenAVLTree
+try:
+    import numpy as np
+except ImportError:
+    np = None
 """AVLTree/Balanced Binary Search Tree Data structure.
 
 Thanks for checking out my implementation of a BBST. Feel free to use it and/or change it to better suit your needs.
@@ -10,32 +18,47 @@ Q = TypeVar('Q', int, float, str)  # Q for qualitative.
 Iq = Iterable[Q]  # Iterable/qualitative.
 
 
-class Node(object):
+class LeanNode(object):
 
-    """Node object for AVLTree.
+    """Node object for AVLTree without a parent pointer.
 
     Node class is wrapped by AVLTree class. All user methods are exposed there.
     Methods for printing, searching, inserting, deleting and determining height of AVLTree provided.
 
+    Attributes are kept in __slots__ rather than a per-instance __dict__. Tallness stays well within CPython's cached
+    small ints, so it costs no more than the pointer to it.
+
+    Size is the number of nodes in the sub-tree rooted at the node, used for rank and select.
+
+    Insertion and deletion retrace along the path walked down from the root, so no parent pointer is needed.
+    Node extends LeanNode with a parent pointer for code that needs to walk up the tree.
+
     """
 
+    __slots__ = ('data', 'left', 'right', 'tallness', 'size')
+
+    parent = None
+    parented = False
+
     def __init__(self, data: Q) -> None:
-        """Instantiates Node object for AVLTree.
+        """Instantiates LeanNode object for AVLTree.
 
         Data assumed to be compatible with <, =, > operators.
 
-        Parent, left and right are pointers to parent and child nodes.
+        Left and right are pointers to child nodes.
 
         Tallness initialized at 1, adjusted with insert and delete to represent height of node. Null nodes have
         height of 0.
 
+        Size initialized at 1, adjusted with insert and delete to represent the number of nodes in the sub-tree.
+
         :param data: int, float, str.
         """
         self.data = data
-        self.parent = None
         self.left = None
         self.right = None
         self.tallness = 1
+        self.size = 1
 
     def __repr__(self) -> str:
         """Prints text representation of tree
@@ -81,7 +104,7 @@ class Node(object):
     def print_tree(self, cur_node: 'Node', order: str = None) -> None:
         """Prints tree in specified order to stdout.
 
-        :param cur_node: Root node from Tree.get_root.
+        :param cur_node: Root node.
         :param order: Keyword arg for order of tree traversal.
         """
         if order == 'pre-order':
@@ -146,82 +169,129 @@ class Node(object):
     def search(self, cur_node: 'Node', data: Q) -> bool:
         """Searches tree for data, returns bool.
 
+        Walks down from cur_node in a loop, no recursion.
+
         :param cur_node: Root of tree.
         :param data: Data to be found in tree.
         :return: bool. True if data in tree, else, False.
         """
-        if data == cur_node.data:
-            return True
-        elif data < cur_node.data and cur_node.left:
-            return self.search(cur_node.left, data)
-        elif data > cur_node.data and cur_node.right:
-            return self.search(cur_node.right, data)
+        while cur_node:
+            if data < cur_node.data:
+                cur_node = cur_node.left
+            elif data > cur_node.data:
+                cur_node = cur_node.right
+            else:
+                return True
         return False
 
-    def insert(self, cur_node: 'Node', data: Q, repeated_data: list) -> list:
+    def insert(self, cur_node: 'Node', data: Q, repeated_data: list, *fields: Any, counts: Counter = None) -> 'Node':
         """Inserts data into tree. Alerts user if data already exists in tree.
 
-        Calls _inspect_insertion to determine if insertion caused tree imbalance.
+        Walks down from cur_node in a loop, recording the path taken.
+        Sizes of nodes on the path are incremented once the new node is linked in.
+        Calls _inspect_insertion with the path to determine if insertion caused tree imbalance.
 
         :param cur_node: Root of tree.
         :param data: int, float, str.
-        :param repeated_data: Empty list. Added to if data is already in the tree.
+        :param repeated_data: Empty list. The node holding data is added to it if data is already in the tree.
+        :param fields: Further arguments for the new node, eg. a MapNode's value.
+        :param counts: Optional Counter of the tree's rotations and path length, see AVLTree.stats.
+        :return: Root of tree after insertion.
         """
-        if data < cur_node.data:
-            if not cur_node.left:
-                cur_node.left = Node(data)
-                cur_node.left.parent = cur_node
-                self._inspect_insertion(cur_node.left, [])
-            else:
-                self.insert(cur_node.left, data, repeated_data)
-            return repeated_data
-
-        elif data > cur_node.data:
-            if not cur_node.right:
-                cur_node.right = Node(data)
-                cur_node.right.parent = cur_node
-                self._inspect_insertion(cur_node.right, [])
+        root = cur_node
+        path = []
+        while True:
+            path.append(cur_node)
+            if data < cur_node.data:
+                if not cur_node.left:
+                    cur_node.left = self.__class__(data, *fields)
+                    if self.parented:
+                        cur_node.left.parent = cur_node
+                    for ancestor in path:
+                        ancestor.size += 1
+                    return self._inspect_insertion(cur_node.left, path, counts)
+                cur_node = cur_node.left
+
+            elif data > cur_node.data:
+                if not cur_node.right:
+                    cur_node.right = self.__class__(data, *fields)
+                    if self.parented:
+                        cur_node.right.parent = cur_node
+                    for ancestor in path:
+                        ancestor.size += 1
+                    return self._inspect_insertion(cur_node.right, path, counts)
+                cur_node = cur_node.right
+
+            # If many repeat values are expected and printing the occurrence is a nuisance,
+            # toggle commenting on print statement.
             else:
-                self.insert(cur_node.right, data, repeated_data)
-            return repeated_data
+                repeated_data.append(cur_node)
+                # print(f'{data} already in tree. Cannot insert.')
+                return root
 
-        # If many repeat values are expected and printing the occurrence is a nuisance,
-        # toggle commenting on print statement.
-        elif data == cur_node.data and cur_node.parent is not None:
-            repeated_data += [1]
-            # print(f'{data} already in tree. Cannot insert.')
-            return repeated_data
-
-    def _inspect_insertion(self, cur_node: 'Node', nodes: list) -> None:
+    def _inspect_insertion(self, cur_node: 'Node', nodes: list, counts: Counter = None) -> 'Node':
         """ Determines if insertion creates need to balance sub-tree.
 
-        Rebalance needed if difference in height of child nodes is > 1.
-        Creates list of nodes to be rotated if above condition is true.
-        Calls _rebalance_node with nodes to be balanced.
+        Retraces the path from the newly inserted node towards the root, updating heights on the way.
+        Rebalance needed if difference in height of child nodes is > 1. A single (double) rotation restores the
+        height the sub-tree had before the insertion, so retracing ends there.
+        Retracing also ends as soon as a node's height is unchanged, as no node above it can be affected.
 
         :param cur_node: The newly inserted node.
-        :param nodes: Empty list.
-        :return:
+        :param nodes: Path of nodes from the root down to the parent of cur_node.
+        :param counts: Optional Counter of the tree's rotations and path length. The insertion, the new node's depth
+            and the number of nodes retraced are added.
+        :return: Root of tree, which changes if the rotation happened there.
         """
-        if not cur_node.parent:
-            return
+        root = nodes[0]
+        depth = len(nodes)
+        child, grandchild = cur_node, None
+        while nodes:
+            parent = nodes.pop()
+            left = self._get_height(parent.left)
+            right = self._get_height(parent.right)
+
+            if abs(left - right) > 1:
+                top = self._rebalance_node(parent, child, grandchild, counts)
+                if nodes:
+                    self._replace_child(nodes[-1], parent, top)
+                else:
+                    root = top
+                break
 
-        nodes = [cur_node] + nodes
+            new = 1 + max(left, right)
+            if new == parent.tallness:
+                break
+            parent.tallness = new
+            child, grandchild = parent, child
 
-        left = self._get_height(cur_node.parent.left)
-        right = self._get_height(cur_node.parent.right)
+        if counts is not None:
+            counts['insertions'] += 1
+            counts['path_length'] += depth
+            counts['retraced'] += depth - len(nodes)
+        return root
 
-        if abs(left - right) > 1 and len(nodes) > 1:
-            nodes = [cur_node.parent] + nodes
-            self._rebalance_node(*nodes[:3])
-            return
+    def _replace_child(self, cur_node: 'Node', old: 'Node', new: 'Node') -> None:
+        """Replaces the child old of cur_node with new.
 
-        new = 1 + cur_node.tallness
+        :param cur_node: Parent of old.
+        :param old: Child to be replaced.
+        :param new: Node taking old's place, or None.
+        """
+        if cur_node.left is old:
+            cur_node.left = new
+        else:
+            cur_node.right = new
 
-        if new > cur_node.parent.tallness:
-            cur_node.parent.tallness = new
+    def _get_size(self, cur_node: 'Node') -> int:
+        """ Gets size of cur_node's sub-tree. Returns 0 if node is None else returns node.size.
 
-        self._inspect_insertion(cur_node.parent, nodes)
+        :param cur_node: Node
+        :return: Node.size
+        """
+        if not cur_node:
+            return 0
+        return cur_node.size
 
     def _get_height(self, cur_node: 'Node') -> int:
         """ Gets height of cur_node. Returns 0 if node is None else returns node.tallness.
@@ -233,22 +303,32 @@ class Node(object):
             return 0
         return cur_node.tallness
 
-    def _rebalance_node(self, z: 'Node', y: 'Node', x: 'Node') -> None:
+    def _rebalance_node(self, z: 'Node', y: 'Node', x: 'Node', counts: Counter = None) -> 'Node':
         """Determines orientation of imbalanced nodes and calls indicated balancing methods.
 
         Calls _rotate_right or _rotate_left as determined by orientation of unbalanced nodes.
+        The caller links the returned sub-tree root to z's former parent.
+
+        The path length of a tree, the sum of its nodes' depths, equals the sum of its nodes' sizes less their
+        number. A rotation only changes the sizes of z, y and x, and the new top takes z's, so the change in path
+        length is found from those three sizes alone.
 
         :param z: Highest node. Rebalance occurs 'around' this node.
         :param y: Child of z
         :param x: Child of y
+        :param counts: Optional Counter. The rotation is counted by type, and the change in path length added.
+        :return: New root of the rebalanced sub-tree.
         """
+        if counts is not None:
+            before = y.size + x.size
         if y == z.left and x == y.left:
             """    z
                   /
                  y
                 /
                x   """
-            self._right_rotate(z)
+            kind = 'right'
+            top = self._right_rotate(z)
 
         elif y == z.left and x == y.right:
             """   z
@@ -256,8 +336,9 @@ class Node(object):
                 y 
                  \
                   x  """
-            self._left_rotate(y)
-            self._right_rotate(z)
+            kind = 'left_right'
+            z.left = self._left_rotate(y)
+            top = self._right_rotate(z)
 
         elif y == z.right and x == y.right:
             """   z
@@ -265,7 +346,8 @@ class Node(object):
                      y 
                       \
                         x  """
-            self._left_rotate(z)
+            kind = 'left'
+            top = self._left_rotate(z)
 
         elif y == z.right and x == y.left:
             """   z
@@ -273,13 +355,19 @@ class Node(object):
                       y
                     /
                   x  """
-            self._right_rotate(y)
-            self._left_rotate(z)
+            kind = 'right_left'
+            z.right = self._right_rotate(y)
+            top = self._left_rotate(z)
 
         else:
             raise Exception('Tree corrupted')
 
-    def _right_rotate(self, z: 'Node') -> None:
+        if counts is not None:
+            counts[kind] += 1
+            counts['path_length'] += z.size + y.size + x.size - top.size - before
+        return top
+
+    def _right_rotate(self, z: 'Node') -> 'Node':
         """Rotates around z to rebalance sub-tree.
 
         Makes z the right child of y.
@@ -287,60 +375,55 @@ class Node(object):
         The right child of y becomes the right child of x.
 
         :param z: Root of sub-tree to be balanced.
+        :return: y, the new root of the sub-tree.
         """
-        temp = z.parent
         y = z.left
         x = y.right
 
         y.right = z
-        z.parent = y
         z.left = x
 
-        if x:
-            x.parent = z
-
-        y.parent = temp
-
-        if y.parent:
-            if y.parent.left == z:
-                y.parent.left = y
-            else:
-                y.parent.right = y
+        if self.parented:
+            y.parent = z.parent
+            z.parent = y
+            if x:
+                x.parent = z
 
         z.tallness = 1 + max(self._get_height(z.left), self._get_height(z.right))
         y.tallness = 1 + max(self._get_height(y.left), self._get_height(y.right))
+        z.size = 1 + self._get_size(z.left) + self._get_size(z.right)
+        y.size = 1 + self._get_size(y.left) + self._get_size(y.right)
+        return y
 
-    def _left_rotate(self, z: 'Node') -> None:
+    def _left_rotate(self, z: 'Node') -> 'Node':
         """Rotates around z to rebalance sub-tree.
 
         Makes z the left child of y.
+        The parent of z becomes the parent of y.
         The left child of y becomes the left child of x.
 
         :param z: Root of sub-tree to be balanced.
+        :return: y, the new root of the sub-tree.
         """
-        temp = z.parent
         y = z.right
         x = y.left
 
         y.left = z
-        z.parent = y
         z.right = x
 
-        if x:
-            x.parent = z
-
-        y.parent = temp
-
-        if y.parent:
-            if y.parent.left == z:
-                y.parent.left = y
-            else:
-                y.parent.right = y
+        if self.parented:
+            y.parent = z.parent
+            z.parent = y
+            if x:
+                x.parent = z
 
         z.tallness = 1 + max(self._get_height(z.left), self._get_height(z.right))
         y.tallness = 1 + max(self._get_height(y.left), self._get_height(y.right))
+        z.size = 1 + self._get_size(z.left) + self._get_size(z.right)
+        y.size = 1 + self._get_size(y.left) + self._get_size(y.right)
+        return y
 
-    def delete(self, node: 'Node') -> 'Node':
+    def delete(self, node: 'Node', nodes: list = None, counts: Counter = None) -> 'Node':
         """ Deletes node found in _find_node.
 
         Removes nodes and handles deleted node's orphaned children, if any.
@@ -351,16 +434,19 @@ class Node(object):
 
 
         :param node: Node to be deleted.
-        :return: New root Node, if necessary.
+        :param nodes: Path of nodes from the root down to the parent of node. Found from parent pointers if None.
+        :param counts: Optional Counter of the tree's rotations and path length, see AVLTree.stats.
+        :return: Root of tree after deletion, None if the tree is now empty.
         """
 
         def smallest_node(curr_node: 'Node') -> 'Node':
-            """ Finds smallest relative of curr_node.
+            """ Finds smallest relative of curr_node, adding the nodes passed on the way to nodes.
 
             :param curr_node: A Node.
             :return: Relative of curr_node with smallest value.
             """
             while curr_node.left:
+                nodes.append(curr_node)
                 curr_node = curr_node.left
             return curr_node
 
@@ -377,16 +463,27 @@ class Node(object):
                 num += 1
             return num
 
-        node_parent = node.parent
+        if nodes is None:
+            nodes = []
+            ancestor = node.parent
+            while ancestor:
+                nodes.append(ancestor)
+                ancestor = ancestor.parent
+            nodes.reverse()
+
+        node_parent = nodes[-1] if nodes else None
         node_children = children(node)
 
+        # The unlinked node's depth is lost, and its sub-tree, if any, moves up a level.
+        if counts is not None and node_children < 2:
+            counts['deletions'] += 1
+            counts['path_length'] -= len(nodes) + self._get_size(node.left or node.right)
+
         # Leaf nodes may simply be deleted.
         if node_children == 0:
-            if node_parent:
-                if node_parent.left == node:
-                    node_parent.left = None
-                else:
-                    node_parent.right = None
+            if not node_parent:
+                return None
+            self._replace_child(node_parent, node, None)
 
         # Parent of deleted node made parent of deleted node's child.
         if node_children == 1:
@@ -394,73 +491,371 @@ class Node(object):
                 child = node.left
             else:
                 child = node.right
-            if node_parent:
-                if node_parent.left == node:
-                    node_parent.left = child
-                else:
-                    node_parent.right = child
-            else:
+            if self.parented:
                 child.parent = node_parent
+            if not node_parent:
                 return child  # returned to promote child to root node
-            child.parent = node_parent
+            self._replace_child(node_parent, node, child)
 
         # If the node to be deleted has 2 children, the data of its next greater relative is promoted to the
         # to-be-deleted node. The relative is then deleted instead.
         if node_children == 2:
+            nodes.append(node)
             successor = smallest_node(node.right)
-            node.data = successor.data
-            self.delete(successor)
+            self._replace_data(node, successor)
+            return self.delete(successor, nodes, counts)
 
-        # Adjust height and inspect the tree for balance.
-        if node_parent:
-            node_parent.tallness = 1 + max(self._get_height(node_parent.left), self._get_height(node_parent.right))
-            self._inspect_deletion(node_parent)
+        # One node fewer in each sub-tree on the path. Inspect the tree for balance, starting from the deleted node's
+        # parent.
+        for ancestor in nodes:
+            ancestor.size -= 1
+        return self._inspect_deletion(nodes, counts)
 
-    def _inspect_deletion(self, cur_node: 'Node') -> None:
+    def _replace_data(self, cur_node: 'Node', source: 'Node') -> None:
+        """Gives cur_node the data of source, as when a deleted node takes its successor's place.
+
+        :param cur_node: Node receiving data.
+        :param source: Node providing data.
+        """
+        cur_node.data = source.data
+
+    def _inspect_deletion(self, nodes: list, counts: Counter = None) -> 'Node':
         """Ensures tree is balanced after deletion.
 
+        Retraces the path towards the root in a loop, adjusting heights on the way.
         Calls _rebalance_node if imbalance is detected.
-        Calls _inspect_insertion to ensure balance up the tree.
+        Retracing ends as soon as a sub-tree's height is unchanged, as no node above it can be affected.
 
-        :param cur_node: Node. Parent of deleted node.
-        :return:
+        :param nodes: Path of nodes from the root down to the parent of the deleted node.
+        :param counts: Optional Counter of the tree's rotations and path length. The number of nodes retraced is
+            added.
+        :return: Root of tree, which changes if a rotation happened there.
         """
-        if not cur_node:
-            return
-
-        left = self._get_height(cur_node.left)
-        right = self._get_height(cur_node.right)
+        root = nodes[0]
+        depth = len(nodes)
+        while nodes:
+            cur_node = nodes.pop()
+            old = cur_node.tallness
+            left = self._get_height(cur_node.left)
+            right = self._get_height(cur_node.right)
+
+            if abs(left - right) > 1:
+                y = self.taller_child(cur_node)
+                x = self.taller_child(y, prefer_left=y is cur_node.left)
+                top = self._rebalance_node(cur_node, y, x, counts)
+                if nodes:
+                    self._replace_child(nodes[-1], cur_node, top)
+                else:
+                    root = top
+                cur_node = top
+            else:
+                cur_node.tallness = 1 + max(left, right)
 
-        if abs(left - right) > 1:
-            y = self.taller_child(cur_node)
-            x = self.taller_child(y)
-            self._rebalance_node(cur_node, y, x)
+            if cur_node.tallness == old:
+                break
 
-        if cur_node.left:
-            self._inspect_insertion(cur_node.left, [])
-        if cur_node.right:
-            self._inspect_insertion(cur_node.right, [])
+        if counts is not None:
+            counts['retraced'] += depth - len(nodes)
+        return root
 
-    def taller_child(self, cur_node: 'Node') -> 'Node':
+    def taller_child(self, cur_node: 'Node', prefer_left: bool = True) -> 'Node':
         """Finds taller of node's children.
 
         :param cur_node: Node. Node to be inspected.
+        :param prefer_left: Child returned when both children are of equal height. Left if True, else right.
         :return: Node. Child of curr_node with greater height.
         """
         left = self._get_height(cur_node.left)
         right = self._get_height(cur_node.right)
-        if left >= right:
+        if left > right or (left == right and prefer_left):
             return cur_node.left
         return cur_node.right
 
+    def _link(self, cur_node: 'Node', left: 'Node', right: 'Node') -> None:
+        """Makes left and right the children of cur_node and updates its height and size.
+
+        :param cur_node: New parent.
+        :param left: New left child, or None.
+        :param right: New right child, or None.
+        """
+        cur_node.left = left
+        cur_node.right = right
+        if self.parented:
+            if left:
+                left.parent = cur_node
+            if right:
+                right.parent = cur_node
+        cur_node.tallness = 1 + max(self._get_height(left), self._get_height(right))
+        cur_node.size = 1 + self._get_size(left) + self._get_size(right)
+
+    def _rebalance(self, cur_node: 'Node', counts: Counter = None) -> 'Node':
+        """Rotates around cur_node if its children's heights differ by more than 1, else updates its height and size.
+
+        :param cur_node: Node to be balanced.
+        :param counts: Optional Counter of the tree's rotations and path length.
+        :return: Root of the sub-tree.
+        """
+        left = self._get_height(cur_node.left)
+        right = self._get_height(cur_node.right)
+        if abs(left - right) > 1:
+            y = self.taller_child(cur_node)
+            x = self.taller_child(y, prefer_left=y is cur_node.left)
+            return self._rebalance_node(cur_node, y, x, counts)
+        cur_node.tallness = 1 + max(left, right)
+        cur_node.size = 1 + self._get_size(cur_node.left) + self._get_size(cur_node.right)
+        return cur_node
+
+    def join(self, left: 'Node', pivot: 'Node', right: 'Node') -> 'Node':
+        """Joins two sub-trees and a pivot node whose data lies between them.
+
+        The shorter sub-tree is hung from the spine of the taller one where heights meet, then the spine is retraced.
+        Takes O(|height(left) - height(right)|).
+
+        :param left: Root of sub-tree with data less than pivot's, or None.
+        :param pivot: Node not in either sub-tree.
+        :param right: Root of sub-tree with data greater than pivot's, or None.
+        :return: Root of the joined tree.
+        """
+        left_height = self._get_height(left)
+        right_height = self._get_height(right)
+        nodes = []
+        if left_height > right_height + 1:
+            cur_node = left
+            while self._get_height(cur_node) > right_height + 1:
+                nodes.append(cur_node)
+                cur_node = cur_node.right
+            self._link(pivot, cur_node, right)
+        elif right_height > left_height + 1:
+            cur_node = right
+            while self._get_height(cur_node) > left_height + 1:
+                nodes.append(cur_node)
+                cur_node = cur_node.left
+            self._link(pivot, left, cur_node)
+        else:
+            self._link(pivot, left, right)
+
+        top = pivot
+        while nodes:
+            cur_node = nodes.pop()
+            if left_height > right_height:
+                cur_node.right = top
+            else:
+                cur_node.left = top
+            if self.parented:
+                top.parent = cur_node
+            top = self._rebalance(cur_node)
+        if self.parented:
+            top.parent = None
+        return top
+
+    def join2(self, left: 'Node', right: 'Node') -> 'Node':
+        """Joins two sub-trees, all data in left being less than all data in right, using right's smallest node as
+        pivot.
+
+        :param left: Root of sub-tree, or None.
+        :param right: Root of sub-tree, or None.
+        :return: Root of the joined tree, or None.
+        """
+        if not right:
+            return left
+        if not left:
+            return right
+        nodes = []
+        pivot = right
+        while pivot.left:
+            nodes.append(pivot)
+            pivot = pivot.left
+        right = self.delete(pivot, nodes)
+        return self.join(left, pivot, right)
+
+    def split(self, cur_node: 'Node', data: Q) -> tuple:
+        """Splits the sub-tree of cur_node around data.
+
+        Walks down to data, then joins the sub-trees hanging off each side of the path in O(log n) overall.
+
+        :param cur_node: Root of sub-tree, or None.
+        :param data: Data to split around.
+        :return: (root of data less than data, node holding data or None, root of data greater than data)
+        """
+        nodes = []
+        while cur_node and data != cur_node.data:
+            nodes.append(cur_node)
+            if data < cur_node.data:
+                cur_node = cur_node.left
+            else:
+                cur_node = cur_node.right
+
+        left = right = None
+        if cur_node:
+            left, right = cur_node.left, cur_node.right
+        while nodes:
+            parent = nodes.pop()
+            if data < parent.data:
+                right = self.join(right, parent, parent.right)
+            else:
+                left = self.join(parent.left, parent, left)
+        if self.parented:
+            for root in (left, right):
+                if root:
+                    root.parent = None
+        return left, cur_node, right
+
+    def union(self, first: 'Node', second: 'Node') -> 'Node':
+        """Merges two sub-trees into one holding data found in either, keeping first's node when both hold data.
+
+        Splits second around the root of first and recurses on each side, in O(m log(n/m + 1)) for sizes m <= n.
+
+        :param first: Root of sub-tree, or None.
+        :param second: Root of sub-tree, or None.
+        :return: Root of the union.
+        """
+        if not first:
+            return second
+        if not second:
+            return first
+        if second.size < 4 * first.tallness:
+            # Too few nodes left in second to be worth splitting first's levels around.
+            return self._insert_nodes(first, second)
+        left, _, right = self.split(second, first.data)
+        left = self.union(first.left, left)
+        right = self.union(first.right, right)
+        return self.join(left, first, right)
+
+    def _insert_nodes(self, root: 'Node', cur_node: 'Node') -> 'Node':
+        """Inserts the nodes of cur_node's sub-tree into root's tree one at a time, dropping those whose data is
+        already there.
+
+        :param root: Root of tree.
+        :param cur_node: Root of sub-tree to be taken apart.
+        :return: Root of tree after insertion.
+        """
+        stack = [cur_node]
+        while stack:
+            cur_node = stack.pop()
+            if cur_node.left:
+                stack.append(cur_node.left)
+            if cur_node.right:
+                stack.append(cur_node.right)
+
+            path = []
+            parent = root
+            while parent:
+                path.append(parent)
+                if cur_node.data < parent.data:
+                    parent = parent.left
+                elif cur_node.data > parent.data:
+                    parent = parent.right
+                else:
+                    break
+            if parent:
+                continue
+
+            parent = path[-1]
+            self._link(cur_node, None, None)
+            if cur_node.data < parent.data:
+                parent.left = cur_node
+            else:
+                parent.right = cur_node
+            if self.parented:
+                cur_node.parent = parent
+            for ancestor in path:
+                ancestor.size += 1
+            root = self._inspect_insertion(cur_node, path)
+        if self.parented:
+            root.parent = None
+        return root
+
+    def intersection(self, first: 'Node', second: 'Node') -> 'Node':
+        """Merges two sub-trees into one holding data found in both, made of first's nodes.
+
+        :param first: Root of sub-tree, or None.
+        :param second: Root of sub-tree, or None.
+        :return: Root of the intersection, or None.
+        """
+        if not first or not second:
+            return None
+        left, found, right = self.split(second, first.data)
+        left = self.intersection(first.left, left)
+        right = self.intersection(first.right, right)
+        if found:
+            return self.join(left, first, right)
+        return self.join2(left, right)
+
+    def difference(self, first: 'Node', second: 'Node') -> 'Node':
+        """Removes data found in second from first.
+
+        :param first: Root of sub-tree, or None.
+        :param second: Root of sub-tree, or None.
+        :return: Root of the difference, or None.
+        """
+        if not first or not second:
+            return first
+        left, _, right = self.split(first, second.data)
+        left = self.difference(left, second.left)
+        right = self.difference(right, second.right)
+        return self.join2(left, right)
+
+    def symmetric_difference(self, first: 'Node', second: 'Node') -> 'Node':
+        """Merges two sub-trees into one holding data found in exactly one of them.
+
+        :param first: Root of sub-tree, or None.
+        :param second: Root of sub-tree, or None.
+        :return: Root of the symmetric difference, or None.
+        """
+        if not first:
+            return second
+        if not second:
+            return first
+        left, found, right = self.split(second, first.data)
+        left = self.symmetric_difference(first.left, left)
+        right = self.symmetric_difference(first.right, right)
+        if found:
+            return self.join2(left, right)
+        return self.join(left, first, right)
+
+
+class Node(LeanNode):
+
+    """Node object for AVLTree with a pointer to its parent.
+
+    """
+
+    __slots__ = ('parent',)
+
+    parented = True
+
+    def __init__(self, data: Q) -> None:
+        """Instantiates Node object for AVLTree.
+
+        Data assumed to be compatible with <, =, > operators.
+
+        Parent, left and right are pointers to parent and child nodes.
 
-class AVLTree(object):
+        Tallness initialized at 1, adjusted with insert and delete to represent height of node. Null nodes have
+        height of 0.
+
+        Size initialized at 1, adjusted with insert and delete to represent the number of nodes in the sub-tree.
+
+        :param data: int, float, str.
+        """
+        self.data = data
+        self.parent = None
+        self.left = None
+        self.right = None
+        self.tallness = 1
+        self.size = 1
+
+
+class AVLTree(BalancedTree):
 
     """Wraps Node class. Methods call corresponding methods of Node class.
 
     """
 
-    def __init__(self) -> None:
+    # Cost of rebuilding per item, in descent steps. See _rebuild_pays.
+    REBUILD_COST = 3
+
+    def __init__(self, parent_pointers: bool = True) -> None:
         """Tree is represented by its root node, initially None.
 
         Tree designed for data types supporting <, =, >.
@@ -469,16 +864,21 @@ class AVLTree(object):
             Create a new tree:
                 tree = AVLTree()
 
+                Set parent_pointers=False to build the tree from LeanNodes, which have no parent pointer.
+
             View tree structure (adjust for screen size):
                 print(tree)
 
-            Determine height of tree:
+            Determine height of tree in O(1):
                 tree.height(print_result=True)
 
                 Returns int.
 
                 Print_result is optional, defaults to False
 
+            Size, height, min, max, rotations made and average depth in O(1):
+                tree.stats()
+
             Insert data into tree:
                 tree.insert(data)
 
@@ -496,12 +896,27 @@ class AVLTree(object):
 
                 If data does not exist in tree, user is alerted
 
+            Nearest items:
+                tree.floor(data), tree.ceiling(data)  # nearest item <= data, >= data
+                tree.lower(data), tree.higher(data)  # nearest item < data, > data
+                tree.min(), tree.max(), tree.pop_min(), tree.pop_max()
+
+            Order statistics:
+                tree.rank(data)  # number of items < data
+                tree.select(i), tree[i]  # i-th smallest item
+                tree.count_range(low, high)  # number of items in [low, high]
+
             Clear all data from tree:
                 tree.clear_tree()
 
     """
         self.root = None
         self.size = 0
+        self.node_type = Node if parent_pointers else LeanNode
+        self.min_node = None
+        self.max_node = None
+        self.counts = Counter()
+        self.depths_known = True
 
     def __repr__(self) -> str:
         """Prints text based structure of tree.
@@ -511,7 +926,7 @@ class AVLTree(object):
         if not self.root:
             return 'Tree is empty. Please insert data.'
         the_tree = '\n'
-        nodes = [self._get_root()]
+        nodes = [self.root]
         cur_tallness = self.root.tallness
         space = ' ' * (40 - int(len(str(self.root.data))) // 2)
         buffer = ' ' * (60 - int(len(str(self.root.data))) // 2)
@@ -549,31 +964,119 @@ class AVLTree(object):
     def __len__(self) -> int:
         return self.size
 
-    def _get_root(self, data: Q = None) -> 'Node':
-        """Returns root node.
+    @classmethod
+    def from_sorted(cls, data: Iq, parent_pointers: bool = True) -> 'AVLTree':
+        """Creates a perfectly balanced tree from data in ascending order in O(n).
 
-        Creates root node if called from Tree.insert and tree is empty.
+        Repeated data is dropped.
 
-        :param data: If provided and tree is empty, tree root is established with data.
-        :return: Root node of tree.
+        :param data: Iterable[int, float, str] in ascending order.
+        :param parent_pointers: Passed to AVLTree.
+        :return: New tree holding data.
         """
-        if not self.root:
-            if data is not None:
-                self.root = Node(data)
-                return self.root
-            else:
-                print('Tree is empty.')
+        keys = []
+        for x in data:
+            if keys and not x > keys[-1]:
+                if x == keys[-1]:
+                    continue
+                raise ValueError(f'{x} out of order. Data must be in ascending order.')
+            keys.append(x)
+        tree = cls(parent_pointers=parent_pointers)
+        tree._build([tree.node_type(x) for x in keys])
+        return tree
+
+    @classmethod
+    def from_iterable(cls, data: Iq, parent_pointers: bool = True) -> 'AVLTree':
+        """Creates a perfectly balanced tree from data in any order.
+
+        Data is deduplicated and sorted first, then built as in from_sorted.
+
+        :param data: Iterable[int, float, str].
+        :param parent_pointers: Passed to AVLTree.
+        :return: New tree holding data.
+        """
+        tree = cls(parent_pointers=parent_pointers)
+        tree._build([tree.node_type(x) for x in sorted(set(data))])
+        return tree
 
-        else:
-            while self.root.parent:
-                self.root = self.root.parent
+    def _build(self, nodes: list) -> None:
+        """Replaces the tree's contents with a perfectly balanced tree of nodes.
 
-        return self.root
+        The middle node of each range becomes the root of its sub-tree. A sub-tree of n nodes built this way has
+        height n.bit_length(), so tallness and size are set without looking at children.
+
+        :param nodes: Nodes of distinct data in ascending order. Their links are overwritten.
+        """
+        parented = self.node_type.parented
+        path_length = 0
+
+        def link(lo: int, hi: int) -> 'Node':
+            """Links nodes[lo:hi] into a balanced sub-tree.
+
+            :param lo: Index of first node.
+            :param hi: Index past last node.
+            :return: Root of sub-tree, None if empty.
+            """
+            nonlocal path_length
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            cur_node = nodes[mid]
+            cur_node.tallness = (hi - lo).bit_length()
+            cur_node.size = hi - lo
+            path_length += hi - lo - 1
+            cur_node.left = link(lo, mid)
+            cur_node.right = link(mid + 1, hi)
+            if parented:
+                if cur_node.left:
+                    cur_node.left.parent = cur_node
+                if cur_node.right:
+                    cur_node.right.parent = cur_node
+            return cur_node
+
+        self.root = link(0, len(nodes))
+        if parented and self.root:
+            self.root.parent = None
+        self.size = len(nodes)
+        self.min_node = nodes[0] if nodes else None
+        self.max_node = nodes[-1] if nodes else None
+        self.counts['path_length'] = path_length
+        self.depths_known = True
+
+    def dump(self, path: str) -> None:
+        """Writes tree's data to path in a compact binary format, see EytzingerTree.
+
+        Data must be all int, all float or all str. Ints must fit in 64 bits.
+
+        :param path: File to write.
+        """
+        dump_keys(path, [cur_node.data for cur_node in self._in_order_nodes()])
+
+    @classmethod
+    def load(cls, path: str, parent_pointers: bool = True) -> 'AVLTree':
+        """Creates a perfectly balanced tree from a file written by dump in O(n), without comparing any data.
+
+        The file may also be searched in place with MappedAVLTree.
+
+        :param path: File written by dump.
+        :param parent_pointers: Passed to AVLTree.
+        :return: New tree holding the file's data.
+        """
+        tree = cls(parent_pointers=parent_pointers)
+        tree._build([tree.node_type(x) for x in load_keys(path)])
+        return tree
+
+    def freeze(self) -> FrozenAVLTree:
+        """Copies tree's data into an immutable tree laid out in a flat array in O(n), for searching many times.
+
+        :return: FrozenAVLTree holding tree's data.
+        """
+        return FrozenAVLTree([cur_node.data for cur_node in self._in_order_nodes()])
 
     def print_tree(self, order: str = None) -> Any:
         """User interface for printing tree.
 
-        Calls _print_tree with root from _get_root.
+        Calls _print_tree with the tree's root.
         Prints order as entered by user for correcting typos and such.
         Ensures print order requested is valid.
 
@@ -584,7 +1087,10 @@ class AVLTree(object):
         if not order or not any([order == 'pre-order', order == 'post-order', order == 'in-order']):
             print('Please specify a valid print order.')
             print('(eg. order=\'in-order\', \'pre-order\', or \'post-order\')')
-        return self._print_tree(self._get_root(), order)
+        if not self.root:
+            print('Tree is empty.')
+            return None
+        return self._print_tree(self.root, order)
 
     def _print_tree(self, root: 'Node', order: str = None) -> Any:
         """Calls print_tree method of Node class.
@@ -596,38 +1102,70 @@ class AVLTree(object):
         return root.print_tree(root, order)
 
     def height(self, print_result: bool = False) -> int:
-        """User interface for finding height of tree.
+        """User interface for finding height of tree in O(1).
 
-        Calls _height with root from _get_root.
+        Calls _height with the tree's root.
         Option to print height to stdout.
 
         :param print_result: Prints height to stdout if True.
         :return: _height
         """
-        height = self._height(self._get_root())
+        height = self._height(self.root)
         if print_result:
             print(height)
         return height
 
     def _height(self, root: 'Node') -> Any:
-        """Calls height method of Node class.
+        """Reads the height the root keeps, rather than visiting every node as Node.height does.
 
         :param root: Root node.
-        :return: Node.height
+        :return: Root's tallness, 0 if tree is empty.
+        """
+        if not root:
+            return 0
+        return root.tallness
+
+    def stats(self) -> dict:
+        """Reports the tree's shape in O(1), from figures every insertion, deletion and rebuild keeps up to date.
+
+        Rotations are counted by type, eg. 'left_right' for a left rotation of z's left child then a right rotation
+        of z, since the tree was created. Updates counts the insertions and deletions retraced since then, and
+        rotations_per_update and retraced_per_update average the rotations made and nodes retraced over them. Both
+        stay below small constants however large the tree grows, as retracing stops once heights settle.
+
+        Average depth is the mean number of edges from the root to a node, kept as the sum of all depths. Split, join
+        and set operations do not keep that sum, and finding it again would take a walk of the tree, so it is None for
+        a tree made by one until a rebuild, eg. by a large insert_many, or clear_tree sets it anew.
+
+        :return: dict of size, height, min, max, rotations, updates, rotations_per_update, retraced_per_update and
+            average_depth. min and max are None if tree is empty.
         """
-        return root.height(root, 0)
+        rotations = {kind: self.counts[kind] for kind in ('left', 'right', 'left_right', 'right_left')}
+        updates = self.counts['insertions'] + self.counts['deletions']
+        return {
+            'size': self.size,
+            'height': self._height(self.root),
+            'min': self.min_node.data if self.min_node else None,
+            'max': self.max_node.data if self.max_node else None,
+            'rotations': rotations,
+            'updates': updates,
+            'rotations_per_update': sum(rotations.values()) / updates if updates else 0.0,
+            'retraced_per_update': self.counts['retraced'] / updates if updates else 0.0,
+            'average_depth': (self.counts['path_length'] / self.size if self.size else 0.0) if self.depths_known
+            else None,
+        }
 
     def search(self, data: Q, print_result: bool = False) -> bool:
         """User interface for search method.
 
-        Calls _search with root from _get_root.
+        Calls _search with the tree's root.
         Option to print results to stdout.
 
         :param print_result: Set to True to print search results.
         :param data: Data to be found in tree.
         :return: AVLTree._search
         """
-        result = self._search(self._get_root(), data)
+        result = self._search(self.root, data)
 
         if print_result:
             if result:
@@ -642,89 +1180,783 @@ class AVLTree(object):
 
         :param root: Root node.
         :param data: Data to search for in tree.
-        :return: Node.search
+        :return: Node.search, False if tree is empty.
         """
+        if not root:
+            return False
         return root.search(root, data)
 
     def insert(self, data: Q or Iq) -> None:
         """User interface for inserting data into tree.
 
-        Calls _insert with root provided by _get_root.
-        Resets root after insert in case rotation changes root.
-        Data field provided to _get_root ensures tree root is created on first insertion.
+        Calls _insert with the tree's root.
 
         :param data: int, float, str or Iterable[int, float, str].
         """
         if isinstance(data, Iterable):
             for x in data:
-                result = self._insert(self._get_root(data=x), x)
-                if not result:
-                    self.size += 1
-                self.root = self._get_root()
+                self._insert(self.root, x)
         else:
-            result = self._insert(self._get_root(data=data), data)
-            if not result:
-                self.size += 1
-            self.root = self._get_root()
+            self._insert(self.root, data)
 
-    def _insert(self, root: 'Node', data: Q) -> Any:
+    def _insert(self, root: 'Node', data: Q, *fields: Any) -> None:
         """Calls insert method of Node class.
 
+        Creates root if tree is empty.
+        Node.insert returns the root, which changes if rotation happened there.
+
         :param root: Root node.
         :param data: Data to be inserted into tree.
-        :return: Node.insert
+        :param fields: Further arguments for the new node, eg. a MapNode's value.
         """
-        return root.insert(root, data, [])
+        if not root:
+            self.root = self.min_node = self.max_node = self.node_type(data, *fields)
+            self.size += 1
+            self.counts['insertions'] += 1
+            return
+
+        repeated_data = []
+        self.root = root.insert(root, data, repeated_data, *fields, counts=self.counts)
+        if not repeated_data:
+            self.size += 1
+            self._extend_extremes(data)
+
+    def _extend_extremes(self, data: Q) -> None:
+        """Moves min_node or max_node to a newly inserted node if data is beyond them.
+
+        New data smaller than all else always lands as the left child of the old min_node, likewise for max_node.
+        Rotations move nodes but never their data, so the pointers stay valid.
 
-    def _find_node(self, cur_node: 'Node', data: Q) -> Any:
+        :param data: Data just inserted into a tree that was not empty.
+        """
+        if data < self.min_node.data:
+            self.min_node = self.min_node.left
+        elif data > self.max_node.data:
+            self.max_node = self.max_node.right
+
+    def _find_node(self, cur_node: 'Node', data: Q, nodes: list = None) -> Any:
         """Finds and returns node with given data, else, returns None.
 
-        :param cur_node: Root node from _get_root.
+        :param cur_node: Root node.
         :param data: Data contained within node to be found.
+        :param nodes: Optional list. Nodes passed on the way down are appended to it.
         :return: Node containing data if such a node exists, else, None.
         """
-        if cur_node and data == cur_node.data:
-            return cur_node
-        elif cur_node and data < cur_node.data:
-            return self._find_node(cur_node.left, data)
-        elif cur_node and data > cur_node.data:
-            return self._find_node(cur_node.right, data)
+        while cur_node:
+            if data < cur_node.data:
+                if nodes is not None:
+                    nodes.append(cur_node)
+                cur_node = cur_node.left
+            elif data > cur_node.data:
+                if nodes is not None:
+                    nodes.append(cur_node)
+                cur_node = cur_node.right
+            else:
+                return cur_node
         return None
 
     def delete(self, data: Q) -> None:
-        """Passes root and data to be deleted to _delete.
+        """User interface for deleting data from tree.
 
-        Calls _delete with root from _get_root.
+        Calls _remove. Alerts user if data is not in tree.
 
         :param data: Data to delete from tree.
-        :return: _delete if data in tree, else, None.
         """
-        node = self._find_node(self._get_root(), data)
+        if not self._remove(data):
+            print(f'{data} not in tree, Cannot delete.')
+
+    def _remove(self, data: Q) -> bool:
+        """Passes node to be deleted to _delete.
+
+        Finds node and the path to it from the root with _find_node.
+
+        :param data: Data to delete from tree.
+        :return: True if data was in tree, else, False.
+        """
+        nodes = []
+        node = self._find_node(self.root, data, nodes)
 
         if not node:
-            print(f'{data} not in tree, Cannot delete.')
-            return
+            return False
 
         self.size -= 1
-        self._delete(node)
-        self.root = self._get_root()
+        self._delete(node, nodes)
+        return True
+
+    def insert_many(self, data: Iq) -> int:
+        """Inserts a batch of data into tree.
+
+        Large batches are merged with the tree's data and the tree is rebuilt in linear time, small batches are
+        inserted one at a time. _rebuild_pays decides which.
+
+        :param data: Iterable[int, float, str].
+        :return: Number of items inserted, ie. not already in tree.
+        """
+        return self._insert_batch(sorted(set(data)))
+
+    def _insert_batch(self, batch: list, values: dict = None) -> int:
+        """Inserts distinct data in ascending order, one at a time or by rebuilding as in insert_many.
+
+        :param batch: Distinct data in ascending order.
+        :param values: Optional dict of each item of batch to a further argument for its node, eg. a MapNode's value.
+        :return: Number of items inserted, ie. not already in tree.
+        """
+        def fields(x: Q) -> tuple:
+            return (values[x],) if values is not None else ()
+
+        before = self.size
+        if not self._rebuild_pays(len(batch)):
+            for x in batch:
+                self._insert(self.root, x, *fields(x))
+            return self.size - before
+
+        merged = []
+        i = 0
+        for cur_node in self._in_order_nodes():
+            while i < len(batch) and batch[i] < cur_node.data:
+                merged.append(self.node_type(batch[i], *fields(batch[i])))
+                i += 1
+            if i < len(batch) and batch[i] == cur_node.data:
+                i += 1
+            merged.append(cur_node)
+        merged.extend(self.node_type(x, *fields(x)) for x in batch[i:])
+        self._build(merged)
+        return self.size - before
+
+    def delete_many(self, data: Iq) -> int:
+        """Deletes a batch of data from tree. Data not in tree is ignored silently.
+
+        Large batches are merged with the tree's data and the tree is rebuilt in linear time, small batches are
+        deleted one at a time. _rebuild_pays decides which.
+
+        :param data: Iterable[int, float, str].
+        :return: Number of items deleted.
+        """
+        batch = sorted(set(data))
+        before = self.size
+        if not self._rebuild_pays(len(batch)):
+            for x in batch:
+                self._remove(x)
+            return before - self.size
+
+        kept = []
+        i = 0
+        for cur_node in self._in_order_nodes():
+            while i < len(batch) and batch[i] < cur_node.data:
+                i += 1
+            if i < len(batch) and batch[i] == cur_node.data:
+                i += 1
+                continue
+            kept.append(cur_node)
+        self._build(kept)
+        return before - self.size
+
+    def _rebuild_pays(self, batch_size: int) -> bool:
+        """Cost model choosing between rebuilding the tree and updating it one item at a time.
+
+        One at a time costs a descent and retrace per item, about tree height steps each.
+        Rebuilding costs REBUILD_COST steps per item of the tree and the batch.
+
+        :param batch_size: Number of distinct items in batch.
+        :return: True if rebuilding is expected to be cheaper.
+        """
+        height = self.root.tallness if self.root else 0
+        return (self.size + batch_size) * self.REBUILD_COST < batch_size * (height + 1)
+
+    def _in_order_nodes(self) -> Iterator['Node']:
+        """Yields nodes in order, walking the tree with an explicit stack.
+
+        :return: Iterator over nodes in tree.
+        """
+        return self._walk(self._low_stack(None, True))
 
-    def _delete(self, node: 'Node') -> None:
+    def __iter__(self) -> Iterator[Q]:
+        """Yields data in ascending order, lazily.
+
+        :return: Iterator over data in tree.
+        """
+        return self.irange()
+
+    def __reversed__(self) -> Iterator[Q]:
+        """Yields data in descending order, lazily.
+
+        :return: Iterator over data in tree.
+        """
+        return self.irange(reverse=True)
+
+    def irange(self, low: Q = None, high: Q = None, inclusive: tuple = (True, True),
+               reverse: bool = False) -> Iterator[Q]:
+        """Yields data between low and high lazily, in O(log n + k) for k items yielded.
+
+        :param low: Lower bound, None for no bound.
+        :param high: Upper bound, None for no bound.
+        :param inclusive: Pair of bools. Whether low and high themselves are yielded.
+        :param reverse: Yields data in descending order if True.
+        :return: Iterator over data in range.
+        """
+        for cur_node in self._irange_nodes(low, high, inclusive, reverse):
+            yield cur_node.data
+
+    def _irange_nodes(self, low: Q, high: Q, inclusive: tuple, reverse: bool) -> Iterator['Node']:
+        """Yields nodes with data between low and high lazily. Parameters as in irange.
+
+        :return: Iterator over nodes in range.
+        """
+        if reverse:
+            for cur_node in self._walk(self._high_stack(high, inclusive[1]), True):
+                if low is not None and (cur_node.data < low or (cur_node.data == low and not inclusive[0])):
+                    return
+                yield cur_node
+        else:
+            for cur_node in self._walk(self._low_stack(low, inclusive[0])):
+                if high is not None and (cur_node.data > high or (cur_node.data == high and not inclusive[1])):
+                    return
+                yield cur_node
+
+    def islice(self, start: int = None, stop: int = None, reverse: bool = False) -> Iterator[Q]:
+        """Yields data at indices start to stop in sorted order lazily, in O(log n + k) for k items yielded.
+
+        Indices are as in tree[start:stop], negative indices count from the end.
+
+        :param start: Index of first item, None for 0.
+        :param stop: Index past last item, None for len(tree).
+        :param reverse: Yields the same items in descending order if True.
+        :return: Iterator over data in slice.
+        """
+        for cur_node in self._islice_nodes(start, stop, reverse):
+            yield cur_node.data
+
+    def _islice_nodes(self, start: int, stop: int, reverse: bool) -> Iterator['Node']:
+        """Yields nodes at indices start to stop lazily. Parameters as in islice.
+
+        :return: Iterator over nodes in slice.
+        """
+        start, stop, _ = slice(start, stop).indices(self.size)
+        count = stop - start
+        if count <= 0:
+            return
+        stack = self._index_stack(stop - 1 if reverse else start, reverse)
+        for cur_node in self._walk(stack, reverse):
+            yield cur_node
+            count -= 1
+            if not count:
+                return
+
+    def _walk(self, stack: list, reverse: bool = False) -> Iterator['Node']:
+        """Yields nodes in order, starting from the node on top of stack.
+
+        :param stack: Nodes still to be visited, each above its descendants on the path to the first node.
+        :param reverse: Walks in descending order if True.
+        :return: Iterator over nodes.
+        """
+        if reverse:
+            while stack:
+                cur_node = stack.pop()
+                yield cur_node
+                cur_node = cur_node.left
+                while cur_node:
+                    stack.append(cur_node)
+                    cur_node = cur_node.right
+        else:
+            while stack:
+                cur_node = stack.pop()
+                yield cur_node
+                cur_node = cur_node.right
+                while cur_node:
+                    stack.append(cur_node)
+                    cur_node = cur_node.left
+
+    def _low_stack(self, low: Q, inclusive: bool) -> list:
+        """Builds the stack for an ascending _walk from the smallest item above low.
+
+        :param low: Lower bound, None for no bound.
+        :param inclusive: Walk starts at low itself if True.
+        :return: Nodes at or above low on the path from the root, smallest last.
+        """
+        stack = []
+        cur_node = self.root
+        while cur_node:
+            if low is None or low < cur_node.data or (inclusive and low == cur_node.data):
+                stack.append(cur_node)
+                cur_node = cur_node.left
+            else:
+                cur_node = cur_node.right
+        return stack
+
+    def _high_stack(self, high: Q, inclusive: bool) -> list:
+        """Builds the stack for a descending _walk from the largest item below high.
+
+        :param high: Upper bound, None for no bound.
+        :param inclusive: Walk starts at high itself if True.
+        :return: Nodes at or below high on the path from the root, largest last.
+        """
+        stack = []
+        cur_node = self.root
+        while cur_node:
+            if high is None or high > cur_node.data or (inclusive and high == cur_node.data):
+                stack.append(cur_node)
+                cur_node = cur_node.right
+            else:
+                cur_node = cur_node.left
+        return stack
+
+    def _index_stack(self, index: int, reverse: bool = False) -> list:
+        """Builds the stack for a _walk from the item at index.
+
+        :param index: Index of first item, 0 <= index < len(tree).
+        :param reverse: Stack for a descending walk if True.
+        :return: Nodes on the path from the root still to be visited, item at index last.
+        """
+        stack = []
+        cur_node = self.root
+        while cur_node:
+            left = cur_node.left.size if cur_node.left else 0
+            if index < left:
+                if not reverse:
+                    stack.append(cur_node)
+                cur_node = cur_node.left
+            elif index > left:
+                if reverse:
+                    stack.append(cur_node)
+                index -= left + 1
+                cur_node = cur_node.right
+            else:
+                stack.append(cur_node)
+                break
+        return stack
+
+    def _delete(self, node: 'Node', nodes: list = None) -> None:
         """Calls delete method of Node class.
 
-        If root is to be deleted and has no children, root is set to None.
-        If Node.delete returns a node it is the new root node.
+        Node.delete returns the root, which changes if the root was deleted or rotated.
+        Keeps min_node and max_node pointing at the extreme nodes. Node.delete unlinks node itself unless it has two
+        children, in which case node takes its successor's data and the successor is unlinked instead.
 
         :param node: Node to be deleted
+        :param nodes: Path of nodes from the root down to the parent of node.
         """
-        if node == self.root and (not node.left and not node.right):
+        if node is self.min_node:
+            self.min_node = None
+        if node is self.max_node:
+            self.max_node = None
+        elif node.left and node.right and node.right is self.max_node and not node.right.left:
+            self.max_node = node
+
+        self.root = node.delete(node, nodes, self.counts)
+        if not self.root:
             self.clear_tree()
+            return
+
+        if not self.min_node:
+            self.min_node = self._edge_node(self.root, False)
+        if not self.max_node:
+            self.max_node = self._edge_node(self.root, True)
+
+    def _edge_node(self, cur_node: 'Node', rightmost: bool, nodes: list = None) -> 'Node':
+        """Finds the leftmost or rightmost node below cur_node.
+
+        :param cur_node: Root of sub-tree.
+        :param rightmost: Finds rightmost node if True, else leftmost.
+        :param nodes: Optional list. Nodes passed on the way down are appended to it.
+        :return: Node with smallest or largest data in sub-tree.
+        """
+        while True:
+            child = cur_node.right if rightmost else cur_node.left
+            if not child:
+                return cur_node
+            if nodes is not None:
+                nodes.append(cur_node)
+            cur_node = child
+
+    def min(self) -> Q:
+        """Returns smallest item in tree in O(1).
+
+        :return: Smallest data.
+        """
+        if not self.min_node:
+            raise ValueError('Tree is empty.')
+        return self.min_node.data
+
+    def max(self) -> Q:
+        """Returns largest item in tree in O(1).
+
+        :return: Largest data.
+        """
+        if not self.max_node:
+            raise ValueError('Tree is empty.')
+        return self.max_node.data
+
+    def pop_min(self) -> Q:
+        """Removes and returns smallest item in tree.
+
+        :return: Smallest data.
+        """
+        return self._pop_edge(False).data
+
+    def pop_max(self) -> Q:
+        """Removes and returns largest item in tree.
+
+        :return: Largest data.
+        """
+        return self._pop_edge(True).data
 
-        result = node.delete(node)
-        if result:
-            self.root = result
+    def _pop_edge(self, rightmost: bool) -> 'Node':
+        """Removes the leftmost or rightmost node in one descent.
 
-        self.root = self._get_root()
+        :param rightmost: Removes rightmost node if True, else leftmost.
+        :return: The removed node. It never has two children, so it keeps its data.
+        """
+        if not self.root:
+            raise ValueError('Tree is empty.')
+        nodes = []
+        cur_node = self._edge_node(self.root, rightmost, nodes)
+        self.size -= 1
+        self._delete(cur_node, nodes)
+        return cur_node
+
+    def floor(self, data: Q) -> Q:
+        """Finds largest item less than or equal to data in one descent.
+
+        :param data: Data to compare to, need not be in tree.
+        :return: Largest item <= data, None if there is none.
+        """
+        cur_node = self._floor_node(data, True)
+        return cur_node.data if cur_node else None
+
+    def lower(self, data: Q) -> Q:
+        """Finds largest item strictly less than data in one descent.
+
+        :param data: Data to compare to, need not be in tree.
+        :return: Largest item < data, None if there is none.
+        """
+        cur_node = self._floor_node(data, False)
+        return cur_node.data if cur_node else None
+
+    def ceiling(self, data: Q) -> Q:
+        """Finds smallest item greater than or equal to data in one descent.
+
+        :param data: Data to compare to, need not be in tree.
+        :return: Smallest item >= data, None if there is none.
+        """
+        cur_node = self._ceiling_node(data, True)
+        return cur_node.data if cur_node else None
+
+    def higher(self, data: Q) -> Q:
+        """Finds smallest item strictly greater than data in one descent.
+
+        :param data: Data to compare to, need not be in tree.
+        :return: Smallest item > data, None if there is none.
+        """
+        cur_node = self._ceiling_node(data, False)
+        return cur_node.data if cur_node else None
+
+    def _floor_node(self, data: Q, inclusive: bool) -> 'Node':
+        """Finds node with largest data below data, or equal to it if inclusive.
+
+        :param data: Data to compare to.
+        :param inclusive: Node holding data itself qualifies if True.
+        :return: Node, None if there is none.
+        """
+        found = None
+        cur_node = self.root
+        while cur_node:
+            if data > cur_node.data:
+                found = cur_node
+                cur_node = cur_node.right
+            elif data < cur_node.data:
+                cur_node = cur_node.left
+            elif inclusive:
+                return cur_node
+            else:
+                cur_node = cur_node.left
+        return found
+
+    def _ceiling_node(self, data: Q, inclusive: bool) -> 'Node':
+        """Finds node with smallest data above data, or equal to it if inclusive.
+
+        :param data: Data to compare to.
+        :param inclusive: Node holding data itself qualifies if True.
+        :return: Node, None if there is none.
+        """
+        found = None
+        cur_node = self.root
+        while cur_node:
+            if data < cur_node.data:
+                found = cur_node
+                cur_node = cur_node.left
+            elif data > cur_node.data:
+                cur_node = cur_node.right
+            elif inclusive:
+                return cur_node
+            else:
+                cur_node = cur_node.right
+        return found
+
+    def __getitem__(self, index: int) -> Q:
+        """Returns data at index in sorted order. Negative indices count from the end.
+
+        :param index: int.
+        :return: Data at index.
+        """
+        if index < 0:
+            index += self.size
+        return self.select(index)
+
+    def rank(self, data: Q) -> int:
+        """Finds number of items in tree less than data in O(log n).
+
+        :param data: Data to be ranked, need not be in tree.
+        :return: int. Index data has or would have in sorted order.
+        """
+        return self._rank(data, False)
+
+    def _rank(self, data: Q, inclusive: bool) -> int:
+        """Counts items less than data, or less than or equal to data if inclusive, using sub-tree sizes.
+
+        :param data: Data to be ranked.
+        :param inclusive: Counts data itself if True.
+        :return: int.
+        """
+        count = 0
+        cur_node = self.root
+        while cur_node:
+            if data < cur_node.data:
+                cur_node = cur_node.left
+            elif data > cur_node.data:
+                count += 1 + (cur_node.left.size if cur_node.left else 0)
+                cur_node = cur_node.right
+            else:
+                count += cur_node.left.size if cur_node.left else 0
+                return count + 1 if inclusive else count
+        return count
+
+    def search_many(self, data: Iq) -> Any:
+        """Searches tree for each item of data. See _probe_many.
+
+        :param data: List or NumPy array of data to be found in tree.
+        :return: bool per item, True if item in tree. NumPy array if data is one, else, list.
+        """
+        root = self.root
+        return self._probe_many(data, lambda x: self._search(root, x), lambda count, found: found, bool)
+
+    def rank_many(self, data: Iq) -> Any:
+        """Finds number of items in tree less than each item of data. See _probe_many.
+
+        :param data: List or NumPy array of data to be ranked, need not be in tree.
+        :return: int per item. NumPy array if data is one, else, list.
+        """
+        return self._probe_many(data, self.rank, lambda count, found: count, int)
+
+    def floor_many(self, data: Iq) -> Any:
+        """Finds index in sorted order of the largest item <= each item of data. See _probe_many.
+
+        :param data: List or NumPy array of data to compare to, need not be in tree.
+        :return: int per item, -1 where there is no such item, so tree[index] is the floor elsewhere. NumPy array if
+            data is one, else, list.
+        """
+        return self._probe_many(data, lambda x: self._rank(x, True) - 1, lambda count, found: count + found - 1, int)
+
+    def _probe_many(self, data: Iq, single: Any, answer: Any, dtype: type) -> Any:
+        """Finds a result for each item of data, by a descent per item or by one sweep over the tree.
+
+        Small batches make one descent per item with single. Large batches are sorted and merged with the tree's data
+        in one in-order sweep, each item ranked and found along the way, its result then given by answer. A sweep
+        step costs about what a rebuild does per item, so _rebuild_pays decides which. With NumPy and int or float
+        data, the sweep copies the tree's data to an array and places every item at once with searchsorted.
+
+        :param data: List or NumPy array.
+        :param single: Function giving the result for an item by a descent.
+        :param answer: Function of (count, found), or of arrays of them, giving the result for an item. Count is the
+            number of items in tree less than the item, found is True if the item is in tree.
+        :param dtype: Type of result, bool or int.
+        :return: Result per item. NumPy array if data is one, else, list.
+        """
+        is_array = np is not None and isinstance(data, np.ndarray)
+        probes = data.tolist() if is_array else list(data)
+        if self.root and self._rebuild_pays(len(probes)):
+            results = self._sweep_many(probes, answer)
+        else:
+            results = [single(x) for x in probes]
+        if is_array:
+            return results if isinstance(results, np.ndarray) else np.array(results, dtype=dtype)
+        return results.tolist() if np is not None and isinstance(results, np.ndarray) else results
+
+    def _sweep_many(self, probes: list, answer: Any) -> Any:
+        """Places a batch of data among the tree's data in one in-order pass. See _probe_many.
+
+        :param probes: List of data, tree not empty.
+        :param answer: As in _probe_many.
+        :return: Result per item. NumPy array if NumPy was used, else, list.
+        """
+        if np is not None and isinstance(self.min_node.data, (int, float)):
+            keys = np.array([cur_node.data for cur_node in self._in_order_nodes()])
+            targets = np.array(probes)
+            if keys.dtype.kind in 'iuf' and targets.dtype.kind in 'iuf':
+                counts = np.searchsorted(keys, targets)
+                found = (counts < len(keys)) & (keys[np.minimum(counts, len(keys) - 1)] == targets)
+                return answer(counts, found)
+
+        batch = sorted(set(probes))
+        placed = {}
+        i = 0
+        count = 0
+        for cur_node in self._in_order_nodes():
+            x = cur_node.data
+            while i < len(batch) and batch[i] < x:
+                placed[batch[i]] = (count, False)
+                i += 1
+            if i < len(batch) and batch[i] == x:
+                placed[batch[i]] = (count, True)
+                i += 1
+            count += 1
+        for x in batch[i:]:
+            placed[x] = (count, False)
+        return [answer(*placed[x]) for x in probes]
+
+    def select(self, index: int) -> Q:
+        """Finds data at index in sorted order in O(log n).
+
+        :param index: int. 0 for the smallest item, len(tree) - 1 for the largest.
+        :return: Data at index.
+        """
+        return self._select_node(index).data
+
+    def _select_node(self, index: int) -> 'Node':
+        """Finds node at index in sorted order, using sub-tree sizes.
+
+        :param index: int. 0 for the smallest item, len(tree) - 1 for the largest.
+        :return: Node at index.
+        """
+        if not 0 <= index < self.size:
+            raise IndexError(f'{index} out of range for tree of size {self.size}.')
+        cur_node = self.root
+        while True:
+            left = cur_node.left.size if cur_node.left else 0
+            if index < left:
+                cur_node = cur_node.left
+            elif index > left:
+                index -= left + 1
+                cur_node = cur_node.right
+            else:
+                return cur_node
+
+    def count_range(self, low: Q, high: Q) -> int:
+        """Counts items x in tree with low <= x <= high in O(log n).
+
+        :param low: Lower bound, inclusive.
+        :param high: Upper bound, inclusive.
+        :return: int.
+        """
+        if high < low:
+            return 0
+        return self._rank(high, True) - self._rank(low, False)
+
+    def split(self, data: Q) -> tuple:
+        """Splits tree around data in O(log n).
+
+        Tree is emptied, its nodes make up the two new trees.
+
+        :param data: Data to split around, need not be in tree.
+        :return: (tree of items < data, True if data was in tree, tree of items > data)
+        """
+        if not self.root:
+            return self._adopt(None), False, self._adopt(None)
+        left, found, right = self.root.split(self.root, data)
+        self.clear_tree()
+        return self._adopt(left), found is not None, self._adopt(right)
+
+    def join(self, data: Q, other: 'AVLTree', *fields: Any) -> 'AVLTree':
+        """Joins tree, data and other into one tree in O(log n), as in AVLTree.join(left, data, right).
+
+        Every item in tree must be less than data, and every item in other greater. Both trees are emptied, their
+        nodes make up the new tree.
+
+        :param data: Data between the two trees.
+        :param other: Tree of the same node type.
+        :param fields: Further fields of data's node, eg. its value in an AVLTreeMap.
+        :return: New tree holding the items of both trees and data.
+        """
+        self._check_operand(other)
+        if (self.max_node and not self.max_node.data < data) or (other.min_node and not data < other.min_node.data):
+            raise ValueError(f'{data} must be greater than all of left tree and less than all of right tree.')
+        pivot = self.node_type(data, *fields)
+        root = pivot.join(self.root, pivot, other.root)
+        self.clear_tree()
+        other.clear_tree()
+        return self._adopt(root)
+
+    def union(self, other: 'AVLTree') -> 'AVLTree':
+        """Merges two trees into one holding items in either in O(m log(n/m + 1)), for sizes m <= n.
+
+        Both trees are emptied, their nodes make up the new tree. Nodes of tree are kept for items in both.
+
+        :param other: Tree of the same node type.
+        :return: New tree.
+        """
+        return self._combine(other, 'union')
+
+    def intersection(self, other: 'AVLTree') -> 'AVLTree':
+        """Merges two trees into one holding items in both in O(m log(n/m + 1)). Empties both trees.
+
+        :param other: Tree of the same node type.
+        :return: New tree.
+        """
+        return self._combine(other, 'intersection')
+
+    def difference(self, other: 'AVLTree') -> 'AVLTree':
+        """Removes items in other from tree in O(m log(n/m + 1)). Empties both trees.
+
+        :param other: Tree of the same node type.
+        :return: New tree.
+        """
+        return self._combine(other, 'difference')
+
+    def symmetric_difference(self, other: 'AVLTree') -> 'AVLTree':
+        """Merges two trees into one holding items in exactly one of them in O(m log(n/m + 1)). Empties both trees.
+
+        :param other: Tree of the same node type.
+        :return: New tree.
+        """
+        return self._combine(other, 'symmetric_difference')
+
+    def _combine(self, other: 'AVLTree', operation: str) -> 'AVLTree':
+        """Calls the set operation of Node class on both trees' roots.
+
+        :param other: Tree of the same node type.
+        :param operation: Name of Node method.
+        :return: New tree holding the result.
+        """
+        self._check_operand(other)
+        engine = self.root or other.root
+        root = getattr(engine, operation)(self.root, other.root) if engine else None
+        self.clear_tree()
+        other.clear_tree()
+        return self._adopt(root)
+
+    def _check_operand(self, other: 'AVLTree') -> None:
+        """Ensures other's nodes may be linked into tree.
+
+        :param other: Second operand of a join or set operation.
+        """
+        if other is self:
+            raise ValueError('Tree cannot be combined with itself.')
+        if other.node_type is not self.node_type:
+            raise TypeError(f'Cannot combine trees of {self.node_type.__name__} and {other.node_type.__name__}.')
+
+    def _adopt(self, root: 'Node') -> 'AVLTree':
+        """Wraps a detached sub-tree in a new tree like this one.
+
+        :param root: Root of sub-tree, or None.
+        :return: New tree.
+        """
+        tree = type(self)(parent_pointers=self.node_type.parented)
+        if root:
+            tree.root = root
+            tree.size = root.size
+            tree.min_node = tree._edge_node(root, False)
+            tree.max_node = tree._edge_node(root, True)
+            tree.depths_known = False
+        return tree
 
     def clear_tree(self) -> None:
         """Clears tree of all data.
@@ -733,6 +1965,10 @@ class AVLTree(object):
         """
         self.root = None
         self.size = 0
+        self.min_node = None
+        self.max_node = None
+        self.counts['path_length'] = 0
+        self.depths_known = True
 
 
 if __name__ == "__main__":
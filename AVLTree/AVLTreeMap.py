@@ -0,0 +1,501 @@
+from collections import Counter
+from collections.abc import ItemsView, ValuesView, MutableMapping
+from typing import Any, Callable, Iterable, Iterator, Mapping, Tuple
+from AVLTree.AVLTree import AVLTree, LeanNode, Node, Q
+import operator
+"""Sorted key -> value mapping built on AVLTree.
+
+"""
+
+
+class LeanMapNode(LeanNode):
+
+    """LeanNode holding a value alongside its data, the key.
+
+    """
+
+    __slots__ = ('value',)
+
+    def __init__(self, data: Q, value: Any = None) -> None:
+        """Instantiates LeanMapNode object for AVLTreeMap.
+
+        :param data: Key. int, float, str.
+        :param value: Value mapped to by key.
+        """
+        self.data = data
+        self.value = value
+        self.left = None
+        self.right = None
+        self.tallness = 1
+        self.size = 1
+
+    def _replace_data(self, cur_node: 'LeanMapNode', source: 'LeanMapNode') -> None:
+        """Gives cur_node the key and value of source.
+
+        :param cur_node: Node receiving key and value.
+        :param source: Node providing key and value.
+        """
+        cur_node.data = source.data
+        cur_node.value = source.value
+
+
+class MapNode(Node):
+
+    """Node holding a value alongside its data, the key.
+
+    """
+
+    __slots__ = ('value',)
+
+    def __init__(self, data: Q, value: Any = None) -> None:
+        """Instantiates MapNode object for AVLTreeMap.
+
+        :param data: Key. int, float, str.
+        :param value: Value mapped to by key.
+        """
+        self.data = data
+        self.value = value
+        self.parent = None
+        self.left = None
+        self.right = None
+        self.tallness = 1
+        self.size = 1
+
+    _replace_data = LeanMapNode._replace_data
+
+
+class Monoid(object):
+
+    """Associative combine with an identity, summarizing the values of a sub-tree, eg. their sum or minimum.
+
+    Values are measured first, each by itself if measure is None, eg. 1 per value to count them. combine need not be
+    commutative, summaries are combined in key order.
+
+    """
+
+    __slots__ = ('combine', 'identity', 'measure')
+
+    def __init__(self, combine: Callable, identity: Any, measure: Callable = None) -> None:
+        """Instantiates Monoid object for AVLTreeMap.
+
+        :param combine: Function of two summaries giving the summary of both, eg. operator.add.
+        :param identity: Summary of no values, eg. 0 for a sum.
+        :param measure: Optional function of a value giving its summary.
+        """
+        self.combine = combine
+        self.identity = identity
+        self.measure = measure
+
+
+SUM = Monoid(operator.add, 0)
+MIN = Monoid(min, float('inf'))
+MAX = Monoid(max, float('-inf'))
+COUNT = Monoid(operator.add, 0, lambda value: 1)
+
+
+class LeanAugmentedMapNode(LeanMapNode):
+
+    """LeanMapNode keeping the summary of the values in its sub-tree, under its class's monoid.
+
+    The summary is recomputed from the children's wherever the engine changes a node's children: along the path of
+    an insertion or deletion before retracing, in rotations and in the links made by join and split.
+
+    """
+
+    __slots__ = ('summary',)
+
+    monoid = None
+
+    def __init__(self, data: Q, value: Any = None) -> None:
+        """Instantiates LeanAugmentedMapNode object for AVLTreeMap.
+
+        :param data: Key. int, float, str.
+        :param value: Value mapped to by key.
+        """
+        self.data = data
+        self.value = value
+        self.left = None
+        self.right = None
+        self.tallness = 1
+        self.size = 1
+        self.summary = value if self.monoid.measure is None else self.monoid.measure(value)
+
+    def _summarize(self, cur_node: 'LeanAugmentedMapNode') -> None:
+        """Recomputes the summary of cur_node's sub-tree from its value and its children's summaries.
+
+        :param cur_node: Node whose children's summaries are up to date.
+        """
+        monoid = self.monoid
+        summary = cur_node.value if monoid.measure is None else monoid.measure(cur_node.value)
+        if cur_node.left:
+            summary = monoid.combine(cur_node.left.summary, summary)
+        if cur_node.right:
+            summary = monoid.combine(summary, cur_node.right.summary)
+        cur_node.summary = summary
+
+    def _inspect_insertion(self, cur_node: 'LeanAugmentedMapNode', nodes: list,
+                           counts: Counter = None) -> 'LeanAugmentedMapNode':
+        """Updates the summaries on the path to the new node, then retraces as LeanNode does.
+
+        :param cur_node: The newly inserted node.
+        :param nodes: Path of nodes from the root down to the parent of cur_node.
+        :param counts: Optional Counter of the tree's rotations and path length.
+        :return: Root of tree.
+        """
+        for ancestor in reversed(nodes):
+            self._summarize(ancestor)
+        return LeanMapNode._inspect_insertion(self, cur_node, nodes, counts)
+
+    def _inspect_deletion(self, nodes: list, counts: Counter = None) -> 'LeanAugmentedMapNode':
+        """Updates the summaries on the path to the deleted node, then retraces as LeanNode does.
+
+        :param nodes: Path of nodes from the root down to the parent of the deleted node.
+        :param counts: Optional Counter of the tree's rotations and path length.
+        :return: Root of tree.
+        """
+        for ancestor in reversed(nodes):
+            self._summarize(ancestor)
+        return LeanMapNode._inspect_deletion(self, nodes, counts)
+
+    def _right_rotate(self, z: 'LeanAugmentedMapNode') -> 'LeanAugmentedMapNode':
+        y = LeanMapNode._right_rotate(self, z)
+        self._summarize(z)
+        self._summarize(y)
+        return y
+
+    def _left_rotate(self, z: 'LeanAugmentedMapNode') -> 'LeanAugmentedMapNode':
+        y = LeanMapNode._left_rotate(self, z)
+        self._summarize(z)
+        self._summarize(y)
+        return y
+
+    def _link(self, cur_node: 'LeanAugmentedMapNode', left: 'LeanAugmentedMapNode',
+              right: 'LeanAugmentedMapNode') -> None:
+        LeanMapNode._link(self, cur_node, left, right)
+        self._summarize(cur_node)
+
+    def _rebalance(self, cur_node: 'LeanAugmentedMapNode', counts: Counter = None) -> 'LeanAugmentedMapNode':
+        top = LeanMapNode._rebalance(self, cur_node, counts)
+        if top is cur_node:
+            self._summarize(cur_node)
+        return top
+
+
+class AugmentedMapNode(MapNode):
+
+    """MapNode keeping the summary of the values in its sub-tree, under its class's monoid.
+
+    """
+
+    __slots__ = ('summary',)
+
+    monoid = None
+
+    def __init__(self, data: Q, value: Any = None) -> None:
+        """Instantiates AugmentedMapNode object for AVLTreeMap.
+
+        :param data: Key. int, float, str.
+        :param value: Value mapped to by key.
+        """
+        self.data = data
+        self.value = value
+        self.parent = None
+        self.left = None
+        self.right = None
+        self.tallness = 1
+        self.size = 1
+        self.summary = value if self.monoid.measure is None else self.monoid.measure(value)
+
+    _summarize = LeanAugmentedMapNode._summarize
+    _inspect_insertion = LeanAugmentedMapNode._inspect_insertion
+    _inspect_deletion = LeanAugmentedMapNode._inspect_deletion
+    _right_rotate = LeanAugmentedMapNode._right_rotate
+    _left_rotate = LeanAugmentedMapNode._left_rotate
+    _link = LeanAugmentedMapNode._link
+    _rebalance = LeanAugmentedMapNode._rebalance
+
+
+# Node classes made for each monoid, so trees of the same monoid may be joined.
+_augmented_types = {}
+
+
+def augmented_node_type(monoid: Monoid, parent_pointers: bool = True) -> type:
+    """Finds the node class keeping summaries under monoid, making it on first use.
+
+    :param monoid: Monoid.
+    :param parent_pointers: Subclass of AugmentedMapNode if True, else of LeanAugmentedMapNode.
+    :return: Node class.
+    """
+    key = (monoid, parent_pointers)
+    if key not in _augmented_types:
+        base = AugmentedMapNode if parent_pointers else LeanAugmentedMapNode
+        _augmented_types[key] = type(base.__name__, (base,), {'__slots__': (), 'monoid': monoid})
+    return _augmented_types[key]
+
+
+class AVLTreeItemsView(ItemsView):
+
+    """Items of an AVLTreeMap, walked in key order.
+
+    """
+
+    def __iter__(self) -> Iterator[Tuple[Q, Any]]:
+        for cur_node in self._mapping._in_order_nodes():
+            yield cur_node.data, cur_node.value
+
+    def __reversed__(self) -> Iterator[Tuple[Q, Any]]:
+        for cur_node in self._mapping._irange_nodes(None, None, (True, True), True):
+            yield cur_node.data, cur_node.value
+
+
+class AVLTreeValuesView(ValuesView):
+
+    """Values of an AVLTreeMap, walked in key order.
+
+    """
+
+    def __iter__(self) -> Iterator[Any]:
+        for cur_node in self._mapping._in_order_nodes():
+            yield cur_node.value
+
+    def __reversed__(self) -> Iterator[Any]:
+        for cur_node in self._mapping._irange_nodes(None, None, (True, True), True):
+            yield cur_node.value
+
+
+class AVLTreeMap(AVLTree, MutableMapping):
+
+    """Mapping of keys to values kept in key order.
+
+    Keys are the data of MapNodes, so AVLTree's search, rank, select, irange and friends work on keys.
+    Each lookup, assignment and deletion is a single descent from the root.
+
+    Given a monoid, each node keeps the summary of the values in its sub-tree, so aggregate answers for any key
+    range in O(log n). Assigning to a key already in mapping then takes a second descent, to update the summaries
+    above it.
+
+    """
+
+    _marker = object()
+
+    def __init__(self, data: Mapping or Iterable = None, parent_pointers: bool = True, monoid: Monoid = None) -> None:
+        """Mapping is represented by its root node, initially None.
+
+            Create a new mapping:
+                mapping = AVLTreeMap()
+                mapping = AVLTreeMap({key: value})
+                mapping = AVLTreeMap([(key, value)])
+
+            Use as a dict:
+                mapping[key] = value
+                value = mapping[key]
+                del mapping[key]
+                mapping.get(key, default), mapping.setdefault(key, default), mapping.pop(key, default)
+
+            Walk in key order:
+                mapping.items(), mapping.keys(), mapping.values()
+                mapping.irange_items(low, high, inclusive=(True, True), reverse=False)
+
+            Summarize values by key range:
+                mapping = AVLTreeMap(monoid=SUM)  # also MIN, MAX, COUNT or any Monoid
+                mapping.aggregate(low, high, inclusive=(True, True))
+
+        :param data: Optional mapping or iterable of (key, value) pairs to insert.
+        :param parent_pointers: Set to False to build the mapping from LeanMapNodes.
+        :param monoid: Optional Monoid summarizing values, see aggregate.
+        """
+        super().__init__(parent_pointers=parent_pointers)
+        self.monoid = monoid
+        if monoid is not None:
+            self.node_type = augmented_node_type(monoid, parent_pointers)
+        else:
+            self.node_type = MapNode if parent_pointers else LeanMapNode
+        if data is not None:
+            self.update(data)
+
+    def __getitem__(self, key: Q) -> Any:
+        cur_node = self._find_node(self.root, key)
+        if not cur_node:
+            raise KeyError(key)
+        return cur_node.value
+
+    def __setitem__(self, key: Q, value: Any) -> None:
+        self._set(key, value, True)
+
+    def __delitem__(self, key: Q) -> None:
+        if not self._remove(key):
+            raise KeyError(key)
+
+    def __contains__(self, key: Q) -> bool:
+        return self._find_node(self.root, key) is not None
+
+    def _set(self, key: Q, value: Any, overwrite: bool) -> 'MapNode':
+        """Maps key to value in one descent, inserting key if not in mapping.
+
+        :param key: Key.
+        :param value: Value.
+        :param overwrite: Replaces the value of a key already in mapping if True.
+        :return: Node holding key if it was already in mapping, else, None.
+        """
+        if not self.root:
+            self.root = self.min_node = self.max_node = self.node_type(key, value)
+            self.size += 1
+            self.counts['insertions'] += 1
+            return None
+
+        repeated_data = []
+        self.root = self.root.insert(self.root, key, repeated_data, value, counts=self.counts)
+        if repeated_data:
+            if overwrite:
+                repeated_data[0].value = value
+                if self.monoid is not None:
+                    self._resummarize(key)
+            return repeated_data[0]
+        self.size += 1
+        self._extend_extremes(key)
+        return None
+
+    def _resummarize(self, key: Q) -> None:
+        """Updates the summaries of key's node and the nodes above it after its value changed.
+
+        :param key: Key in mapping.
+        """
+        nodes = []
+        cur_node = self._find_node(self.root, key, nodes)
+        for cur_node in [cur_node] + nodes[::-1]:
+            cur_node._summarize(cur_node)
+
+    def _build(self, nodes: list) -> None:
+        """Replaces the mapping's contents with a perfectly balanced tree of nodes, then summarizes it bottom up.
+
+        :param nodes: Nodes of distinct keys in ascending order.
+        """
+        super()._build(nodes)
+        if self.monoid is None or not self.root:
+            return
+        order = []
+        stack = [self.root]
+        while stack:
+            cur_node = stack.pop()
+            order.append(cur_node)
+            stack.extend(child for child in (cur_node.left, cur_node.right) if child)
+        for cur_node in reversed(order):
+            cur_node._summarize(cur_node)
+
+    def _adopt(self, root: MapNode) -> 'AVLTreeMap':
+        """Wraps a detached sub-tree in a new mapping with the same monoid.
+
+        :param root: Root of sub-tree, or None.
+        :return: New mapping.
+        """
+        tree = super()._adopt(root)
+        tree.monoid = self.monoid
+        tree.node_type = self.node_type
+        return tree
+
+    def aggregate(self, low: Q = None, high: Q = None, inclusive: tuple = (True, True)) -> Any:
+        """Combines the values of keys between low and high under the mapping's monoid in O(log n).
+
+        Walks down to the first node in range, then down each side of it to low and high, taking the summaries of
+        the sub-trees hanging inside the range whole.
+
+        :param low: Lower bound, None for no bound.
+        :param high: Upper bound, None for no bound.
+        :param inclusive: (include low, include high).
+        :return: Summary of the values in range, the monoid's identity if there are none.
+        """
+        monoid = self.monoid
+        if monoid is None:
+            raise ValueError('Mapping has no monoid. Pass one to AVLTreeMap to aggregate.')
+
+        def above(key: Q) -> bool:
+            return low is None or low < key or (inclusive[0] and low == key)
+
+        def below(key: Q) -> bool:
+            return high is None or key < high or (inclusive[1] and key == high)
+
+        def measure(cur_node: MapNode) -> Any:
+            return cur_node.value if monoid.measure is None else monoid.measure(cur_node.value)
+
+        fork = self.root
+        while fork and not (above(fork.data) and below(fork.data)):
+            fork = fork.right if not above(fork.data) else fork.left
+        if not fork:
+            return monoid.identity
+
+        summary = measure(fork)
+        cur_node = fork.left
+        while cur_node:
+            if above(cur_node.data):
+                if cur_node.right:
+                    summary = monoid.combine(cur_node.right.summary, summary)
+                summary = monoid.combine(measure(cur_node), summary)
+                cur_node = cur_node.left
+            else:
+                cur_node = cur_node.right
+        cur_node = fork.right
+        while cur_node:
+            if below(cur_node.data):
+                if cur_node.left:
+                    summary = monoid.combine(summary, cur_node.left.summary)
+                summary = monoid.combine(summary, measure(cur_node))
+                cur_node = cur_node.right
+            else:
+                cur_node = cur_node.left
+        return summary
+
+    def setdefault(self, key: Q, default: Any = None) -> Any:
+        """Returns value of key, first mapping key to default if not in mapping.
+
+        :param key: Key.
+        :param default: Value for key if not in mapping.
+        :return: Value of key.
+        """
+        cur_node = self._set(key, default, False)
+        return cur_node.value if cur_node else default
+
+    def pop(self, key: Q, default: Any = _marker) -> Any:
+        """Removes key and returns its value, or default if key is not in mapping.
+
+        :param key: Key.
+        :param default: Returned if key is not in mapping. KeyError is raised if not given.
+        :return: Value of key.
+        """
+        nodes = []
+        cur_node = self._find_node(self.root, key, nodes)
+        if not cur_node:
+            if default is self._marker:
+                raise KeyError(key)
+            return default
+        value = cur_node.value
+        self.size -= 1
+        self._delete(cur_node, nodes)
+        return value
+
+    def popitem(self) -> Tuple[Q, Any]:
+        """Removes and returns the item with the smallest key.
+
+        :return: (key, value).
+        """
+        if not self.root:
+            raise KeyError('popitem(): mapping is empty')
+        cur_node = self._pop_edge(False)
+        return cur_node.data, cur_node.value
+
+    def clear(self) -> None:
+        self.clear_tree()
+
+    def items(self) -> AVLTreeItemsView:
+        return AVLTreeItemsView(self)
+
+    def values(self) -> AVLTreeValuesView:
+        return AVLTreeValuesView(self)
+
+    def irange_items(self, low: Q = None, high: Q = None, inclusive: tuple = (True, True),
+                     reverse: bool = False) -> Iterator[Tuple[Q, Any]]:
+        """Yields (key, value) for keys between low and high lazily. Parameters as in AVLTree.irange.
+
+        :return: Iterator over items in range.
+        """
+        for cur_node in self._irange_nodes(low, high, inclusive, reverse):
+            yield cur_node.data, cur_node.value
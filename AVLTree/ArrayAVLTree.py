@@ -0,0 +1,399 @@
+from array import array
+from typing import Iterable, Iterator
+from AVLTree.AVLTree import Q, Iq
+from AVLTree.BalancedTree import BalancedTree
+"""Array backed AVLTree.
+
+Nodes are rows of parallel columns rather than Python objects, so millions of keys cost a handful of arrays instead of
+millions of objects for the garbage collector to track.
+
+"""
+
+
+class ArrayAVLTree(BalancedTree):
+
+    """AVLTree storing its nodes in parallel columns indexed by node id.
+
+    Implements BalancedTree only: AVLTree's batch updates, floor and ceiling, rank and select, stats, print_tree and
+    set algebra are not provided.
+
+    Left child, right child and tallness of node i are left[i], right[i] and tallness[i], all array('i') columns.
+    Its data is keys[i], a list, or a typed array if a typecode is given.
+    Node id 0 is the null node, with tallness 0, so children need no None checks.
+    Ids of deleted nodes are kept in free and reused by later insertions.
+
+    The columns pickle as flat buffers, making the tree cheap to serialize in bulk.
+
+    """
+
+    def __init__(self, typecode: str = None) -> None:
+        """Tree is represented by its root node id, initially 0.
+
+        Tree designed for data types supporting <, =, >.
+
+        BalancedTree interface:
+            tree = ArrayAVLTree()
+            tree.insert(data)
+            tree.search(data, print_result=True)
+            tree.delete(data)
+            tree.height(print_result=True)
+            len(tree), iter(tree), reversed(tree)
+            tree.irange(low, high, inclusive=(True, True), reverse=False)
+            tree.min(), tree.max()
+            tree.clear_tree()
+
+        :param typecode: Optional array typecode for keys, eg. 'q' for int or 'd' for float. Keys are kept in a
+            list if None.
+        """
+        self.typecode = typecode
+        self.clear_tree()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[Q]:
+        """Yields data in order, walking the tree with an explicit stack.
+
+        :return: Iterator over data in tree.
+        """
+        keys, left, right = self.keys, self.left, self.right
+        stack = []
+        cur_node = self.root
+        while stack or cur_node:
+            while cur_node:
+                stack.append(cur_node)
+                cur_node = left[cur_node]
+            cur_node = stack.pop()
+            yield keys[cur_node]
+            cur_node = right[cur_node]
+
+    def __reversed__(self) -> Iterator[Q]:
+        """Yields data in descending order, walking the tree with an explicit stack.
+
+        :return: Iterator over data in tree.
+        """
+        keys, left, right = self.keys, self.left, self.right
+        stack = []
+        cur_node = self.root
+        while stack or cur_node:
+            while cur_node:
+                stack.append(cur_node)
+                cur_node = right[cur_node]
+            cur_node = stack.pop()
+            yield keys[cur_node]
+            cur_node = left[cur_node]
+
+    def irange(self, low: Q = None, high: Q = None, inclusive: tuple = (True, True),
+               reverse: bool = False) -> Iterator[Q]:
+        """Yields data between low and high lazily, visiting only the nodes on the way to and within the range.
+
+        Finds the first item in range in O(log n), then yields each next one in O(1) amortized.
+
+        :param low: Lower bound, None for no bound.
+        :param high: Upper bound, None for no bound.
+        :param inclusive: (include low, include high).
+        :param reverse: Yields data from high down to low if True.
+        :return: Iterator over data in range.
+        """
+        keys = self.keys
+
+        def above_low(data: Q) -> bool:
+            return low is None or (low <= data if inclusive[0] else low < data)
+
+        def below_high(data: Q) -> bool:
+            return high is None or (data <= high if inclusive[1] else data < high)
+
+        if reverse:
+            first, second, starts, ends = self.right, self.left, below_high, above_low
+        else:
+            first, second, starts, ends = self.left, self.right, above_low, below_high
+        stack = []
+        cur_node = self.root
+        while cur_node:
+            if starts(keys[cur_node]):
+                stack.append(cur_node)
+                cur_node = first[cur_node]
+            else:
+                cur_node = second[cur_node]
+        while stack:
+            cur_node = stack.pop()
+            if not ends(keys[cur_node]):
+                return
+            yield keys[cur_node]
+            cur_node = second[cur_node]
+            while cur_node:
+                stack.append(cur_node)
+                cur_node = first[cur_node]
+
+    def min(self) -> Q:
+        """Returns smallest item in tree in O(log n).
+
+        :return: Smallest data.
+        """
+        if not self.root:
+            raise ValueError('Tree is empty.')
+        cur_node = self.root
+        while self.left[cur_node]:
+            cur_node = self.left[cur_node]
+        return self.keys[cur_node]
+
+    def max(self) -> Q:
+        """Returns largest item in tree in O(log n).
+
+        :return: Largest data.
+        """
+        if not self.root:
+            raise ValueError('Tree is empty.')
+        cur_node = self.root
+        while self.right[cur_node]:
+            cur_node = self.right[cur_node]
+        return self.keys[cur_node]
+
+    def _new_node(self, data: Q) -> int:
+        """Allocates a node for data, reusing a free id if there is one.
+
+        :param data: Data of new node.
+        :return: Id of new node.
+        """
+        if self.free:
+            node = self.free.pop()
+            self.keys[node] = data
+            self.left[node] = 0
+            self.right[node] = 0
+            self.tallness[node] = 1
+            return node
+        self.keys.append(data)
+        self.left.append(0)
+        self.right.append(0)
+        self.tallness.append(1)
+        return len(self.tallness) - 1
+
+    def _free_node(self, node: int) -> None:
+        """Releases node's id for reuse.
+
+        :param node: Id of a node no longer in the tree.
+        """
+        self.keys[node] = self.keys[0]
+        self.free.append(node)
+
+    def height(self, print_result: bool = False) -> int:
+        """User interface for finding height of tree.
+
+        Option to print height to stdout.
+
+        :param print_result: Prints height to stdout if True.
+        :return: Height of tree.
+        """
+        height = self.tallness[self.root]
+        if print_result:
+            print(height)
+        return height
+
+    def search(self, data: Q, print_result: bool = False) -> bool:
+        """User interface for search method.
+
+        Option to print results to stdout.
+
+        :param print_result: Set to True to print search results.
+        :param data: Data to be found in tree.
+        :return: bool. True if data in tree, else, False.
+        """
+        keys, left, right = self.keys, self.left, self.right
+        cur_node = self.root
+        result = False
+        while cur_node:
+            if data < keys[cur_node]:
+                cur_node = left[cur_node]
+            elif data > keys[cur_node]:
+                cur_node = right[cur_node]
+            else:
+                result = True
+                break
+
+        if print_result:
+            if result:
+                print(f'{data} found.')
+            else:
+                print(f'{data} not found.')
+
+        return result
+
+    def insert(self, data: Q or Iq) -> None:
+        """User interface for inserting data into tree.
+
+        :param data: int, float, str or Iterable[int, float, str].
+        """
+        if isinstance(data, Iterable):
+            for x in data:
+                self._insert(x)
+        else:
+            self._insert(data)
+
+    def _insert(self, data: Q) -> None:
+        """Inserts data into tree, ignoring data already in tree.
+
+        Walks down from the root recording the path taken, then calls _retrace with the path.
+
+        :param data: Data to be inserted into tree.
+        """
+        keys, left, right = self.keys, self.left, self.right
+        if not self.root:
+            self.root = self._new_node(data)
+            self.size += 1
+            return
+
+        path = []
+        cur_node = self.root
+        while True:
+            path.append(cur_node)
+            if data < keys[cur_node]:
+                if not left[cur_node]:
+                    left[cur_node] = self._new_node(data)
+                    break
+                cur_node = left[cur_node]
+            elif data > keys[cur_node]:
+                if not right[cur_node]:
+                    right[cur_node] = self._new_node(data)
+                    break
+                cur_node = right[cur_node]
+            else:
+                return
+
+        self.size += 1
+        self._retrace(path)
+
+    def delete(self, data: Q) -> None:
+        """Deletes data from tree.
+
+        Nodes with two children take the data of their successor, which is deleted instead.
+        Calls _retrace with the path to the removed node's parent.
+
+        :param data: Data to delete from tree.
+        """
+        keys, left, right = self.keys, self.left, self.right
+        path = []
+        cur_node = self.root
+        while cur_node:
+            if data < keys[cur_node]:
+                path.append(cur_node)
+                cur_node = left[cur_node]
+            elif data > keys[cur_node]:
+                path.append(cur_node)
+                cur_node = right[cur_node]
+            else:
+                break
+
+        if not cur_node:
+            print(f'{data} not in tree, Cannot delete.')
+            return
+
+        if left[cur_node] and right[cur_node]:
+            path.append(cur_node)
+            successor = right[cur_node]
+            while left[successor]:
+                path.append(successor)
+                successor = left[successor]
+            keys[cur_node] = keys[successor]
+            cur_node = successor
+
+        child = left[cur_node] or right[cur_node]
+        if path:
+            self._replace_child(path[-1], cur_node, child)
+        else:
+            self.root = child
+        self._free_node(cur_node)
+        self.size -= 1
+        self._retrace(path)
+
+    def _replace_child(self, node: int, old: int, new: int) -> None:
+        """Replaces the child old of node with new.
+
+        :param node: Parent of old.
+        :param old: Child to be replaced.
+        :param new: Node taking old's place, or 0.
+        """
+        if self.left[node] == old:
+            self.left[node] = new
+        else:
+            self.right[node] = new
+
+    def _retrace(self, path: list) -> None:
+        """Rebalances and updates heights along path after an insertion or deletion.
+
+        Retracing ends as soon as a sub-tree's height is unchanged, as no node above it can be affected.
+
+        :param path: Node ids from the root down to the parent of the inserted or removed node.
+        """
+        tallness = self.tallness
+        while path:
+            cur_node = path.pop()
+            old = tallness[cur_node]
+            top = self._rebalance_node(cur_node)
+            if top != cur_node:
+                if path:
+                    self._replace_child(path[-1], cur_node, top)
+                else:
+                    self.root = top
+            if tallness[top] == old:
+                return
+
+    def _rebalance_node(self, z: int) -> int:
+        """Rotates around z if its children's heights differ by more than 1, else updates its height.
+
+        :param z: Id of node to be balanced.
+        :return: Id of the sub-tree's root.
+        """
+        left, right, tallness = self.left, self.right, self.tallness
+        balance = tallness[left[z]] - tallness[right[z]]
+        if balance > 1:
+            y = left[z]
+            if tallness[left[y]] < tallness[right[y]]:
+                left[z] = self._left_rotate(y)
+            return self._right_rotate(z)
+        if balance < -1:
+            y = right[z]
+            if tallness[right[y]] < tallness[left[y]]:
+                right[z] = self._right_rotate(y)
+            return self._left_rotate(z)
+        tallness[z] = 1 + max(tallness[left[z]], tallness[right[z]])
+        return z
+
+    def _right_rotate(self, z: int) -> int:
+        """Makes z the right child of its left child y.
+
+        :param z: Id of root of sub-tree to be balanced.
+        :return: Id of y, the new root of the sub-tree.
+        """
+        left, right, tallness = self.left, self.right, self.tallness
+        y = left[z]
+        left[z] = right[y]
+        right[y] = z
+        tallness[z] = 1 + max(tallness[left[z]], tallness[right[z]])
+        tallness[y] = 1 + max(tallness[left[y]], tallness[z])
+        return y
+
+    def _left_rotate(self, z: int) -> int:
+        """Makes z the left child of its right child y.
+
+        :param z: Id of root of sub-tree to be balanced.
+        :return: Id of y, the new root of the sub-tree.
+        """
+        left, right, tallness = self.left, self.right, self.tallness
+        y = right[z]
+        right[z] = left[y]
+        left[y] = z
+        tallness[z] = 1 + max(tallness[left[z]], tallness[right[z]])
+        tallness[y] = 1 + max(tallness[z], tallness[right[y]])
+        return y
+
+    def clear_tree(self) -> None:
+        """Clears tree of all data, releasing its columns.
+
+        """
+        self.keys = array(self.typecode, [0]) if self.typecode else [None]
+        self.left = array('i', [0])
+        self.right = array('i', [0])
+        self.tallness = array('i', [0])
+        self.free = []
+        self.root = 0
+        self.size = 0
@@ -0,0 +1,141 @@
+import asyncio
+from itertools import groupby, islice
+from typing import AsyncIterator
+from AVLTree.AVLTree import AVLTree, Q
+"""asyncio front end for AVLTree.
+
+"""
+
+
+class AsyncAVLTree(object):
+
+    """AVLTree for asyncio code, batching requests made in the same tick of the event loop.
+
+    Requests are queued and the tree is updated by a callback scheduled with call_soon, which runs once every
+    coroutine ready in the current tick has had its turn. Queued requests are applied in the order made, each run of
+    requests of one kind as a single sorted batch: insert_many or delete_many for writes, one sorted sweep of lookups
+    for searches.
+
+    Scans hand control back to the loop every SCAN_CHUNK items. Each chunk resumes from the last item yielded with a
+    fresh descent, so requests applied in between never leave a scan walking a stale path.
+
+    """
+
+    # Items yielded by a scan between returns to the event loop.
+    SCAN_CHUNK = 1000
+
+    def __init__(self, tree: AVLTree = None) -> None:
+        """Facade is represented by the tree it wraps and the requests waiting for it.
+
+            tree = AsyncAVLTree()
+            await tree.insert(data)
+            await tree.search(data)
+            await tree.delete(data)
+            await tree.range(low, high)
+            async for data in tree.irange(low, high): ...
+
+        :param tree: AVLTree to wrap, a new one if None. It should only be changed through the facade afterwards.
+        """
+        self.tree = tree if tree is not None else AVLTree()
+        self._pending = []
+
+    def __len__(self) -> int:
+        return len(self.tree)
+
+    def _submit(self, kind: str, data: Q) -> 'asyncio.Future':
+        """Queues a request, scheduling a flush if it is the first of this tick.
+
+        :param kind: 'insert', 'delete' or 'search'.
+        :param data: int, float, str.
+        :return: Future resolved by _flush.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self._pending:
+            loop.call_soon(self._flush)
+        self._pending.append((kind, data, future))
+        return future
+
+    def _flush(self) -> None:
+        """Applies queued requests, each run of one kind as a single sorted batch.
+
+        """
+        pending, self._pending = self._pending, []
+        for kind, run in groupby(pending, key=lambda request: request[0]):
+            run = list(run)
+            try:
+                results = self._apply(kind, [data for _, data, _ in run])
+            except Exception as error:
+                for _, _, future in run:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            for _, data, future in run:
+                if not future.done():
+                    future.set_result(results.get(data))
+
+    def _apply(self, kind: str, batch: list) -> dict:
+        """Applies one batch of requests to the tree.
+
+        :param kind: 'insert', 'delete' or 'search'.
+        :param batch: Data of each request.
+        :return: Dict of data to its result, empty for writes.
+        """
+        if kind == 'insert':
+            self.tree.insert_many(batch)
+            return {}
+        if kind == 'delete':
+            self.tree.delete_many(batch)
+            return {}
+        batch = sorted(set(batch))
+        return dict(zip(batch, self.tree.search_many(batch)))
+
+    async def insert(self, data: Q) -> None:
+        """Inserts data, batched with other requests of this tick.
+
+        :param data: int, float, str.
+        """
+        await self._submit('insert', data)
+
+    async def delete(self, data: Q) -> None:
+        """Deletes data, batched with other requests of this tick. Data not in tree is ignored silently.
+
+        :param data: int, float, str.
+        """
+        await self._submit('delete', data)
+
+    async def search(self, data: Q) -> bool:
+        """Searches for data, batched with other requests of this tick.
+
+        :param data: int, float, str.
+        :return: bool. True if data in tree, else, False.
+        """
+        return await self._submit('search', data)
+
+    async def irange(self, low: Q = None, high: Q = None, inclusive: tuple = (True, True),
+                     reverse: bool = False) -> AsyncIterator[Q]:
+        """Yields data between low and high, returning to the event loop every SCAN_CHUNK items.
+
+        Parameters as in AVLTree.irange. Changes made while the scan is suspended show up in the part not yet yielded.
+
+        :return: Async iterator over data in range.
+        """
+        while True:
+            chunk = list(islice(self.tree.irange(low, high, inclusive, reverse), self.SCAN_CHUNK))
+            for data in chunk:
+                yield data
+            if len(chunk) < self.SCAN_CHUNK:
+                return
+            if reverse:
+                high, inclusive = chunk[-1], (inclusive[0], False)
+            else:
+                low, inclusive = chunk[-1], (False, inclusive[1])
+            await asyncio.sleep(0)
+
+    async def range(self, low: Q = None, high: Q = None, inclusive: tuple = (True, True),
+                    reverse: bool = False) -> list:
+        """Collects data between low and high as irange does, eg. await tree.range() for all data in order.
+
+        :return: List of data in range.
+        """
+        return [data async for data in self.irange(low, high, inclusive, reverse)]
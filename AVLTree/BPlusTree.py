@@ -0,0 +1,340 @@
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator
+from AVLTree.AVLTree import Q, Iq
+from AVLTree.BalancedTree import BalancedTree
+"""In memory B+ tree engine implementing BalancedTree.
+
+Data is kept in sorted lists in linked leaves, so scans read contiguous lists instead of chasing a pointer per item.
+
+"""
+
+
+class Leaf(object):
+
+    """Sorted list of data, linked to the leaves before and after it.
+
+    """
+
+    __slots__ = ('keys', 'prev', 'next')
+
+    def __init__(self, keys: list) -> None:
+        self.keys = keys
+        self.prev = None
+        self.next = None
+
+
+class Branch(object):
+
+    """Inner node. Data in children[i] is >= keys[i - 1] and < keys[i].
+
+    """
+
+    __slots__ = ('keys', 'children')
+
+    def __init__(self, keys: list, children: list) -> None:
+        self.keys = keys
+        self.children = children
+
+
+class BPlusTree(BalancedTree):
+
+    """B+ tree of high fanout, an alternative engine to AVLTree for scan heavy workloads.
+
+    Implements BalancedTree only: AVLTree's batch updates, floor and ceiling, rank and select, stats, print_tree and
+    set algebra are not provided.
+
+    Every leaf is at the same depth, log base fanout / 2 of n at most, so a tree of millions of items is 4 or 5
+    levels tall. Each level is searched with bisect, in C. Nodes other than the root hold fanout / 2 to fanout
+    items or children, so memory is a list slot per item plus a node per fanout / 2 items.
+
+    Separator keys in branches may be left over from deleted data, they still bound their children's data.
+
+    """
+
+    def __init__(self, fanout: int = 64) -> None:
+        """Tree is represented by its root node, initially an empty leaf.
+
+        Tree designed for data types supporting <, =, >.
+
+        BalancedTree interface:
+            tree = BPlusTree()
+            tree.insert(data)
+            tree.search(data, print_result=True)
+            tree.delete(data)
+            tree.height(print_result=True)
+            len(tree), iter(tree), reversed(tree)
+            tree.irange(low, high, inclusive=(True, True), reverse=False)
+            tree.min(), tree.max()
+            tree.clear_tree()
+
+        :param fanout: Most items in a leaf and children of a branch. At least 4.
+        """
+        if fanout < 4:
+            raise ValueError('fanout must be at least 4.')
+        self.fanout = fanout
+        self.clear_tree()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[Q]:
+        """Yields data in order, leaf by leaf.
+
+        :return: Iterator over data in tree.
+        """
+        leaf = self.first
+        while leaf:
+            yield from leaf.keys
+            leaf = leaf.next
+
+    def __reversed__(self) -> Iterator[Q]:
+        """Yields data in descending order, leaf by leaf.
+
+        :return: Iterator over data in tree.
+        """
+        leaf = self.last
+        while leaf:
+            yield from reversed(leaf.keys)
+            leaf = leaf.prev
+
+    def height(self, print_result: bool = False) -> int:
+        """User interface for finding height of tree, counted in levels of nodes.
+
+        Option to print height to stdout.
+
+        :param print_result: Prints height to stdout if True.
+        :return: Height of tree, 0 if tree is empty.
+        """
+        height = self.levels if self.size else 0
+        if print_result:
+            print(height)
+        return height
+
+    def _find_leaf(self, data: Q, path: list = None) -> Leaf:
+        """Walks down from the root to the leaf data belongs in.
+
+        :param data: Data to be found.
+        :param path: Optional list. (branch, index of child taken) pairs are appended to it.
+        :return: Leaf.
+        """
+        cur_node = self.root
+        while type(cur_node) is Branch:
+            i = bisect_right(cur_node.keys, data)
+            if path is not None:
+                path.append((cur_node, i))
+            cur_node = cur_node.children[i]
+        return cur_node
+
+    def search(self, data: Q, print_result: bool = False) -> bool:
+        """User interface for search method.
+
+        Option to print results to stdout.
+
+        :param print_result: Set to True to print search results.
+        :param data: Data to be found in tree.
+        :return: bool. True if data in tree, else, False.
+        """
+        keys = self._find_leaf(data).keys
+        i = bisect_left(keys, data)
+        result = i < len(keys) and keys[i] == data
+
+        if print_result:
+            if result:
+                print(f'{data} found.')
+            else:
+                print(f'{data} not found.')
+
+        return result
+
+    def insert(self, data: Q or Iq) -> None:
+        """User interface for inserting data into tree.
+
+        :param data: int, float, str or Iterable[int, float, str].
+        """
+        if isinstance(data, Iterable):
+            for x in data:
+                self._insert(x)
+        else:
+            self._insert(data)
+
+    def _insert(self, data: Q) -> None:
+        """Inserts data into its leaf, ignoring data already in tree.
+
+        A leaf grown past fanout items is split in two, adding a separator to its parent, which may split in turn.
+
+        :param data: Data to be inserted into tree.
+        """
+        path = []
+        leaf = self._find_leaf(data, path)
+        keys = leaf.keys
+        i = bisect_left(keys, data)
+        if i < len(keys) and keys[i] == data:
+            return
+        keys.insert(i, data)
+        self.size += 1
+        if len(keys) <= self.fanout:
+            return
+
+        half = len(keys) // 2
+        new = Leaf(keys[half:])
+        del keys[half:]
+        new.prev, new.next = leaf, leaf.next
+        if leaf.next:
+            leaf.next.prev = new
+        else:
+            self.last = new
+        leaf.next = new
+        self._add_child(path, new.keys[0], new)
+
+    def _add_child(self, path: list, separator: Q, new: object) -> None:
+        """Hangs new, split off the right of the node at the end of path, from its parent.
+
+        :param path: (branch, index of child taken) pairs from the root down to the parent of the split node.
+        :param separator: Smallest data in or below new.
+        :param new: New node.
+        """
+        while path:
+            branch, i = path.pop()
+            branch.keys.insert(i, separator)
+            branch.children.insert(i + 1, new)
+            if len(branch.children) <= self.fanout:
+                return
+            half = len(branch.children) // 2
+            separator = branch.keys[half - 1]
+            new = Branch(branch.keys[half:], branch.children[half:])
+            del branch.keys[half - 1:]
+            del branch.children[half:]
+        self.root = Branch([separator], [self.root, new])
+        self.levels += 1
+
+    def delete(self, data: Q) -> None:
+        """Deletes data from tree. Alerts user if data is not in tree.
+
+        A leaf left with fewer than fanout / 2 items borrows one from a sibling, or merges with it, removing a child
+        from its parent, which may in turn borrow or merge.
+
+        :param data: Data to delete from tree.
+        """
+        path = []
+        leaf = self._find_leaf(data, path)
+        keys = leaf.keys
+        i = bisect_left(keys, data)
+        if i == len(keys) or keys[i] != data:
+            print(f'{data} not in tree, Cannot delete.')
+            return
+        del keys[i]
+        self.size -= 1
+        cur_node = leaf
+        least = self.fanout // 2
+        while path and len(cur_node.keys if cur_node is leaf else cur_node.children) < least:
+            parent, i = path.pop()
+            self._refill(parent, i)
+            cur_node = parent
+        if type(self.root) is Branch and len(self.root.children) == 1:
+            self.root = self.root.children[0]
+            self.levels -= 1
+
+    def _refill(self, parent: Branch, i: int) -> None:
+        """Tops up parent's child i from a sibling, or merges it with one, removing a child from parent.
+
+        :param parent: Branch.
+        :param i: Index of the child gone below fanout / 2 items or children.
+        """
+        least = self.fanout // 2
+        cur_node = parent.children[i]
+        left = parent.children[i - 1] if i else None
+        right = parent.children[i + 1] if i + 1 < len(parent.children) else None
+        leaf = type(cur_node) is Leaf
+
+        if left and len(left.keys if leaf else left.children) > least:
+            if leaf:
+                cur_node.keys.insert(0, left.keys.pop())
+                parent.keys[i - 1] = cur_node.keys[0]
+            else:
+                cur_node.children.insert(0, left.children.pop())
+                cur_node.keys.insert(0, parent.keys[i - 1])
+                parent.keys[i - 1] = left.keys.pop()
+            return
+        if right and len(right.keys if leaf else right.children) > least:
+            if leaf:
+                cur_node.keys.append(right.keys.pop(0))
+                parent.keys[i] = right.keys[0]
+            else:
+                cur_node.children.append(right.children.pop(0))
+                cur_node.keys.append(parent.keys[i])
+                parent.keys[i] = right.keys.pop(0)
+            return
+
+        if left:
+            i -= 1
+            cur_node, right = left, cur_node
+        if leaf:
+            cur_node.keys += right.keys
+            cur_node.next = right.next
+            if right.next:
+                right.next.prev = cur_node
+            else:
+                self.last = cur_node
+        else:
+            cur_node.keys += [parent.keys[i]] + right.keys
+            cur_node.children += right.children
+        del parent.keys[i]
+        del parent.children[i + 1]
+
+    def irange(self, low: Q = None, high: Q = None, inclusive: tuple = (True, True),
+               reverse: bool = False) -> Iterator[Q]:
+        """Yields data between low and high lazily, slicing whole leaves at a time.
+
+        :param low: Lower bound, None for no bound.
+        :param high: Upper bound, None for no bound.
+        :param inclusive: (include low, include high).
+        :param reverse: Yields data from high down to low if True.
+        :return: Iterator over data in range.
+        """
+        if reverse:
+            leaf = self._find_leaf(high) if high is not None else self.last
+            while leaf:
+                keys = leaf.keys
+                stop = len(keys) if high is None else (bisect_right if inclusive[1] else bisect_left)(keys, high)
+                start = 0 if low is None else (bisect_left if inclusive[0] else bisect_right)(keys, low)
+                yield from reversed(keys[start:stop])
+                if start:
+                    return
+                leaf = leaf.prev
+            return
+
+        leaf = self._find_leaf(low) if low is not None else self.first
+        while leaf:
+            keys = leaf.keys
+            start = 0 if low is None else (bisect_left if inclusive[0] else bisect_right)(keys, low)
+            stop = len(keys) if high is None else (bisect_right if inclusive[1] else bisect_left)(keys, high)
+            yield from keys[start:stop]
+            if stop < len(keys):
+                return
+            leaf = leaf.next
+
+    def min(self) -> Q:
+        """Returns smallest item in tree in O(1).
+
+        :return: Smallest data.
+        """
+        if not self.size:
+            raise ValueError('Tree is empty.')
+        return self.first.keys[0]
+
+    def max(self) -> Q:
+        """Returns largest item in tree in O(1).
+
+        :return: Largest data.
+        """
+        if not self.size:
+            raise ValueError('Tree is empty.')
+        return self.last.keys[-1]
+
+    def clear_tree(self) -> None:
+        """Clears tree of all data.
+
+        """
+        self.root = self.first = self.last = Leaf([])
+        self.levels = 1
+        self.size = 0
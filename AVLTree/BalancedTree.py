@@ -0,0 +1,99 @@
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, Iterator
+"""Interface shared by the balanced tree engines: AVLTree, WAVLTree, BPlusTree and ArrayAVLTree.
+
+"""
+
+
+class BalancedTree(ABC):
+
+    """Sorted set of data supporting <, =, >, kept balanced by one of several engines.
+
+    Code written against the methods below runs on any engine. AVLTree and its subclasses add order statistics,
+    batch updates, floor and ceiling, set algebra, stats and more, which other engines need not provide.
+
+    """
+
+    @abstractmethod
+    def insert(self, data: Any) -> None:
+        """Inserts data into tree, ignoring data already in tree.
+
+        :param data: Data, or Iterable of data, to be inserted.
+        """
+
+    @abstractmethod
+    def search(self, data: Any, print_result: bool = False) -> bool:
+        """Searches tree for data.
+
+        :param data: Data to be found in tree.
+        :param print_result: Set to True to print search results.
+        :return: bool. True if data in tree, else, False.
+        """
+
+    @abstractmethod
+    def delete(self, data: Any) -> None:
+        """Deletes data from tree. Alerts user if data is not in tree.
+
+        :param data: Data to delete from tree.
+        """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Counts data in tree.
+
+        :return: int.
+        """
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[Any]:
+        """Yields data in ascending order.
+
+        :return: Iterator over data in tree.
+        """
+
+    @abstractmethod
+    def __reversed__(self) -> Iterator[Any]:
+        """Yields data in descending order.
+
+        :return: Iterator over data in tree.
+        """
+
+    @abstractmethod
+    def height(self, print_result: bool = False) -> int:
+        """Finds height of tree.
+
+        :param print_result: Prints height to stdout if True.
+        :return: Height of tree, 0 if tree is empty.
+        """
+
+    @abstractmethod
+    def irange(self, low: Any = None, high: Any = None, inclusive: tuple = (True, True),
+               reverse: bool = False) -> Iterable[Any]:
+        """Yields data between low and high lazily.
+
+        :param low: Lower bound, None for no bound.
+        :param high: Upper bound, None for no bound.
+        :param inclusive: (include low, include high).
+        :param reverse: Yields data from high down to low if True.
+        :return: Iterator over data in range.
+        """
+
+    @abstractmethod
+    def min(self) -> Any:
+        """Returns smallest item in tree. Raises ValueError if tree is empty.
+
+        :return: Smallest data.
+        """
+
+    @abstractmethod
+    def max(self) -> Any:
+        """Returns largest item in tree. Raises ValueError if tree is empty.
+
+        :return: Largest data.
+        """
+
+    @abstractmethod
+    def clear_tree(self) -> None:
+        """Clears tree of all data.
+
+        """
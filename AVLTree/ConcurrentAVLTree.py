@@ -0,0 +1,235 @@
+from contextlib import contextmanager
+from threading import Condition, Lock
+from typing import Any, Iterator
+from AVLTree.AVLTree import AVLTree, Q, Iq
+from AVLTree.PersistentAVLTree import PersistentAVLTree
+"""Thread safe AVLTree.
+
+"""
+
+
+class ReadWriteLock(object):
+
+    """Lock held by any number of readers or by one writer.
+
+    Waiting writers go ahead of new readers, so a steady stream of readers cannot starve writers. Not reentrant.
+
+    """
+
+    def __init__(self) -> None:
+        self._condition = Condition(Lock())
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+
+    def acquire_read(self) -> None:
+        with self._condition:
+            while self._writing or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writing or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writing = True
+
+    def release_write(self) -> None:
+        with self._condition:
+            self._writing = False
+            self._condition.notify_all()
+
+    @contextmanager
+    def read_locked(self) -> Iterator[None]:
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self) -> Iterator[None]:
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class ConcurrentAVLTree(object):
+
+    """AVLTree safe to share between threads, with parallel readers and one writer at a time.
+
+    With snapshot_reads, the default, data lives in a PersistentAVLTree. A writer changes a snapshot of the current
+    version under a mutex, then publishes it with a single assignment. Readers take no lock at all: each call reads
+    whichever version was published when it started, which no writer will change. A write that raises publishes
+    nothing.
+
+    Without snapshot_reads, data lives in an AVLTree changed in place, guarded by a ReadWriteLock. Writes cost less,
+    but readers wait for writers, and range scans are copied out under the read lock rather than walked lazily.
+
+    Either way, no reader sees a tree mid rotation.
+
+    """
+
+    def __init__(self, snapshot_reads: bool = True) -> None:
+        """Tree is represented by its current version, or its locked AVLTree.
+
+        Same interface as AVLTree for searching, inserting, deleting, iterating and order statistics, plus:
+            view = tree.snapshot()  # consistent read only copy
+
+        :param snapshot_reads: Set to False to guard an AVLTree with a ReadWriteLock instead of publishing versions.
+        """
+        self.snapshot_reads = snapshot_reads
+        if snapshot_reads:
+            self._version = PersistentAVLTree()
+            self._write_lock = Lock()
+        else:
+            self._tree = AVLTree()
+            self._lock = ReadWriteLock()
+
+    def _read(self, method: str, *args: Any) -> Any:
+        """Calls a method that does not change the tree, on the current version or under the read lock.
+
+        :param method: Name of AVLTree method.
+        :param args: Arguments of method.
+        :return: Result of method.
+        """
+        if self.snapshot_reads:
+            return getattr(self._version, method)(*args)
+        with self._lock.read_locked():
+            return getattr(self._tree, method)(*args)
+
+    def _scan(self, method: str, *args: Any) -> Iterator[Q]:
+        """Calls a method returning an iterator, walking the current version lazily or copying out under the read
+        lock.
+
+        :param method: Name of AVLTree method.
+        :param args: Arguments of method.
+        :return: Iterator.
+        """
+        if self.snapshot_reads:
+            return getattr(self._version, method)(*args)
+        with self._lock.read_locked():
+            return iter(list(getattr(self._tree, method)(*args)))
+
+    def _write(self, method: str, *args: Any) -> Any:
+        """Calls a method that changes the tree, on a new version to be published or under the write lock.
+
+        :param method: Name of AVLTree method.
+        :param args: Arguments of method.
+        :return: Result of method.
+        """
+        if self.snapshot_reads:
+            with self._write_lock:
+                version = self._version.snapshot()
+                result = getattr(version, method)(*args)
+                self._version = version
+                return result
+        with self._lock.write_locked():
+            return getattr(self._tree, method)(*args)
+
+    def snapshot(self) -> AVLTree:
+        """Returns a copy of the tree as it is now, unaffected by later writes.
+
+        O(1) with snapshot_reads, else O(n) under the read lock.
+
+        :return: PersistentAVLTree with snapshot_reads, else, AVLTree.
+        """
+        if self.snapshot_reads:
+            return self._version.snapshot()
+        with self._lock.read_locked():
+            return AVLTree.from_sorted(self._tree)
+
+    def __len__(self) -> int:
+        return self._read('__len__')
+
+    def __iter__(self) -> Iterator[Q]:
+        return self._scan('__iter__')
+
+    def __reversed__(self) -> Iterator[Q]:
+        return self._scan('__reversed__')
+
+    def __getitem__(self, index: int) -> Q:
+        return self._read('__getitem__', index)
+
+    def irange(self, low: Q = None, high: Q = None, inclusive: tuple = (True, True),
+               reverse: bool = False) -> Iterator[Q]:
+        return self._scan('irange', low, high, inclusive, reverse)
+
+    def islice(self, start: int = None, stop: int = None, reverse: bool = False) -> Iterator[Q]:
+        return self._scan('islice', start, stop, reverse)
+
+    def search(self, data: Q, print_result: bool = False) -> bool:
+        return self._read('search', data, print_result)
+
+    def search_many(self, data: Iq) -> Any:
+        return self._read('search_many', data)
+
+    def rank_many(self, data: Iq) -> Any:
+        return self._read('rank_many', data)
+
+    def floor_many(self, data: Iq) -> Any:
+        return self._read('floor_many', data)
+
+    def height(self, print_result: bool = False) -> int:
+        return self._read('height', print_result)
+
+    def stats(self) -> dict:
+        return self._read('stats')
+
+    def floor(self, data: Q) -> Q:
+        return self._read('floor', data)
+
+    def lower(self, data: Q) -> Q:
+        return self._read('lower', data)
+
+    def ceiling(self, data: Q) -> Q:
+        return self._read('ceiling', data)
+
+    def higher(self, data: Q) -> Q:
+        return self._read('higher', data)
+
+    def min(self) -> Q:
+        return self._read('min')
+
+    def max(self) -> Q:
+        return self._read('max')
+
+    def rank(self, data: Q) -> int:
+        return self._read('rank', data)
+
+    def select(self, index: int) -> Q:
+        return self._read('select', index)
+
+    def count_range(self, low: Q, high: Q) -> int:
+        return self._read('count_range', low, high)
+
+    def insert(self, data: Q or Iq) -> None:
+        self._write('insert', data)
+
+    def delete(self, data: Q) -> None:
+        self._write('delete', data)
+
+    def insert_many(self, data: Iq) -> int:
+        return self._write('insert_many', data)
+
+    def delete_many(self, data: Iq) -> int:
+        return self._write('delete_many', data)
+
+    def pop_min(self) -> Q:
+        return self._write('pop_min')
+
+    def pop_max(self) -> Q:
+        return self._write('pop_max')
+
+    def clear_tree(self) -> None:
+        self._write('clear_tree')
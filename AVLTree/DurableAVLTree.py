@@ -0,0 +1,339 @@
+from struct import Struct
+from typing import Any, Iterable, Iterator
+from AVLTree.AVLTree import AVLTree, Q, Iq
+import os
+import zlib
+"""AVLTree surviving restarts, by way of a write-ahead log and periodic snapshots.
+
+"""
+
+# Log record header: payload length, crc32 of op and payload, op. b'+' inserts, b'-' deletes, b'0' clears.
+RECORD = Struct('<IIc')
+DOUBLE = Struct('<d')
+
+
+def _encode(data: Q) -> bytes:
+    """Encodes data for the log: a kind byte, then the data. Ints are written as decimal text, so any size fits.
+
+    :param data: int, float or str.
+    :return: Payload.
+    """
+    if isinstance(data, str):
+        return b's' + data.encode('utf-8')
+    if isinstance(data, float):
+        return b'd' + DOUBLE.pack(data)
+    if isinstance(data, int):
+        return b'n' + str(int(data)).encode()
+    raise TypeError(f'Cannot log {type(data).__name__}. Data must be int, float or str.')
+
+
+def _decode(payload: bytes) -> Q:
+    """Decodes data encoded by _encode. Raises ValueError if payload was not encoded by _encode.
+
+    :param payload: Payload.
+    :return: int, float or str.
+    """
+    kind, body = payload[:1], payload[1:]
+    if kind == b's':
+        return body.decode('utf-8')
+    if kind == b'd':
+        if len(body) != DOUBLE.size:
+            raise ValueError('Float payload must be 8 bytes.')
+        return DOUBLE.unpack(body)[0]
+    return int(body)
+
+
+def _record(op: bytes, data: Q = None) -> bytes:
+    """Frames data as a record of the log or snapshot.
+
+    :param op: b'+', b'-' or b'0'.
+    :param data: int, float or str. None for b'0'.
+    :return: Record.
+    """
+    payload = b'' if data is None else _encode(data)
+    return RECORD.pack(len(payload), zlib.crc32(op + payload), op) + payload
+
+
+def _read_records(path: str) -> tuple:
+    """Reads the records of a file written with _record, up to the first one cut short or failing its crc.
+
+    :param path: Log or snapshot file.
+    :return: (list of (op, payload) pairs, offset just past the last good record, size of file)
+    """
+    with open(path, 'rb') as file:
+        buffer = file.read()
+    records = []
+    offset = 0
+    while offset + RECORD.size <= len(buffer):
+        length, crc, op = RECORD.unpack_from(buffer, offset)
+        end = offset + RECORD.size + length
+        payload = buffer[offset + RECORD.size:end]
+        if end > len(buffer) or zlib.crc32(op + payload) != crc:
+            break
+        records.append((op, payload))
+        offset = end
+    return records, offset, len(buffer)
+
+
+class DurableAVLTree(object):
+
+    """AVLTree whose changes are logged to disk, so it can be rebuilt after a restart.
+
+    Every insertion and deletion is encoded and applied to the tree in memory, then appended to a write-ahead log as
+    a record framed with its length and crc32. A write the tree or the log rejects, eg. data of another type, raises
+    before anything is logged, so the log only ever holds writes that succeeded. The log is fsynced once per
+    sync_every records rather than once per record, so one fsync commits a whole group of writes. After
+    snapshot_every records, the tree's data is written to a snapshot file in the log's encoding and the log starts
+    over.
+
+    Opening a directory loads the last snapshot, then replays the log. A record cut short or failing its crc, as
+    left by a crash mid write, ends the replay and is trimmed from the log.
+
+    Writes are durable once synced: a crash loses at most the writes since the last sync, fewer than sync_every.
+    Call sync to make every write so far durable. Data may be any mix of int, float and str the tree can compare,
+    ints of any size included.
+
+    """
+
+    def __init__(self, directory: str, sync_every: int = 64, snapshot_every: int = 100000,
+                 parent_pointers: bool = True) -> None:
+        """Tree is represented by an AVLTree in memory and its log and snapshot in directory.
+
+            with DurableAVLTree(directory) as tree:
+                tree.insert(data), tree.delete(data), tree.insert_many(data), tree.delete_many(data)
+                tree.sync()  # make every write so far durable
+                tree.search(data), tree.irange(low, high), ...
+
+        :param directory: Directory holding the log and snapshot, created if missing.
+        :param sync_every: Records written per fsync of the log. 1 syncs every write.
+        :param snapshot_every: Records logged before the tree is snapshotted and the log emptied.
+        :param parent_pointers: Passed to AVLTree.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.log_path = os.path.join(directory, 'wal.log')
+        self.snapshot_path = os.path.join(directory, 'snapshot.avl')
+        self.sync_every = sync_every
+        self.snapshot_every = snapshot_every
+        if os.path.exists(self.snapshot_path):
+            records = _read_records(self.snapshot_path)[0]
+            self.tree = AVLTree.from_sorted((_decode(payload) for _, payload in records),
+                                            parent_pointers=parent_pointers)
+        else:
+            self.tree = AVLTree(parent_pointers=parent_pointers)
+        self.logged = self._replay()
+        self._unsynced = 0
+        self._log = open(self.log_path, 'ab')
+
+    def __enter__(self) -> 'DurableAVLTree':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _replay(self) -> int:
+        """Applies the log's records to the tree, trimming a torn record off the end of the log.
+
+        Runs of records with the same op are applied as one batch. Replaying a record already in the snapshot is
+        harmless, as inserting and deleting are idempotent.
+
+        :return: Number of records replayed.
+        """
+        if not os.path.exists(self.log_path):
+            return 0
+        records, offset, end = _read_records(self.log_path)
+        run_op, run = None, []
+        for op, payload in records:
+            if op != run_op:
+                self._apply(run_op, run)
+                run_op, run = op, []
+            run.append(payload)
+        self._apply(run_op, run)
+        if offset < end:
+            with open(self.log_path, 'r+b') as file:
+                file.truncate(offset)
+        return len(records)
+
+    def _apply(self, op: bytes, payloads: list) -> None:
+        """Applies a run of logged records with the same op to the tree.
+
+        Raises ValueError if a record has an unknown op or a malformed payload, and the tree's TypeError if it holds
+        data the tree cannot compare, as writes are checked before they are logged and no good log holds either.
+
+        :param op: b'+', b'-' or b'0'. None for an empty run.
+        :param payloads: Encoded data of each record.
+        """
+        if op is None:
+            return
+        if op == b'0':
+            self.tree.clear_tree()
+            return
+        if op not in (b'+', b'-'):
+            raise ValueError(f'Unknown log op {op!r}.')
+        change = self.tree.insert_many if op == b'+' else self.tree.delete_many
+        change([_decode(payload) for payload in payloads])
+
+    def _append(self, records: list) -> None:
+        """Writes records, made by _record for changes already applied to the tree, to the log.
+
+        :param records: Records.
+        """
+        self._log.write(b''.join(records))
+        self._unsynced += len(records)
+        self.logged += len(records)
+
+    def _commit(self) -> None:
+        """Syncs the log once a group of sync_every records is waiting, snapshots once snapshot_every are logged.
+
+        """
+        if self._unsynced >= self.sync_every:
+            self.sync()
+        if self.logged >= self.snapshot_every:
+            self.snapshot()
+
+    def sync(self) -> None:
+        """Makes every write so far durable with one fsync of the log.
+
+        """
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self._unsynced = 0
+
+    def snapshot(self) -> None:
+        """Writes the tree's data to the snapshot file and empties the log.
+
+        Data is written in order as b'+' records, encoded as in the log, so any data the log accepts can be
+        snapshotted. The snapshot is written to a temporary file and renamed over the last one, so a crash at any
+        point leaves either snapshot whole. The log is emptied only once the new snapshot is in place.
+
+        """
+        temporary = self.snapshot_path + '.tmp'
+        with open(temporary, 'wb') as file:
+            file.write(b''.join(_record(b'+', x) for x in self.tree))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.snapshot_path)
+        if hasattr(os, 'O_DIRECTORY'):
+            directory = os.open(self.directory, os.O_DIRECTORY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+        self._log.close()
+        self._log = open(self.log_path, 'wb')
+        self.logged = 0
+        self._unsynced = 0
+
+    def close(self) -> None:
+        """Syncs and closes the log. The tree cannot be changed afterwards.
+
+        """
+        self.sync()
+        self._log.close()
+
+    def insert(self, data: Q or Iq) -> None:
+        """Inserts and logs data, as AVLTree.insert does.
+
+        :param data: int, float, str or Iterable[int, float, str].
+        """
+        batch = list(data) if isinstance(data, Iterable) else [data]
+        records = [_record(b'+', x) for x in batch]
+        self.tree.insert_many(batch)
+        self._append(records)
+        self._commit()
+
+    def delete(self, data: Q) -> None:
+        """Deletes and logs data. Alerts user if data is not in tree, logging nothing.
+
+        :param data: Data to delete from tree.
+        """
+        if not self.tree.search(data):
+            print(f'{data} not in tree, Cannot delete.')
+            return
+        records = [_record(b'-', data)]
+        self.tree.delete(data)
+        self._append(records)
+        self._commit()
+
+    def insert_many(self, data: Iq) -> int:
+        """Inserts and logs a batch of data, as AVLTree.insert_many does.
+
+        :param data: Iterable[int, float, str].
+        :return: Number of items inserted.
+        """
+        batch = list(data)
+        records = [_record(b'+', x) for x in batch]
+        inserted = self.tree.insert_many(batch)
+        self._append(records)
+        self._commit()
+        return inserted
+
+    def delete_many(self, data: Iq) -> int:
+        """Deletes and logs a batch of data, as AVLTree.delete_many does.
+
+        :param data: Iterable[int, float, str].
+        :return: Number of items deleted.
+        """
+        batch = list(data)
+        records = [_record(b'-', x) for x in batch]
+        deleted = self.tree.delete_many(batch)
+        self._append(records)
+        self._commit()
+        return deleted
+
+    def clear_tree(self) -> None:
+        """Clears tree of all data and logs it.
+
+        """
+        self.tree.clear_tree()
+        self._append([_record(b'0')])
+        self._commit()
+
+    def __len__(self) -> int:
+        return len(self.tree)
+
+    def __iter__(self) -> Iterator[Q]:
+        return iter(self.tree)
+
+    def __reversed__(self) -> Iterator[Q]:
+        return reversed(self.tree)
+
+    def __getitem__(self, index: int) -> Q:
+        return self.tree[index]
+
+    def search(self, data: Q, print_result: bool = False) -> bool:
+        return self.tree.search(data, print_result)
+
+    def height(self, print_result: bool = False) -> int:
+        return self.tree.height(print_result)
+
+    def stats(self) -> dict:
+        return self.tree.stats()
+
+    def search_many(self, data: Iq) -> Any:
+        return self.tree.search_many(data)
+
+    def irange(self, low: Q = None, high: Q = None, inclusive: tuple = (True, True),
+               reverse: bool = False) -> Iterator[Q]:
+        return self.tree.irange(low, high, inclusive, reverse)
+
+    def floor(self, data: Q) -> Q:
+        return self.tree.floor(data)
+
+    def ceiling(self, data: Q) -> Q:
+        return self.tree.ceiling(data)
+
+    def min(self) -> Q:
+        return self.tree.min()
+
+    def max(self) -> Q:
+        return self.tree.max()
+
+    def rank(self, data: Q) -> int:
+        return self.tree.rank(data)
+
+    def rank_many(self, data: Iq) -> Any:
+        return self.tree.rank_many(data)
+
+    def floor_many(self, data: Iq) -> Any:
+        return self.tree.floor_many(data)
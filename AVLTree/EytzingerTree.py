@@ -0,0 +1,407 @@
+from array import array
+from struct import Struct
+from typing import Any, Iterable, Iterator, Sequence
+import os
+import sys
+try:
+    import numpy as np
+except ImportError:
+    np = None
+"""Read only search tree laid out in Eytzinger order, and the binary file format storing it.
+
+The tree is implicit. Keys sit in breadth first order in a 1-based sequence, the children of key k being keys 2k and
+2k + 1. Searches need no pointers, and the top levels of every search share the first few cache lines.
+
+File format, in native byte order:
+    header: b'AVLT', format version, key kind, byte order, pad byte, key count n as 8 byte unsigned int
+    kind b'q' or b'd': n + 1 int64 or float64 slots, slot 0 unused, slot k holding key k
+    kind b's': n + 2 int64 offsets, then the utf-8 encoded keys back to back. Key k is blob[offsets[k]:offsets[k + 1]].
+
+"""
+
+HEADER = Struct('<4sBccxQ')
+MAGIC = b'AVLT'
+VERSION = 1
+BYTE_ORDER = b'<' if sys.byteorder == 'little' else b'>'
+
+
+def in_order(size: int) -> Iterator[int]:
+    """Yields the 1-based Eytzinger indices of a tree of size keys, in sorted key order.
+
+    :param size: Number of keys.
+    :return: Iterator over indices.
+    """
+    stack = []
+    index = 1
+    while stack or index <= size:
+        while index <= size:
+            stack.append(index)
+            index *= 2
+        index = stack.pop()
+        yield index
+        index = 2 * index + 1
+
+
+def layout(keys: Sequence) -> list:
+    """Arranges sorted keys in Eytzinger order.
+
+    :param keys: Distinct keys in ascending order.
+    :return: List of len(keys) + 1 keys, slot 0 holding None.
+    """
+    slots = [None] * (len(keys) + 1)
+    for key, index in zip(keys, in_order(len(keys))):
+        slots[index] = key
+    return slots
+
+
+def key_kind(keys: Sequence) -> bytes:
+    """Finds the storage kind of keys: b'q' for int, b'd' for float or b's' for str.
+
+    :param keys: Keys, all of one type.
+    :return: Kind.
+    """
+    kinds = {bool: b'q', int: b'q', float: b'd', str: b's'}
+    found = {kinds.get(type(key)) for key in keys}
+    if None in found or len(found) > 1:
+        raise TypeError('Keys must be all int, all float or all str to be stored in binary.')
+    return found.pop() if found else b'q'
+
+
+def dump_keys(path: str, keys: Sequence) -> None:
+    """Writes sorted keys to path in Eytzinger order.
+
+    The file is encoded in full before anything is written, then written to a temporary file renamed over path, so
+    keys that cannot be stored, eg. ints of 64 bits or more, raise with any earlier file at path left whole.
+
+    :param path: File to write.
+    :param keys: int, float or str keys in ascending order, repeats allowed.
+    """
+    kind = key_kind(keys)
+    slots = layout(keys)
+    if kind != b's':
+        slots[0] = 0
+        parts = [array(kind.decode(), slots).tobytes()]
+    else:
+        encoded = [key.encode('utf-8') for key in slots[1:]]
+        offsets = array('q', [0, 0])
+        for key in encoded:
+            offsets.append(offsets[-1] + len(key))
+        parts = [offsets.tobytes(), b''.join(encoded)]
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, kind, BYTE_ORDER, len(keys)))
+        for part in parts:
+            file.write(part)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+def read_keys(buffer: Any) -> tuple:
+    """Reads the keys of a dumped tree from a buffer without copying them.
+
+    :param buffer: bytes, mmap or other object supporting the buffer protocol, holding a dumped tree.
+    :return: (number of keys, 1-based sequence of keys in Eytzinger order)
+    """
+    if len(buffer) < HEADER.size:
+        raise ValueError('Not an AVLTree dump.')
+    magic, version, kind, order, size = HEADER.unpack(buffer[:HEADER.size])
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('Not an AVLTree dump, or one of an unknown version.')
+    if order != BYTE_ORDER:
+        raise ValueError('AVLTree dump was written on a machine of the other byte order.')
+    start = HEADER.size
+    end = start + 8 * (size + (1 if kind != b's' else 2))
+    if len(buffer) < end:
+        raise ValueError('AVLTree dump is truncated.')
+    if kind != b's':
+        return size, memoryview(buffer)[start:end].cast(kind.decode())
+    keys = _Strings(memoryview(buffer)[start:end].cast('q'), memoryview(buffer)[end:])
+    if len(keys.blob) < keys.offsets[size + 1]:
+        keys.release()
+        raise ValueError('AVLTree dump is truncated.')
+    return size, keys
+
+
+def load_keys(path: str) -> list:
+    """Reads a dumped tree's keys into a list.
+
+    :param path: File written by dump_keys.
+    :return: Keys in ascending order.
+    """
+    with open(path, 'rb') as file:
+        size, keys = read_keys(file.read())
+    return [keys[index] for index in in_order(size)]
+
+
+class _Strings(object):
+
+    """1-based sequence of str keys decoded on access from an offsets column and a blob.
+
+    """
+
+    def __init__(self, offsets: memoryview, blob: memoryview) -> None:
+        self.offsets = offsets
+        self.blob = blob
+
+    def __getitem__(self, index: int) -> str:
+        return str(self.blob[self.offsets[index]:self.offsets[index + 1]], 'utf-8')
+
+    def release(self) -> None:
+        self.offsets.release()
+        self.blob.release()
+
+
+class EytzingerTree(object):
+
+    """Read only search tree over keys in Eytzinger order.
+
+    Subclasses set size and keys, a 1-based sequence. Same read interface as AVLTree, every query walking down from
+    index 1 with plain arithmetic in place of child pointers.
+
+    """
+
+    def __init__(self, size: int, keys: Sequence) -> None:
+        """Tree is represented by its keys in Eytzinger order.
+
+        :param size: Number of keys.
+        :param keys: 1-based sequence of keys in Eytzinger order.
+        """
+        self.size = size
+        self.keys = keys
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, data: Any) -> bool:
+        return self.search(data)
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.irange()
+
+    def __reversed__(self) -> Iterator[Any]:
+        return self.irange(reverse=True)
+
+    def height(self, print_result: bool = False) -> int:
+        """Finds height of tree in O(1). Keys fill every level but the last.
+
+        :param print_result: Prints height to stdout if True.
+        :return: Height of tree.
+        """
+        height = self.size.bit_length()
+        if print_result:
+            print(height)
+        return height
+
+    def search(self, data: Any, print_result: bool = False) -> bool:
+        """Searches tree for data.
+
+        :param data: Data to be found in tree.
+        :param print_result: Set to True to print search results.
+        :return: bool. True if data in tree, else, False.
+        """
+        keys, size = self.keys, self.size
+        index = 1
+        result = False
+        while index <= size:
+            key = keys[index]
+            if data < key:
+                index = 2 * index
+            elif data > key:
+                index = 2 * index + 1
+            else:
+                result = True
+                break
+
+        if print_result:
+            if result:
+                print(f'{data} found.')
+            else:
+                print(f'{data} not found.')
+
+        return result
+
+    def search_many(self, data: Iterable) -> Any:
+        """Searches tree for each item of data.
+
+        With NumPy and int or float keys, every probe walks down the tree at once, one vectorized step per level,
+        without branching: each step moves to child 2k or 2k + 1 by comparison alone. The answer is then read off the
+        final index as in _ceiling_index.
+
+        :param data: List or NumPy array of data to be found in tree.
+        :return: NumPy bool array with NumPy and int or float keys, else, list of bool. True where data in tree.
+        """
+        keys = self._array()
+        if keys is None:
+            return [self.search(x) for x in data]
+        probes = np.asarray(data)
+        index = np.ones(probes.shape, dtype=np.int64)
+        for _ in range(self.height()):
+            index = np.where(index <= self.size, 2 * index + (keys[np.minimum(index, self.size)] < probes), index)
+        index >>= np.log2(~index & (index + 1)).astype(np.int64) + 1
+        return (index != 0) & (keys[index] == probes)
+
+    def _array(self) -> Any:
+        """Views keys as a NumPy array without copying them.
+
+        :return: NumPy array, None without NumPy or if keys are not stored in a buffer of int or float.
+        """
+        if np is None:
+            return None
+        try:
+            return np.asarray(memoryview(self.keys))
+        except TypeError:
+            return None
+
+    def _ceiling_index(self, data: Any, inclusive: bool) -> int:
+        """Finds index of smallest key above data, or equal to it if inclusive.
+
+        Walks down to a leaf without stopping at equal keys, then climbs back past the right turns taken at the
+        bottom: the lowest trailing zero bit of the final index marks the last left turn, whose key is the answer.
+
+        :param data: Data to compare to.
+        :param inclusive: Key equal to data qualifies if True.
+        :return: Index, 0 if there is none.
+        """
+        keys, size = self.keys, self.size
+        index = 1
+        if inclusive:
+            while index <= size:
+                index = 2 * index + (keys[index] < data)
+        else:
+            while index <= size:
+                index = 2 * index + (keys[index] <= data)
+        return index >> (~index & (index + 1)).bit_length()
+
+    def _floor_index(self, data: Any, inclusive: bool) -> int:
+        """Finds index of largest key below data, or equal to it if inclusive.
+
+        :param data: Data to compare to.
+        :param inclusive: Key equal to data qualifies if True.
+        :return: Index, 0 if there is none.
+        """
+        index = self._ceiling_index(data, not inclusive)
+        if not index:
+            return self._edge_index(True)
+        return self._predecessor(index)
+
+    def _edge_index(self, rightmost: bool) -> int:
+        """Finds index of the smallest or largest key.
+
+        :param rightmost: Finds largest if True, else smallest.
+        :return: Index, 0 if tree is empty.
+        """
+        if not self.size:
+            return 0
+        index = 1
+        while 2 * index + rightmost <= self.size:
+            index = 2 * index + rightmost
+        return index
+
+    def _successor(self, index: int) -> int:
+        """Finds index of the next key in sorted order.
+
+        :param index: Index of a key.
+        :return: Index, 0 after the largest key.
+        """
+        if 2 * index + 1 <= self.size:
+            index = 2 * index + 1
+            while 2 * index <= self.size:
+                index *= 2
+            return index
+        while index & 1:
+            index >>= 1
+        return index >> 1
+
+    def _predecessor(self, index: int) -> int:
+        """Finds index of the previous key in sorted order.
+
+        :param index: Index of a key.
+        :return: Index, 0 before the smallest key.
+        """
+        if 2 * index <= self.size:
+            index *= 2
+            while 2 * index + 1 <= self.size:
+                index = 2 * index + 1
+            return index
+        while not index & 1:
+            index >>= 1
+        return index >> 1
+
+    def floor(self, data: Any) -> Any:
+        """Finds largest item less than or equal to data.
+
+        :param data: Data to compare to, need not be in tree.
+        :return: Largest item <= data, None if there is none.
+        """
+        index = self._floor_index(data, True)
+        return self.keys[index] if index else None
+
+    def lower(self, data: Any) -> Any:
+        """Finds largest item strictly less than data.
+
+        :param data: Data to compare to, need not be in tree.
+        :return: Largest item < data, None if there is none.
+        """
+        index = self._floor_index(data, False)
+        return self.keys[index] if index else None
+
+    def ceiling(self, data: Any) -> Any:
+        """Finds smallest item greater than or equal to data.
+
+        :param data: Data to compare to, need not be in tree.
+        :return: Smallest item >= data, None if there is none.
+        """
+        index = self._ceiling_index(data, True)
+        return self.keys[index] if index else None
+
+    def higher(self, data: Any) -> Any:
+        """Finds smallest item strictly greater than data.
+
+        :param data: Data to compare to, need not be in tree.
+        :return: Smallest item > data, None if there is none.
+        """
+        index = self._ceiling_index(data, False)
+        return self.keys[index] if index else None
+
+    def min(self) -> Any:
+        """Returns smallest item in tree.
+
+        :return: Smallest data.
+        """
+        if not self.size:
+            raise ValueError('Tree is empty.')
+        return self.keys[self._edge_index(False)]
+
+    def max(self) -> Any:
+        """Returns largest item in tree.
+
+        :return: Largest data.
+        """
+        if not self.size:
+            raise ValueError('Tree is empty.')
+        return self.keys[self._edge_index(True)]
+
+    def irange(self, low: Any = None, high: Any = None, inclusive: tuple = (True, True),
+               reverse: bool = False) -> Iterator[Any]:
+        """Yields data between low and high lazily. Parameters as in AVLTree.irange.
+
+        :return: Iterator over data in range.
+        """
+        keys = self.keys
+        if reverse:
+            index = self._edge_index(True) if high is None else self._floor_index(high, inclusive[1])
+            while index:
+                key = keys[index]
+                if low is not None and (key < low or (key == low and not inclusive[0])):
+                    return
+                yield key
+                index = self._predecessor(index)
+        else:
+            index = self._edge_index(False) if low is None else self._ceiling_index(low, inclusive[0])
+            while index:
+                key = keys[index]
+                if high is not None and (key > high or (key == high and not inclusive[1])):
+                    return
+                yield key
+                index = self._successor(index)
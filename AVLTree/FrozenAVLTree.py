@@ -0,0 +1,41 @@
+from array import array
+from typing import Sequence
+from AVLTree.EytzingerTree import EytzingerTree, key_kind, layout
+"""Immutable AVLTree laid out in a flat array for fast searching.
+
+"""
+
+
+class FrozenAVLTree(EytzingerTree):
+
+    """Read only copy of an AVLTree's data in Eytzinger order, as returned by AVLTree.freeze.
+
+    Int and float keys are packed into an array of 64 bit slots, a search reading one slot per level of the tree,
+    the top levels all sharing the first few cache lines. Other keys, and ints too big for 64 bits, are kept in a
+    list in the same order. search_many walks a whole batch of probes down the array together with NumPy, choosing
+    each child by arithmetic on the result of a comparison rather than by branching.
+
+    The tree never changes: build a new one with freeze after changing the AVLTree.
+
+    """
+
+    def __init__(self, data: Sequence) -> None:
+        """Tree is represented by its keys in Eytzinger order.
+
+            frozen = tree.freeze()
+            frozen.search(data), frozen.search_many(data), frozen.floor(data), frozen.irange(low, high)
+
+        :param data: Data in ascending order, repeats allowed.
+        """
+        slots = layout(data)
+        try:
+            kind = key_kind(data).decode()
+        except TypeError:
+            kind = None
+        if kind in ('q', 'd'):
+            slots[0] = 0
+            try:
+                slots = array(kind, slots)
+            except OverflowError:
+                slots[0] = None
+        super().__init__(len(data), slots)
@@ -0,0 +1,267 @@
+from typing import Any, Callable, Iterable, Iterator
+from AVLTree.AVLTree import AVLTree, Q
+from AVLTree.AVLTreeMap import LeanMapNode, MapNode
+"""AVLTree of any elements, kept in order of a key function.
+
+"""
+
+
+def _identity(element: Any) -> Any:
+    return element
+
+
+class KeyedAVLTree(AVLTree):
+
+    """Elements kept in order of key(element), each key computed once, when its element is inserted.
+
+    Nodes are MapNodes: data holds the cached key, value the element. Descents compare cached keys only, so the
+    elements' own comparison methods are never called, and keys of built in types, eg. ints, strs or tuples of them,
+    are compared in C. Python has no three way comparison, so a descent still makes up to two per level, < and >.
+
+    An element whose key is already in tree is not inserted, as with repeated data in AVLTree.
+
+    Elements are given to insert, insert_many, delete, delete_many, search, search_many, join and in. Keys are given
+    to get, floor, lower, ceiling, higher, irange, rank, count_range, rank_many, floor_many and split. Every method
+    returning items returns elements, except freeze, which copies keys only. dump and load are not supported, as
+    elements may be of any type.
+
+    Order is ascending by key throughout: iterate with reversed(tree) or irange(reverse=True) for descending order.
+
+    """
+
+    def __init__(self, data: Iterable = None, key: Callable = None, parent_pointers: bool = True) -> None:
+        """Tree is represented by its root node, initially None, and its key function.
+
+            tree = KeyedAVLTree(records, key=lambda record: record.timestamp)
+            tree.insert(record), tree.delete(record), record in tree
+            tree.get(timestamp), tree.floor(timestamp), tree.irange(low_timestamp, high_timestamp)
+
+        :param data: Optional iterable of elements to insert.
+        :param key: Function of an element giving its key, the element itself if None. Keys must support <, =, >.
+        :param parent_pointers: Set to False to build the tree from LeanMapNodes.
+        """
+        super().__init__(parent_pointers=parent_pointers)
+        self.node_type = MapNode if parent_pointers else LeanMapNode
+        self.key = key if key is not None else _identity
+        if data is not None:
+            self.insert_many(data)
+
+    def __contains__(self, element: Any) -> bool:
+        return self._find_node(self.root, self.key(element)) is not None
+
+    @classmethod
+    def from_sorted(cls, data: Iterable, key: Callable = None, parent_pointers: bool = True) -> 'KeyedAVLTree':
+        """Creates a perfectly balanced tree from elements in ascending order of key in O(n).
+
+        Elements with a key repeated are dropped.
+
+        :param data: Iterable of elements in ascending order of key.
+        :param key: As in KeyedAVLTree.
+        :param parent_pointers: As in KeyedAVLTree.
+        :return: New tree holding elements.
+        """
+        tree = cls(key=key, parent_pointers=parent_pointers)
+        nodes = []
+        for element in data:
+            data_key = tree.key(element)
+            if nodes and not data_key > nodes[-1].data:
+                if data_key == nodes[-1].data:
+                    continue
+                raise ValueError(f'{data_key} out of order. Data must be in ascending order of key.')
+            nodes.append(tree.node_type(data_key, element))
+        tree._build(nodes)
+        return tree
+
+    @classmethod
+    def from_iterable(cls, data: Iterable, key: Callable = None, parent_pointers: bool = True) -> 'KeyedAVLTree':
+        """Creates a perfectly balanced tree from elements in any order.
+
+        Of elements with a key repeated, the first is kept.
+
+        :param data: Iterable of elements.
+        :param key: As in KeyedAVLTree.
+        :param parent_pointers: As in KeyedAVLTree.
+        :return: New tree holding elements.
+        """
+        tree = cls(key=key, parent_pointers=parent_pointers)
+        decorated = tree._decorate(data)
+        tree._build([tree.node_type(data_key, decorated[data_key]) for data_key in sorted(decorated)])
+        return tree
+
+    def dump(self, path: str) -> None:
+        """Raises TypeError: the file format holds ints, floats and strs, not elements of any type.
+
+        :param path: File that would be written.
+        """
+        raise TypeError('KeyedAVLTree cannot be dumped, its elements may be of any type.')
+
+    @classmethod
+    def load(cls, path: str, parent_pointers: bool = True) -> 'KeyedAVLTree':
+        """Raises TypeError, as dump does.
+
+        :param path: File that would be read.
+        :param parent_pointers: As in KeyedAVLTree.
+        """
+        raise TypeError('KeyedAVLTree cannot be loaded, its elements may be of any type.')
+
+    def _decorate(self, data: Iterable) -> dict:
+        """Computes the key of each element, keeping the first element of each key.
+
+        :param data: Iterable of elements.
+        :return: Dict of key to element.
+        """
+        decorated = {}
+        for element in data:
+            decorated.setdefault(self.key(element), element)
+        return decorated
+
+    def _check_operand(self, other: 'KeyedAVLTree') -> None:
+        """Ensures other's nodes may be linked into tree, including that both trees use the same key function.
+
+        :param other: Second operand of a join or set operation.
+        """
+        super()._check_operand(other)
+        if other.key is not self.key:
+            raise ValueError('Cannot combine trees with different key functions.')
+
+    def _adopt(self, root: MapNode) -> 'KeyedAVLTree':
+        """Wraps a detached sub-tree in a new tree with the same key function.
+
+        :param root: Root of sub-tree, or None.
+        :return: New tree.
+        """
+        tree = super()._adopt(root)
+        tree.key = self.key
+        return tree
+
+    def insert(self, element: Any) -> None:
+        """Inserts element. Unlike AVLTree.insert, an iterable is one element, see insert_many for batches.
+
+        :param element: Element to insert.
+        """
+        self._insert(self.root, self.key(element), element)
+
+    def insert_many(self, data: Iterable) -> int:
+        """Inserts a batch of elements, as AVLTree.insert_many does.
+
+        :param data: Iterable of elements.
+        :return: Number of elements inserted, ie. whose key was not already in tree.
+        """
+        decorated = self._decorate(data)
+        return self._insert_batch(sorted(decorated), decorated)
+
+    def delete(self, element: Any) -> None:
+        """Deletes the element with element's key. Alerts user if there is none.
+
+        :param element: Element to delete.
+        """
+        super().delete(self.key(element))
+
+    def delete_many(self, data: Iterable) -> int:
+        """Deletes a batch of elements, as AVLTree.delete_many does.
+
+        :param data: Iterable of elements.
+        :return: Number of elements deleted.
+        """
+        return super().delete_many(self.key(element) for element in data)
+
+    def search(self, element: Any, print_result: bool = False) -> bool:
+        """Searches tree for an element with element's key.
+
+        :param element: Element to be found in tree.
+        :param print_result: Set to True to print search results.
+        :return: bool. True if element's key in tree, else, False.
+        """
+        return super().search(self.key(element), print_result)
+
+    def search_many(self, data: Iterable) -> list:
+        """Searches tree for each element of data, as AVLTree.search_many does.
+
+        :param data: Iterable of elements.
+        :return: List of bool, True where element's key in tree.
+        """
+        return super().search_many([self.key(element) for element in data])
+
+    def join(self, element: Any, other: 'KeyedAVLTree') -> 'KeyedAVLTree':
+        """Joins tree, element and other into one tree in O(log n), as AVLTree.join does.
+
+        :param element: Element with a key between the two trees' keys.
+        :param other: Tree with the same key function.
+        :return: New tree holding the elements of both trees and element.
+        """
+        return super().join(self.key(element), other, element)
+
+    def get(self, key: Q, default: Any = None) -> Any:
+        """Finds the element with key.
+
+        :param key: Key of element.
+        :param default: Returned if no element has key.
+        :return: Element.
+        """
+        cur_node = self._find_node(self.root, key)
+        return cur_node.value if cur_node else default
+
+    def irange(self, low: Q = None, high: Q = None, inclusive: tuple = (True, True),
+               reverse: bool = False) -> Iterator[Any]:
+        """Yields elements with keys between low and high lazily. Parameters as in AVLTree.irange.
+
+        :return: Iterator over elements in range.
+        """
+        for cur_node in self._irange_nodes(low, high, inclusive, reverse):
+            yield cur_node.value
+
+    def islice(self, start: int = None, stop: int = None, reverse: bool = False) -> Iterator[Any]:
+        """Yields elements at indices start to stop in ascending order of key lazily. Parameters as in AVLTree.islice.
+
+        :return: Iterator over elements in slice.
+        """
+        for cur_node in self._islice_nodes(start, stop, reverse):
+            yield cur_node.value
+
+    def select(self, index: int) -> Any:
+        """Finds element at index in ascending order of key in O(log n).
+
+        :param index: int. 0 for the element with the smallest key.
+        :return: Element at index.
+        """
+        return self._select_node(index).value
+
+    def min(self) -> Any:
+        """Returns element with the smallest key in O(1).
+
+        :return: Element.
+        """
+        if not self.min_node:
+            raise ValueError('Tree is empty.')
+        return self.min_node.value
+
+    def max(self) -> Any:
+        """Returns element with the largest key in O(1).
+
+        :return: Element.
+        """
+        if not self.max_node:
+            raise ValueError('Tree is empty.')
+        return self.max_node.value
+
+    def pop_min(self) -> Any:
+        return self._pop_edge(False).value
+
+    def pop_max(self) -> Any:
+        return self._pop_edge(True).value
+
+    def floor(self, key: Q) -> Any:
+        cur_node = self._floor_node(key, True)
+        return cur_node.value if cur_node else None
+
+    def lower(self, key: Q) -> Any:
+        cur_node = self._floor_node(key, False)
+        return cur_node.value if cur_node else None
+
+    def ceiling(self, key: Q) -> Any:
+        cur_node = self._ceiling_node(key, True)
+        return cur_node.value if cur_node else None
+
+    def higher(self, key: Q) -> Any:
+        cur_node = self._ceiling_node(key, False)
+        return cur_node.value if cur_node else None
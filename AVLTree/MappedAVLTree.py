@@ -0,0 +1,47 @@
+import mmap
+from AVLTree.EytzingerTree import EytzingerTree, read_keys
+"""Read only AVLTree searched in place in a memory mapped file.
+
+"""
+
+
+class MappedAVLTree(EytzingerTree):
+
+    """Tree written by AVLTree.dump, searched straight from the file mapped into memory.
+
+    Opening takes O(1) whatever the size of the file: no Node is built and no data is read until a query touches it.
+    Pages of the file are loaded by the operating system on first use and shared by every process mapping it.
+
+    """
+
+    def __init__(self, path: str) -> None:
+        """Tree is represented by the mapped file.
+
+            tree = AVLTree.from_iterable(data)
+            tree.dump(path)
+            with MappedAVLTree(path) as mapped:
+                mapped.search(data), mapped.floor(data), mapped.irange(low, high)
+
+        :param path: File written by AVLTree.dump.
+        """
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            size, keys = read_keys(self._map)
+        except ValueError:
+            self._map.close()
+            raise
+        super().__init__(size, keys)
+
+    def __enter__(self) -> 'MappedAVLTree':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmaps the file. The tree cannot be used afterwards.
+
+        """
+        self.keys.release()
+        self._map.close()
@@ -0,0 +1,246 @@
+from collections import Counter
+from typing import Any
+from AVLTree.AVLTree import AVLTree, LeanNode, Q
+"""Persistent AVLTree.
+
+Insertion and deletion copy the nodes on the path from the root instead of changing them, so every earlier version
+of the tree stays intact and readable.
+
+"""
+
+
+class PersistentNode(LeanNode):
+
+    """LeanNode that is never changed once it is part of a tree, so any number of versions may share it.
+
+    Insert and delete copy the O(log n) nodes on the path walked down from the root, along with the nodes a rotation
+    moves, and return the root of the new version.
+
+    """
+
+    __slots__ = ()
+
+    def _copy(self, cur_node: 'PersistentNode') -> 'PersistentNode':
+        """Makes an unshared copy of cur_node, with the same children.
+
+        :param cur_node: Node to be copied.
+        :return: New node.
+        """
+        copy = self.__class__(cur_node.data)
+        copy.left = cur_node.left
+        copy.right = cur_node.right
+        copy.tallness = cur_node.tallness
+        copy.size = cur_node.size
+        return copy
+
+    def insert(self, cur_node: 'PersistentNode', data: Q, repeated_data: list, *fields: Any,
+               counts: Counter = None) -> 'PersistentNode':
+        """Inserts data into a new version of the tree.
+
+        :param cur_node: Root of tree.
+        :param data: int, float, str.
+        :param repeated_data: Empty list. The node holding data is added to it if data is already in the tree.
+        :param fields: Further arguments for the new node.
+        :param counts: Optional Counter of the tree's rotations and path length.
+        :return: Root of the new version, or cur_node if data is already in the tree.
+        """
+        root = cur_node
+        path = []
+        while cur_node:
+            if data < cur_node.data:
+                path.append((cur_node, True))
+                cur_node = cur_node.left
+            elif data > cur_node.data:
+                path.append((cur_node, False))
+                cur_node = cur_node.right
+            else:
+                repeated_data.append(cur_node)
+                return root
+        if counts is not None:
+            counts['insertions'] += 1
+            counts['path_length'] += len(path)
+            counts['retraced'] += len(path)
+        return self._copy_path(path, self.__class__(data, *fields), counts=counts)
+
+    def delete(self, node: 'PersistentNode', nodes: list = None, counts: Counter = None) -> 'PersistentNode':
+        """Deletes node from a new version of the tree.
+
+        A node with two children is copied with its successor's data, and the successor is left out instead.
+
+        :param node: Node to be deleted.
+        :param nodes: Path of nodes from the root down to the parent of node. Required, as nodes have no parent.
+        :param counts: Optional Counter of the tree's rotations and path length.
+        :return: Root of the new version, None if it is empty.
+        """
+        path = [(cur_node, node.data < cur_node.data) for cur_node in nodes]
+        target = source = None
+        if node.left and node.right:
+            path.append((node, False))
+            successor = node.right
+            while successor.left:
+                path.append((successor, True))
+                successor = successor.left
+            target, source = node, successor
+            node = successor
+        child = node.left or node.right
+        if counts is not None:
+            counts['deletions'] += 1
+            counts['path_length'] -= len(path) + self._get_size(child)
+            counts['retraced'] += len(path)
+        return self._copy_path(path, child, target, source, counts)
+
+    def _copy_path(self, path: list, child: 'PersistentNode', target: 'PersistentNode' = None,
+                   source: 'PersistentNode' = None, counts: Counter = None) -> 'PersistentNode':
+        """Copies the nodes on path bottom up, hanging child from the lowest copy, rebalancing each copy on the way.
+
+        Every copy is retraced, as all of them are new, so there is no early stop.
+
+        :param path: (node, True if the path goes left from node) pairs from the root down.
+        :param child: New sub-tree replacing the one below the last node of path, or None.
+        :param target: Optional node on path whose copy takes the data of source.
+        :param source: Node providing data for target's copy.
+        :param counts: Optional Counter of the tree's rotations and path length.
+        :return: Root of the new version.
+        """
+        while path:
+            cur_node, went_left = path.pop()
+            copy = self._copy(cur_node)
+            if went_left:
+                copy.left = child
+            else:
+                copy.right = child
+            if cur_node is target:
+                self._replace_data(copy, source)
+            child = self._rebalance(copy, counts)
+        return child
+
+    def _rebalance(self, cur_node: 'PersistentNode', counts: Counter = None) -> 'PersistentNode':
+        """Rebalances a copied node, first copying the child and grandchild a rotation would change.
+
+        :param cur_node: Unshared node to be balanced.
+        :param counts: Optional Counter of the tree's rotations and path length.
+        :return: Root of the sub-tree.
+        """
+        if abs(self._get_height(cur_node.left) - self._get_height(cur_node.right)) > 1:
+            y = self.taller_child(cur_node)
+            y_copy = self._copy(y)
+            self._replace_child(cur_node, y, y_copy)
+            x = self.taller_child(y_copy, prefer_left=y_copy is cur_node.left)
+            x_copy = self._copy(x)
+            self._replace_child(y_copy, x, x_copy)
+            return self._rebalance_node(cur_node, y_copy, x_copy, counts)
+        return super()._rebalance(cur_node)
+
+
+class PersistentAVLTree(AVLTree):
+
+    """AVLTree whose nodes are never changed in place, with O(1) snapshots.
+
+    Each insertion or deletion builds a new version sharing all but O(log n) nodes with the last, and moves the tree
+    to it. A snapshot keeps hold of the current version, so it reads the same data however the tree changes later.
+
+    min_node and max_node hold the smallest and largest data, though possibly in a node of an earlier version.
+
+    """
+
+    def __init__(self, parent_pointers: bool = False) -> None:
+        """Tree is represented by its root node, initially None.
+
+        Same interface as AVLTree, plus:
+            view = tree.snapshot()  # O(1), unaffected by later changes to tree
+
+        :param parent_pointers: Ignored, nodes shared between versions cannot point to a single parent. Accepted for
+            AVLTree's constructors.
+        """
+        super().__init__(parent_pointers=False)
+        self.node_type = PersistentNode
+
+    def snapshot(self) -> 'PersistentAVLTree':
+        """Returns the current version as a tree of its own in O(1).
+
+        Changes to either tree afterwards do not affect the other.
+
+        :return: New tree sharing this tree's nodes.
+        """
+        tree = type(self)()
+        tree.root = self.root
+        tree.size = self.size
+        tree.min_node = self.min_node
+        tree.max_node = self.max_node
+        tree.counts = self.counts.copy()
+        tree.depths_known = self.depths_known
+        return tree
+
+    def _extend_extremes(self, data: Q) -> None:
+        """Moves min_node or max_node to a newly inserted node if data is beyond them.
+
+        :param data: Data just inserted into a tree that was not empty.
+        """
+        if data < self.min_node.data:
+            self.min_node = self._edge_node(self.root, False)
+        elif data > self.max_node.data:
+            self.max_node = self._edge_node(self.root, True)
+
+    def _delete(self, node: 'PersistentNode', nodes: list = None) -> None:
+        """Moves the tree to a version without node's data.
+
+        :param node: Node to be deleted.
+        :param nodes: Path of nodes from the root down to the parent of node.
+        """
+        data = node.data
+        self.root = node.delete(node, nodes, self.counts)
+        if not self.root:
+            self.clear_tree()
+            return
+
+        if data == self.min_node.data:
+            self.min_node = self._edge_node(self.root, False)
+        if data == self.max_node.data:
+            self.max_node = self._edge_node(self.root, True)
+
+    def _build(self, nodes: list) -> None:
+        """Builds a perfectly balanced tree from copies of nodes, which other versions may share.
+
+        :param nodes: Nodes of distinct data in ascending order.
+        """
+        super()._build([cur_node._copy(cur_node) for cur_node in nodes])
+
+    def _unshare(self) -> None:
+        """Rebuilds the tree from copies of its nodes, so algorithms relinking nodes in place may use them.
+
+        """
+        self._build(list(self._in_order_nodes()))
+
+    def split(self, data: Q) -> tuple:
+        """Splits tree around data as AVLTree.split does. Nodes are copied first, so this takes O(n).
+
+        :param data: Data to split around, need not be in tree.
+        :return: (tree of items < data, True if data was in tree, tree of items > data)
+        """
+        self._unshare()
+        return super().split(data)
+
+    def join(self, data: Q, other: 'AVLTree', *fields: Any) -> 'AVLTree':
+        """Joins tree, data and other as AVLTree.join does. Nodes are copied first, so this takes O(n + m).
+
+        :param data: Data between the two trees.
+        :param other: PersistentAVLTree.
+        :param fields: Further fields of data's node.
+        :return: New tree.
+        """
+        self._check_operand(other)
+        self._unshare()
+        other._unshare()
+        return super().join(data, other, *fields)
+
+    def _combine(self, other: 'AVLTree', operation: str) -> 'AVLTree':
+        """Runs a set operation as AVLTree does. Nodes are copied first, so this takes O(n + m).
+
+        :param other: PersistentAVLTree.
+        :param operation: Name of Node method.
+        :return: New tree holding the result.
+        """
+        self._check_operand(other)
+        self._unshare()
+        other._unshare()
+        return super()._combine(other, operation)
@@ -0,0 +1,341 @@
+from bisect import bisect_right
+from multiprocessing import Pipe, Process
+from typing import Any, Iterator
+from AVLTree.AVLTree import AVLTree, Q, Iq
+"""AVLTree range partitioned across worker processes.
+
+Each shard is an AVLTree in a process of its own, so shards work on batches in parallel, each on its own core, rather
+than taking turns holding the GIL.
+
+"""
+
+
+def _serve(tree: AVLTree, kind: str, name: str, args: tuple) -> Any:
+    """Runs one request against a shard's tree.
+
+    :param tree: The shard's tree.
+    :param kind: 'call' returns the method's result, 'scan' the list of data a method yields, 'evict' removes and
+        returns data outside [args[0], args[1]).
+    :param name: Name of AVLTree method, unused by 'evict'.
+    :param args: Arguments of method.
+    :return: Result of request.
+    """
+    if kind == 'call':
+        return getattr(tree, name)(*args)
+    if kind == 'scan':
+        return list(getattr(tree, name)(*args))
+    low, high = args
+    evicted = []
+    if low is not None:
+        evicted.extend(tree.irange(None, low, (True, False)))
+    if high is not None:
+        evicted.extend(tree.irange(high, None))
+    tree.delete_many(evicted)
+    return evicted
+
+
+def _worker(conn: 'Connection', parent_pointers: bool) -> None:
+    """Serves requests from conn against a tree of its own until sent None.
+
+    :param conn: Worker's end of a Pipe.
+    :param parent_pointers: Passed to AVLTree.
+    """
+    tree = AVLTree(parent_pointers=parent_pointers)
+    while True:
+        request = conn.recv()
+        if request is None:
+            break
+        try:
+            conn.send((True, _serve(tree, *request)))
+        except Exception as error:
+            conn.send((False, error))
+    conn.close()
+
+
+class _ProcessShard(object):
+
+    """Shard served by a worker process. Requests are sent without waiting, so shards work in parallel.
+
+    """
+
+    def __init__(self, parent_pointers: bool) -> None:
+        self.conn, child = Pipe()
+        self.process = Process(target=_worker, args=(child, parent_pointers), daemon=True)
+        self.process.start()
+        child.close()
+
+    def request(self, kind: str, name: str, *args: Any) -> None:
+        self.conn.send((kind, name, args))
+
+    def result(self) -> Any:
+        ok, result = self.conn.recv()
+        if not ok:
+            raise result
+        return result
+
+    def close(self) -> None:
+        self.conn.send(None)
+        self.process.join()
+        self.conn.close()
+
+
+class _LocalShard(object):
+
+    """Shard served in the calling process, for platforms or tests without worker processes.
+
+    """
+
+    def __init__(self, parent_pointers: bool) -> None:
+        self.tree = AVLTree(parent_pointers=parent_pointers)
+        self.outcome = None
+
+    def request(self, kind: str, name: str, *args: Any) -> None:
+        try:
+            self.outcome = (True, _serve(self.tree, kind, name, args))
+        except Exception as error:
+            self.outcome = (False, error)
+
+    def result(self) -> Any:
+        ok, result = self.outcome
+        if not ok:
+            raise result
+        return result
+
+    def close(self) -> None:
+        self.tree.clear_tree()
+
+
+class ShardedAVLTree(object):
+
+    """AVLTree split by key range into shards, each a separate AVLTree, by default in a worker process of its own.
+
+    Shard i holds data from boundaries[i - 1] up to, not including, boundaries[i]. Batches are sorted, cut at the
+    boundaries and sent to every shard they touch before any reply is awaited. Range scans ask each shard in range for
+    its part and yield the parts in shard order, which is sorted order.
+
+    Without boundaries, all data starts in the first shard. Once a shard holds more than SKEW times its fair share,
+    data is moved between shards so each holds about the same amount, see rebalance.
+
+    Data and results cross process boundaries by pickling, so work is best sent in batches.
+
+    """
+
+    # A shard holding more than SKEW times the mean shard size triggers a rebalance.
+    SKEW = 2
+    # Trees smaller than this are never rebalanced automatically.
+    MIN_REBALANCE = 1000
+
+    def __init__(self, shards: int = 4, boundaries: Iq = None, processes: bool = True,
+                 parent_pointers: bool = False) -> None:
+        """Tree is represented by its shards and the boundaries between them.
+
+            Create a sharded tree, closing its worker processes when done:
+                with ShardedAVLTree(shards=4) as tree:
+                    tree.insert_many(data)
+                    tree.search_many(data)
+                    tree.delete_many(data)
+                    tree.irange(low, high)
+
+        :param shards: Number of shards. Ignored if boundaries are given.
+        :param boundaries: Optional ascending data at which each shard after the first begins.
+        :param processes: Set to False to keep shards in the calling process.
+        :param parent_pointers: Passed to each shard's AVLTree.
+        """
+        self.boundaries = sorted(set(boundaries)) if boundaries is not None else []
+        if boundaries is not None:
+            shards = len(self.boundaries) + 1
+        shard_type = _ProcessShard if processes else _LocalShard
+        self.shards = [shard_type(parent_pointers) for _ in range(shards)]
+        self.sizes = [0] * shards
+
+    def __enter__(self) -> 'ShardedAVLTree':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stops worker processes. The tree cannot be used afterwards.
+
+        """
+        for shard in self.shards:
+            shard.close()
+        self.shards = []
+
+    def __len__(self) -> int:
+        return sum(self.sizes)
+
+    def __iter__(self) -> Iterator[Q]:
+        return self.irange()
+
+    def _shard_of(self, data: Q) -> int:
+        """Finds the index of the shard owning data.
+
+        :param data: int, float, str.
+        :return: Shard index.
+        """
+        return bisect_right(self.boundaries, data)
+
+    def _route(self, data: Iq) -> dict:
+        """Sorts and deduplicates a batch and cuts it at the boundaries.
+
+        :param data: Iterable[int, float, str].
+        :return: Dict of shard index to that shard's sorted part of the batch.
+        """
+        parts = {}
+        for x in sorted(set(data)):
+            parts.setdefault(self._shard_of(x), []).append(x)
+        return parts
+
+    def _gather(self, requests: dict, sign: int = 0) -> dict:
+        """Sends each shard its request, then collects every reply, so shards work in parallel.
+
+        If a request cannot be sent, no more are sent. Every shard that was sent a request has its reply read before
+        the first error is raised, so no reply is left behind for a later request to read as its own, and sizes are
+        updated for every shard whose request succeeded.
+
+        :param requests: Dict of shard index to (kind, method name, *args).
+        :param sign: 1 if each result counts items added to its shard, -1 if removed, as the data an 'evict' returns
+            does, 0 if neither.
+        :return: Dict of shard index to result.
+        """
+        error = None
+        sent = []
+        for index, request in requests.items():
+            try:
+                self.shards[index].request(*request)
+            except Exception as failure:
+                error = failure
+                break
+            sent.append(index)
+        results = {}
+        for index in sent:
+            try:
+                result = self.shards[index].result()
+            except Exception as failure:
+                error = error or failure
+                continue
+            results[index] = result
+            if sign:
+                self.sizes[index] += sign * (len(result) if requests[index][0] == 'evict' else result)
+        if error is not None:
+            raise error
+        return results
+
+    def insert_many(self, data: Iq) -> int:
+        """Inserts a batch of data, each shard inserting its part in parallel.
+
+        :param data: Iterable[int, float, str].
+        :return: Number of items inserted, ie. not already in tree.
+        """
+        results = self._gather({index: ('call', 'insert_many', part) for index, part in self._route(data).items()}, 1)
+        self._check_skew()
+        return sum(results.values())
+
+    def delete_many(self, data: Iq) -> int:
+        """Deletes a batch of data, each shard deleting its part in parallel. Data not in tree is ignored silently.
+
+        :param data: Iterable[int, float, str].
+        :return: Number of items deleted.
+        """
+        results = self._gather({index: ('call', 'delete_many', part) for index, part in self._route(data).items()}, -1)
+        return sum(results.values())
+
+    def search_many(self, data: Iq) -> list:
+        """Searches for a batch of data, each shard searching its distinct part in parallel.
+
+        :param data: Iterable[int, float, str].
+        :return: List of bool, True where data in tree, in the order of data.
+        """
+        data = list(data)
+        parts = self._route(data)
+        results = self._gather({index: ('call', 'search_many', part) for index, part in parts.items()})
+        found = {x: hit for index, part in parts.items() for x, hit in zip(part, results[index])}
+        return [found[x] for x in data]
+
+    def insert(self, data: Q) -> None:
+        """Inserts data into its shard.
+
+        :param data: int, float, str.
+        """
+        self.insert_many([data])
+
+    def delete(self, data: Q) -> None:
+        """Deletes data from its shard. Alerts user if data is not in tree.
+
+        :param data: int, float, str.
+        """
+        if not self.delete_many([data]):
+            print(f'{data} not in tree, Cannot delete.')
+
+    def search(self, data: Q) -> bool:
+        """Searches data's shard for data.
+
+        :param data: int, float, str.
+        :return: bool. True if data in tree, else, False.
+        """
+        index = self._shard_of(data)
+        return self._gather({index: ('call', 'search', data)})[index]
+
+    def irange(self, low: Q = None, high: Q = None, inclusive: tuple = (True, True),
+               reverse: bool = False) -> Iterator[Q]:
+        """Yields data between low and high, in sorted order. Parameters as in AVLTree.irange.
+
+        Every shard in range scans its part in parallel, the parts are yielded one shard after another.
+
+        :return: Iterator over data in range.
+        """
+        first = 0 if low is None else self._shard_of(low)
+        last = len(self.shards) - 1 if high is None else self._shard_of(high)
+        indices = [index for index in range(first, last + 1) if self.sizes[index]]
+        parts = self._gather({index: ('scan', 'irange', low, high, inclusive, reverse) for index in indices})
+        for index in reversed(indices) if reverse else indices:
+            yield from parts[index]
+
+    def rank(self, data: Q) -> int:
+        """Finds number of items in tree less than data.
+
+        :param data: Data to be ranked, need not be in tree.
+        :return: int.
+        """
+        index = self._shard_of(data)
+        return sum(self.sizes[:index]) + self._gather({index: ('call', 'rank', data)})[index]
+
+    def select(self, index: int) -> Q:
+        """Finds data at index in sorted order.
+
+        :param index: int. 0 for the smallest item, len(tree) - 1 for the largest.
+        :return: Data at index.
+        """
+        if not 0 <= index < len(self):
+            raise IndexError(f'{index} out of range for tree of size {len(self)}.')
+        for shard, size in enumerate(self.sizes):
+            if index < size:
+                return self._gather({shard: ('call', 'select', index)})[shard]
+            index -= size
+
+    def _check_skew(self) -> None:
+        """Rebalances if a shard holds more than SKEW times the mean shard size.
+
+        """
+        total = len(self)
+        if total >= self.MIN_REBALANCE and max(self.sizes) * len(self.shards) > self.SKEW * total:
+            self.rebalance()
+
+    def rebalance(self) -> None:
+        """Moves boundaries so every shard holds an equal share of the data, then moves data to its new shard.
+
+        New boundaries are the data at ranks len(tree) * i / shards. Each shard hands over the data outside its new
+        range in parallel, which is then inserted into its new shards in parallel.
+
+        """
+        total = len(self)
+        count = len(self.shards)
+        if total < count:
+            return
+        self.boundaries = [self.select(total * i // count) for i in range(1, count)]
+        bounds = [None] + self.boundaries + [None]
+        evicted = self._gather({index: ('evict', None, bounds[index], bounds[index + 1])
+                                for index in range(count) if self.sizes[index]}, -1)
+        moved = [x for index in sorted(evicted) for x in evicted[index]]
+        self._gather({index: ('call', 'insert_many', part) for index, part in self._route(moved).items()}, 1)
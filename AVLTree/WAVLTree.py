@@ -0,0 +1,113 @@
+from collections import Counter
+from AVLTree.AVLTree import AVLTree, LeanNode, Node
+"""Weak AVL tree, a rank balanced tree rebalancing in O(1) rotations after a deletion.
+
+"""
+
+
+class LeanWAVLNode(LeanNode):
+
+    """LeanNode balanced by the weak AVL rules.
+
+    Tallness holds rank + 1, so missing children count 0 as in AVLTree. Every node's tallness is 1 or 2 more than each
+    child's, and a leaf's is 1. A tree built by insertions alone is an AVL tree, and insertion rebalances exactly as
+    AVLTree's does. Deletion differs: a node may be left 2 taller than both children, so where an AVL tree may rotate
+    at every level up to the root, the retrace here demotes nodes and ends with at most one single or double rotation.
+
+    """
+
+    __slots__ = ()
+
+    def _inspect_deletion(self, nodes: list, counts: Counter = None) -> 'LeanWAVLNode':
+        """Restores the weak AVL rules after deletion.
+
+        Retraces the path towards the root while a node is 3 taller than a child, or is a leaf of tallness 2. Such a
+        node is demoted if its other child is 2 shorter, both it and that child are demoted if the child's own
+        children are both 2 shorter, else a rotation ends the retrace.
+
+        :param nodes: Path of nodes from the root down to the parent of the deleted node.
+        :param counts: Optional Counter of the tree's rotations and path length. The number of nodes retraced is
+            added.
+        :return: Root of tree, which changes if a rotation happened there.
+        """
+        root = nodes[0]
+        depth = len(nodes)
+        while nodes:
+            cur_node = nodes.pop()
+            rank = cur_node.tallness
+            left = self._get_height(cur_node.left)
+            right = self._get_height(cur_node.right)
+
+            if rank - left < 3 and rank - right < 3:
+                if rank == 2 and not cur_node.left and not cur_node.right:
+                    cur_node.tallness = 1
+                    continue
+                break
+
+            sibling = cur_node.right if rank - left == 3 else cur_node.left
+            if rank - sibling.tallness == 2:
+                cur_node.tallness -= 1
+                continue
+            if (sibling.tallness - self._get_height(sibling.left) == 2 and
+                    sibling.tallness - self._get_height(sibling.right) == 2):
+                sibling.tallness -= 1
+                cur_node.tallness -= 1
+                continue
+
+            far, near = (sibling.left, sibling.right) if sibling is cur_node.left else (sibling.right, sibling.left)
+            if sibling.tallness - self._get_height(far) == 1:
+                top = self._rebalance_node(cur_node, sibling, far, counts)
+                sibling.tallness = rank
+                cur_node.tallness = rank - 1 if cur_node.left or cur_node.right else 1
+            else:
+                top = self._rebalance_node(cur_node, sibling, near, counts)
+                near.tallness = rank
+                sibling.tallness = cur_node.tallness = rank - 2
+            if nodes:
+                self._replace_child(nodes[-1], cur_node, top)
+            else:
+                root = top
+            break
+
+        if counts is not None:
+            counts['retraced'] += depth - len(nodes)
+        return root
+
+
+class WAVLNode(Node):
+
+    """Node balanced by the weak AVL rules, with a pointer to its parent.
+
+    """
+
+    __slots__ = ()
+
+    _inspect_deletion = LeanWAVLNode._inspect_deletion
+
+
+class WAVLTree(AVLTree):
+
+    """AVLTree engine balanced by the weak AVL rules, for deletion heavy workloads.
+
+    Same interface as AVLTree. Insertions alone keep it an AVL tree. Deletions make at most two rotations each. After
+    m insertions and any deletions, the tree is no more than 1.44 log2 m tall, as an AVL tree of m items may be,
+    nor more than 2 log2 n for n items.
+
+    height reports the root's rank + 1, the height itself until deletions leave nodes 2 taller than both children,
+    and an upper bound on it after. Split, join and set operations run AVLTree's algorithms unchanged, in the same
+    time: they read ranks only, never heights, and set each node they relink to 1 more than its taller child's rank,
+    which keeps the weak AVL rules, as siblings' ranks differ by at most 1.
+
+    """
+
+    def __init__(self, parent_pointers: bool = True) -> None:
+        """Tree is represented by its root node, initially None.
+
+            tree = WAVLTree()
+            tree.insert(data), tree.delete(data), tree.search(data)
+            tree.stats()['rotations_per_update']
+
+        :param parent_pointers: Set to False to build the tree from LeanWAVLNodes.
+        """
+        super().__init__(parent_pointers=parent_pointers)
+        self.node_type = WAVLNode if parent_pointers else LeanWAVLNode
@@ -1 +1 @@
-__all__ = ['AVLTree']
+__all__ = ['BalancedTree', 'AVLTree', 'ArrayAVLTree', 'AVLTreeMap', 'AVLMultiset', 'KeyedAVLTree', 'WAVLTree', 'BPlusTree', 'PersistentAVLTree', 'ConcurrentAVLTree', 'ShardedAVLTree', 'AsyncAVLTree', 'EytzingerTree', 'MappedAVLTree', 'FrozenAVLTree', 'DurableAVLTree']
@@ -0,0 +1,684 @@
+"""Benchmarks for AVLTree.
+
+Run all benchmarks:
+    python benchmark.py
+
+Run selected benchmarks, optionally with a key count:
+    python benchmark.py iterative --size 100000
+
+"""
+from AVLTree.AVLTree import AVLTree, Node, Q
+from AVLTree.ArrayAVLTree import ArrayAVLTree
+from AVLTree.ConcurrentAVLTree import ConcurrentAVLTree
+from AVLTree.ShardedAVLTree import ShardedAVLTree
+from AVLTree.MappedAVLTree import MappedAVLTree
+from AVLTree.DurableAVLTree import DurableAVLTree
+from AVLTree.KeyedAVLTree import KeyedAVLTree
+from AVLTree.WAVLTree import WAVLTree
+from AVLTree.BPlusTree import BPlusTree
+from AVLTree.AVLTreeMap import AVLTreeMap, SUM
+from collections import Counter
+from random import Random
+from timeit import default_timer as timer
+import contextlib
+import gc
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import tracemalloc
+
+
+class RecursiveNode(Node):
+
+    """Node using the recursive insert, search, delete and retraces of earlier releases, kept for comparison.
+
+    """
+
+    def search(self, cur_node: 'Node', data: Q) -> bool:
+        if data == cur_node.data:
+            return True
+        elif data < cur_node.data and cur_node.left:
+            return self.search(cur_node.left, data)
+        elif data > cur_node.data and cur_node.right:
+            return self.search(cur_node.right, data)
+        return False
+
+    def insert(self, cur_node: 'Node', data: Q, repeated_data: list) -> list:
+        if data < cur_node.data:
+            if not cur_node.left:
+                cur_node.left = RecursiveNode(data)
+                cur_node.left.parent = cur_node
+                self._inspect_insertion(cur_node.left, [])
+            else:
+                self.insert(cur_node.left, data, repeated_data)
+            return repeated_data
+        elif data > cur_node.data:
+            if not cur_node.right:
+                cur_node.right = RecursiveNode(data)
+                cur_node.right.parent = cur_node
+                self._inspect_insertion(cur_node.right, [])
+            else:
+                self.insert(cur_node.right, data, repeated_data)
+            return repeated_data
+        elif data == cur_node.data and cur_node.parent is not None:
+            repeated_data += [1]
+            return repeated_data
+
+    def _inspect_insertion(self, cur_node: 'Node', nodes: list) -> None:
+        if not cur_node.parent:
+            return
+        nodes = [cur_node] + nodes
+        left = self._get_height(cur_node.parent.left)
+        right = self._get_height(cur_node.parent.right)
+        if abs(left - right) > 1 and len(nodes) > 1:
+            nodes = [cur_node.parent] + nodes
+            top = self._rebalance_node(*nodes[:3])
+            if top.parent:
+                self._replace_child(top.parent, nodes[0], top)
+            return
+        new = 1 + cur_node.tallness
+        if new > cur_node.parent.tallness:
+            cur_node.parent.tallness = new
+        self._inspect_insertion(cur_node.parent, nodes)
+
+    def delete(self, node: 'Node', nodes: list = None, counts: Counter = None) -> 'Node':
+        if node.left and node.right:
+            successor = node.right
+            while successor.left:
+                successor = successor.left
+            node.data = successor.data
+            return self.delete(successor)
+        parent = node.parent
+        child = node.left or node.right
+        if child:
+            child.parent = parent
+        if not parent:
+            return child
+        self._replace_child(parent, node, child)
+        self._inspect_deletion(parent)
+        while parent.parent:
+            parent = parent.parent
+        return parent
+
+    def _inspect_deletion(self, cur_node: 'Node') -> None:
+        left = self._get_height(cur_node.left)
+        right = self._get_height(cur_node.right)
+        if abs(left - right) > 1:
+            y = self.taller_child(cur_node)
+            x = self.taller_child(y, prefer_left=y is cur_node.left)
+            top = self._rebalance_node(cur_node, y, x)
+            if top.parent:
+                self._replace_child(top.parent, cur_node, top)
+            cur_node = top
+        else:
+            cur_node.tallness = 1 + max(left, right)
+        if cur_node.parent:
+            self._inspect_deletion(cur_node.parent)
+
+
+class RecursiveAVLTree(AVLTree):
+
+    """AVLTree driven by RecursiveNode.
+
+    """
+
+    def _insert(self, root: 'Node', data: Q) -> None:
+        if not root:
+            self.root = self.min_node = self.max_node = RecursiveNode(data)
+            self.size += 1
+            return
+        if not root.insert(root, data, []):
+            self.size += 1
+            self._extend_extremes(data)
+        while self.root.parent:
+            self.root = self.root.parent
+
+    def _find_node(self, cur_node: 'Node', data: Q, nodes: list = None) -> 'Node':
+        if cur_node and data == cur_node.data:
+            return cur_node
+        elif cur_node:
+            nodes.append(cur_node)
+        if cur_node and data < cur_node.data:
+            return self._find_node(cur_node.left, data, nodes)
+        elif cur_node and data > cur_node.data:
+            return self._find_node(cur_node.right, data, nodes)
+        return None
+
+
+class ClimbingAVLTree(AVLTree):
+
+    """AVLTree climbing parent pointers to its root before each operation, twice per insert, as earlier releases did.
+
+    """
+
+    def _climb(self) -> 'Node':
+        while self.root and self.root.parent:
+            self.root = self.root.parent
+        return self.root
+
+    def search(self, data: Q, print_result: bool = False) -> bool:
+        self._climb()
+        return super().search(data, print_result)
+
+    def _insert(self, root: 'Node', data: Q, *fields) -> None:
+        self._climb()
+        super()._insert(self._climb(), data, *fields)
+
+    def delete(self, data: Q) -> None:
+        self._climb()
+        super().delete(data)
+
+
+class DictNode(object):
+
+    """Node laid out as in earlier releases, with attributes in a per-instance __dict__.
+
+    """
+
+    def __init__(self, data: Q) -> None:
+        self.data = data
+        self.parent = None
+        self.left = None
+        self.right = None
+        self.tallness = 1
+
+
+class MutexAVLTree(object):
+
+    """AVLTree behind one global mutex, the usual way of sharing a tree between threads.
+
+    """
+
+    def __init__(self) -> None:
+        self.tree = AVLTree()
+        self.lock = threading.Lock()
+
+    def search(self, data: Q) -> bool:
+        with self.lock:
+            return self.tree.search(data)
+
+    def insert(self, data: Q) -> None:
+        with self.lock:
+            self.tree.insert(data)
+
+    def delete_many(self, data: list) -> int:
+        with self.lock:
+            return self.tree.delete_many(data)
+
+
+def time_ops(tree: AVLTree, keys: list, probes: list, doomed: list) -> dict:
+    """Times insert, search and delete of keys on tree.
+
+    :param tree: Empty tree.
+    :param keys: Keys to insert.
+    :param probes: Keys to search for.
+    :param doomed: Keys to delete.
+    :return: Dict of operation name to microseconds per operation.
+    """
+    results = {}
+    then = timer()
+    for key in keys:
+        tree.insert(key)
+    results['insert'] = (timer() - then) / len(keys) * 1e6
+    then = timer()
+    for key in probes:
+        tree.search(key)
+    results['search'] = (timer() - then) / len(probes) * 1e6
+    then = timer()
+    for key in doomed:
+        tree.delete(key)
+    results['delete'] = (timer() - then) / len(doomed) * 1e6
+    return results
+
+
+def bench_iterative(size: int) -> None:
+    """Compares the iterative engine with the recursive one it replaced."""
+    rand = Random(79)
+    keys = rand.sample(range(size * 10), size)
+    probes = [rand.choice(keys) for _ in range(size)]
+    doomed = keys[::2]
+    recursive = time_ops(RecursiveAVLTree(), keys, probes, doomed)
+    iterative = time_ops(AVLTree(), keys, probes, doomed)
+    print(f'iterative vs recursive, {size} keys (us/op)')
+    print(f'    {"":<8}{"recursive":>10}{"iterative":>10}{"speedup":>9}')
+    for op in ('insert', 'search', 'delete'):
+        print(f'    {op:<8}{recursive[op]:>10.2f}{iterative[op]:>10.2f}{recursive[op] / iterative[op]:>8.2f}x')
+
+
+def bench_root(size: int) -> None:
+    """Measures the per operation cost of climbing to the root, which the tree now tracks instead."""
+    rand = Random(79)
+    keys = rand.sample(range(size * 10), size)
+    probes = [rand.choice(keys) for _ in range(size)]
+    doomed = keys[::2]
+    climbing, tracked = {}, {}
+    for _ in range(5):
+        for best, tree_type in ((climbing, ClimbingAVLTree), (tracked, AVLTree)):
+            gc.collect()
+            for op, cost in time_ops(tree_type(), keys, probes, doomed).items():
+                best[op] = min(cost, best.get(op, cost))
+    print(f'tracked root vs climbing to it, {size} keys, best of 5 (us/op)')
+    print(f'    {"":<8}{"climbing":>10}{"tracked":>10}{"saved":>8}')
+    for op in ('insert', 'search', 'delete'):
+        print(f'    {op:<8}{climbing[op]:>10.2f}{tracked[op]:>10.2f}{climbing[op] - tracked[op]:>8.2f}')
+
+
+def traced_bytes(build: 'callable') -> int:
+    """Measures memory allocated by build with tracemalloc.
+
+    :param build: Function allocating the structure to be measured. Its result is kept alive until measured.
+    :return: Bytes allocated.
+    """
+    tracemalloc.start()
+    kept = build()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return allocated
+
+
+def bench_memory(size: int) -> None:
+    """Reports bytes per key of each node layout."""
+    keys = Random(79).sample(range(size * 10), size)
+    slots = [None] * size
+
+    def dict_nodes() -> list:
+        for i, key in enumerate(keys):
+            slots[i] = DictNode(key)
+        return slots
+
+    def tree(make: 'callable') -> 'callable':
+        def build() -> AVLTree:
+            built = make()
+            built.insert(keys)
+            return built
+        return build
+
+    layouts = (('__dict__ Node', dict_nodes),
+               ('Node', tree(AVLTree)),
+               ('LeanNode', tree(lambda: AVLTree(parent_pointers=False))),
+               ('ArrayAVLTree', tree(ArrayAVLTree)),
+               ("ArrayAVLTree 'q'", tree(lambda: ArrayAVLTree('q'))))
+    print(f'memory, {size} keys (bytes/key, keys themselves excluded)')
+    for name, build in layouts:
+        print(f'    {name:<18}{traced_bytes(build) / size:>8.1f}')
+
+
+def bench_bulk(size: int) -> None:
+    """Compares bulk loading with inserting keys one at a time."""
+    keys = Random(79).sample(range(size * 10), size)
+    ordered = sorted(keys)
+    loads = (('insert', lambda: AVLTree().insert(keys)),
+             ('from_iterable', lambda: AVLTree.from_iterable(keys)),
+             ('from_sorted', lambda: AVLTree.from_sorted(ordered)))
+    print(f'bulk load, {size} keys (s)')
+    for name, load in loads:
+        then = timer()
+        load()
+        print(f'    {name:<16}{timer() - then:>8.3f}')
+
+
+def bench_batch(size: int) -> None:
+    """Compares insert_many and delete_many with one call per key, at several batch sizes."""
+    rand = Random(79)
+    keys = rand.sample(range(size * 10), size)
+    print(f'batches into a tree of {size} keys, half the deletes missing (s)')
+    print(f'    {"batch":<10}{"insert":>10}{"many":>10}{"delete":>10}{"many":>10}')
+    for batch_size in (size // 100, size // 10, size, size * 2):
+        batch = rand.sample(range(size * 10), batch_size)
+        doomed = rand.sample(keys, batch_size // 2) + rand.sample(range(size * 10, size * 20), batch_size // 2)
+        times = []
+        for one_by_one in (True, False):
+            tree = AVLTree.from_iterable(keys)
+            then = timer()
+            if one_by_one:
+                tree.insert(batch)
+            else:
+                tree.insert_many(batch)
+            times.append(timer() - then)
+            then = timer()
+            with contextlib.redirect_stdout(io.StringIO()):
+                if one_by_one:
+                    for key in doomed:
+                        tree.delete(key)
+                else:
+                    tree.delete_many(doomed)
+            times.append(timer() - then)
+        print(f'    {batch_size:<10}{times[0]:>10.3f}{times[2]:>10.3f}{times[1]:>10.3f}{times[3]:>10.3f}')
+
+
+def bench_merge(size: int) -> None:
+    """Compares union with inserting every key of one tree into the other, at several sizes of the smaller tree."""
+    rand = Random(79)
+    keys = rand.sample(range(size * 10), size)
+    print(f'merging into a tree of {size} keys (s)')
+    print(f'    {"merged":<10}{"insert":>10}{"union":>10}')
+    for other_size in (size // 100, size // 10, size):
+        other = rand.sample(range(size * 10), other_size)
+        times = []
+        for use_union in (False, True):
+            tree, other_tree = AVLTree.from_iterable(keys), AVLTree.from_iterable(other)
+            then = timer()
+            if use_union:
+                tree.union(other_tree)
+            else:
+                tree.insert(list(other_tree))
+            times.append(timer() - then)
+        print(f'    {other_size:<10}{times[0]:>10.3f}{times[1]:>10.3f}')
+
+
+def bench_concurrent(size: int, seconds: float = 1.0) -> None:
+    """Measures search and write throughput with several reader threads and one writer thread."""
+    keys = Random(79).sample(range(size * 10), size)
+    print(f'concurrent reads and writes on a tree of {size} keys, one writer (ops/s)')
+    print(f'    {"":<10}{"readers":>8}{"reads":>10}{"writes":>10}')
+    for name, make in (('mutex', MutexAVLTree), ('rwlock', lambda: ConcurrentAVLTree(snapshot_reads=False)),
+                       ('snapshot', ConcurrentAVLTree)):
+        for readers in (1, 4):
+            tree = make()
+            for key in keys:
+                tree.insert(key)
+            stop = threading.Event()
+            counts = [0] * (readers + 1)
+
+            def read(slot: int) -> None:
+                rand = Random(slot)
+                while not stop.is_set():
+                    tree.search(rand.choice(keys))
+                    counts[slot] += 1
+
+            def write() -> None:
+                rand = Random(0)
+                while not stop.is_set():
+                    key = rand.randrange(size * 10)
+                    tree.insert(key)
+                    tree.delete_many([key])
+                    counts[readers] += 2
+
+            threads = [threading.Thread(target=read, args=(slot,)) for slot in range(readers)]
+            threads.append(threading.Thread(target=write))
+            for thread in threads:
+                thread.start()
+            stop.wait(seconds)
+            stop.set()
+            for thread in threads:
+                thread.join()
+            print(f'    {name:<10}{readers:>8}{sum(counts[:readers]) / seconds:>10.0f}{counts[readers] / seconds:>10.0f}')
+
+
+def bench_sharded(size: int, batch_size: int = 10000) -> None:
+    """Compares ingesting batches into one AVLTree with ingesting them into trees sharded across processes."""
+    rand = Random(79)
+    keys = rand.sample(range(size * 10), size)
+    batches = [keys[i:i + batch_size] for i in range(0, size, batch_size)]
+    probes = rand.sample(range(size * 10), size)
+    print(f'ingesting {size} keys in batches of {batch_size}, then searching for {size} (s)')
+    print(f'    {"":<12}{"insert":>10}{"search":>10}')
+    tree = AVLTree()
+    then = timer()
+    for batch in batches:
+        tree.insert_many(batch)
+    ingest = timer() - then
+    then = timer()
+    for key in probes:
+        tree.search(key)
+    print(f'    {"AVLTree":<12}{ingest:>10.3f}{timer() - then:>10.3f}')
+    for shards in (2, 4):
+        with ShardedAVLTree(boundaries=range(size * 10 // shards, size * 10, size * 10 // shards)) as sharded:
+            then = timer()
+            for batch in batches:
+                sharded.insert_many(batch)
+            ingest = timer() - then
+            then = timer()
+            sharded.search_many(probes)
+            print(f'    {f"{shards} shards":<12}{ingest:>10.3f}{timer() - then:>10.3f}')
+
+
+def bench_restore(size: int) -> None:
+    """Compares ways of getting a saved tree back, and searching the memory mapped file with searching a tree."""
+    rand = Random(79)
+    keys = rand.sample(range(size * 10), size)
+    probes = [rand.choice(keys) for _ in range(size)]
+    path = os.path.join(tempfile.mkdtemp(), 'tree.avl')
+    AVLTree.from_iterable(keys).dump(path)
+    print(f'restoring a tree of {size} keys (s)')
+    loads = (('insert', lambda: AVLTree().insert(keys)),
+             ('load', lambda: AVLTree.load(path)),
+             ('mmap', lambda: MappedAVLTree(path)))
+    for name, load in loads:
+        then = timer()
+        load()
+        print(f'    {name:<16}{timer() - then:>8.3f}')
+    print(f'searching for {size} keys (s)')
+    for name, tree in (('AVLTree', AVLTree.load(path)), ('MappedAVLTree', MappedAVLTree(path))):
+        then = timer()
+        for key in probes:
+            tree.search(key)
+        print(f'    {name:<16}{timer() - then:>8.3f}')
+    os.remove(path)
+
+
+class Record(object):
+
+    """Element ordered by a Python level __lt__, as records wrapped for AVLTree are."""
+
+    __slots__ = ('timestamp',)
+
+    def __init__(self, timestamp: int) -> None:
+        self.timestamp = timestamp
+
+    def __lt__(self, other: 'Record') -> bool:
+        return self.timestamp < other.timestamp
+
+    def __gt__(self, other: 'Record') -> bool:
+        return self.timestamp > other.timestamp
+
+    def __eq__(self, other: 'Record') -> bool:
+        return self.timestamp == other.timestamp
+
+    def __hash__(self) -> int:
+        return hash(self.timestamp)
+
+
+def bench_keyed(size: int) -> None:
+    """Compares records compared by __lt__ in an AVLTree with records ordered by a cached key."""
+    records = [Record(timestamp) for timestamp in Random(79).sample(range(size * 10), size)]
+    print(f'inserting then searching for {size} records (s)')
+    print(f'    {"":<16}{"insert":>10}{"search":>10}')
+    for name, tree in (('AVLTree', AVLTree()), ('KeyedAVLTree', KeyedAVLTree(key=lambda record: record.timestamp))):
+        then = timer()
+        for record in records:
+            tree.insert(record)
+        insert = timer() - then
+        then = timer()
+        for record in records:
+            tree.search(record)
+        print(f'    {name:<16}{insert:>10.3f}{timer() - then:>10.3f}')
+
+
+def bench_lookups(size: int) -> None:
+    """Compares searching and ranking a batch one key at a time with the batch methods."""
+    rand = Random(79)
+    tree = AVLTree.from_iterable(rand.sample(range(size * 10), size))
+    print(f'looking up batches of keys in a tree of {size} keys (s)')
+    print(f'    {"batch":<10}{"search":>10}{"search_many":>14}{"rank":>10}{"rank_many":>12}')
+    for batch_size in (size // 100, size // 10, size):
+        probes = rand.sample(range(size * 10), batch_size)
+        times = []
+        for lookup in (lambda: [tree.search(key) for key in probes], lambda: tree.search_many(probes),
+                       lambda: [tree.rank(key) for key in probes], lambda: tree.rank_many(probes)):
+            then = timer()
+            lookup()
+            times.append(timer() - then)
+        print(f'    {batch_size:<10}{times[0]:>10.3f}{times[1]:>14.3f}{times[2]:>10.3f}{times[3]:>12.3f}')
+
+
+def bench_frozen(size: int) -> None:
+    """Compares searching a tree with searching its frozen copy, one key at a time and in one batch."""
+    rand = Random(79)
+    keys = rand.sample(range(size * 10), size)
+    probes = rand.sample(range(size * 10), size)
+    tree = AVLTree.from_iterable(keys)
+    then = timer()
+    frozen = tree.freeze()
+    print(f'freezing a tree of {size} keys (s)')
+    print(f'    {"freeze":<16}{timer() - then:>8.3f}')
+    print(f'searching for {size} keys (s)')
+    searches = (('AVLTree', lambda: [tree.search(key) for key in probes]),
+                ('FrozenAVLTree', lambda: [frozen.search(key) for key in probes]),
+                ('search_many', lambda: frozen.search_many(probes)))
+    for name, search in searches:
+        then = timer()
+        search()
+        print(f'    {name:<16}{timer() - then:>8.3f}')
+
+
+def bench_durable(size: int) -> None:
+    """Measures logged insertions at several group commit sizes, and recovery from snapshot and log."""
+    keys = Random(79).sample(range(size * 10), size)
+    print(f'durable insertions of {size // 10} keys, one at a time (us/op), then recovery of {size} keys (s)')
+    for sync_every in (1, 16, 256):
+        directory = tempfile.mkdtemp()
+        with DurableAVLTree(directory, sync_every=sync_every) as tree:
+            then = timer()
+            for key in keys[:size // 10]:
+                tree.insert(key)
+            print(f'    sync_every {sync_every:<6}{(timer() - then) / (size // 10) * 1e6:>8.1f}')
+        shutil.rmtree(directory)
+    directory = tempfile.mkdtemp()
+    with DurableAVLTree(directory, snapshot_every=size // 2) as tree:
+        tree.insert_many(keys)
+    then = timer()
+    DurableAVLTree(directory).close()
+    print(f'    {"recovery":<17}{timer() - then:>8.3f}')
+    shutil.rmtree(directory)
+
+
+def bench_stats(size: int, calls: int = 100) -> None:
+    """Compares the height scan of earlier releases with the height and stats the tree now keeps."""
+    tree = AVLTree.from_iterable(Random(79).sample(range(size * 10), size))
+    print(f'calls on a tree of {size} keys (us/call)')
+    for name, call in (('height scan', lambda: tree.root.height(tree.root, 0)), ('height', tree.height),
+                       ('stats', tree.stats)):
+        then = timer()
+        for _ in range(calls):
+            call()
+        print(f'    {name:<16}{(timer() - then) / calls * 1e6:>12.2f}')
+
+
+def bench_retrace(size: int) -> None:
+    """Shows rotations and nodes retraced per update staying constant as the tree, and its height, grows."""
+    rand = Random(79)
+    print('per update, inserting keys one at a time then deleting half of them')
+    print(f'    {"keys":<10}{"height":>8}{"insert rotations":>18}{"retraced":>10}{"delete rotations":>18}'
+          f'{"retraced":>10}')
+    for keys in (size // 100, size // 10, size):
+        data = rand.sample(range(keys * 10), keys)
+        tree = AVLTree()
+        for key in data:
+            tree.insert(key)
+        inserted = tree.stats()
+        counts = tree.counts.copy()
+        for key in data[::2]:
+            tree.delete(key)
+        deleted = tree.counts - counts
+        rotations = sum(deleted[kind] for kind in ('left', 'right', 'left_right', 'right_left'))
+        print(f'    {keys:<10}{inserted["height"]:>8}{inserted["rotations_per_update"]:>18.2f}'
+              f'{inserted["retraced_per_update"]:>10.2f}{rotations / deleted["deletions"]:>18.2f}'
+              f'{deleted["retraced"] / deleted["deletions"]:>10.2f}')
+
+
+def bench_engines(size: int, scans: int = 100) -> None:
+    """Compares the BalancedTree engines on updates, lookups and scans."""
+    rand = Random(79)
+    keys = rand.sample(range(size * 10), size)
+    probes = [rand.choice(keys) for _ in range(size)]
+    doomed = keys[::2]
+    ranges = [sorted(rand.sample(range(size * 10), 2)) for _ in range(scans)]
+    print(f'engines, {size} keys (us/op), then a full scan and {scans} range scans (s)')
+    print(f'    {"":<14}{"insert":>8}{"search":>8}{"delete":>8}{"scan":>8}{"ranges":>8}{"rotations/delete":>18}')
+    for name, engine in (('AVLTree', AVLTree), ('WAVLTree', WAVLTree), ('BPlusTree', BPlusTree),
+                         ('ArrayAVLTree', ArrayAVLTree)):
+        gc.collect()
+        tree = engine()
+        results = time_ops(tree, keys, probes, doomed[:size // 4])
+        then = timer()
+        for _ in tree:
+            pass
+        scan = timer() - then
+        then = timer()
+        for low, high in ranges:
+            for _ in tree.irange(low, high):
+                pass
+        scanned = timer() - then
+        rotations = ''
+        if hasattr(tree, 'stats'):
+            counts = tree.counts.copy()
+            for key in doomed[size // 4:]:
+                tree.delete(key)
+            deleted = tree.counts - counts
+            made = sum(deleted[kind] for kind in ('left', 'right', 'left_right', 'right_left'))
+            rotations = f'{made / deleted["deletions"]:.3f}'
+        print(f'    {name:<14}{results["insert"]:>8.2f}{results["search"]:>8.2f}{results["delete"]:>8.2f}'
+              f'{scan:>8.3f}{scanned:>8.3f}{rotations:>18}')
+
+
+def bench_aggregate(size: int, queries: int = 1000) -> None:
+    """Compares summing values over key ranges by walking them with summing the summaries the nodes keep."""
+    rand = Random(79)
+    items = {key: rand.random() for key in rand.sample(range(size * 10), size)}
+    ranges = [sorted(rand.sample(range(size * 10), 2)) for _ in range(queries)]
+    plain, summed = AVLTreeMap(), AVLTreeMap(monoid=SUM)
+
+    def walk(low: int, high: int) -> float:
+        return sum(value for _, value in plain.irange_items(low, high))
+
+    print(f'building maps of {size} items, then summing {queries} key ranges (s)')
+    print(f'    {"":<16}{"build":>8}{"update":>8}{"sums":>8}')
+    for name, mapping, total in (('irange_items', plain, walk), ('aggregate', summed, summed.aggregate)):
+        then = timer()
+        for key, value in items.items():
+            mapping[key] = value
+        build = timer() - then
+        then = timer()
+        for key in list(items)[:size // 10]:
+            mapping[key] = 1.0
+        update = timer() - then
+        then = timer()
+        for low, high in ranges:
+            total(low, high)
+        print(f'    {name:<16}{build:>8.3f}{update:>8.3f}{timer() - then:>8.3f}')
+
+
+BENCHMARKS = {
+    'iterative': bench_iterative,
+    'root': bench_root,
+    'memory': bench_memory,
+    'bulk': bench_bulk,
+    'batch': bench_batch,
+    'merge': bench_merge,
+    'concurrent': bench_concurrent,
+    'sharded': bench_sharded,
+    'restore': bench_restore,
+    'lookups': bench_lookups,
+    'keyed': bench_keyed,
+    'frozen': bench_frozen,
+    'durable': bench_durable,
+    'stats': bench_stats,
+    'retrace': bench_retrace,
+    'engines': bench_engines,
+    'aggregate': bench_aggregate,
+}
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    size = 100000
+    if '--size' in args:
+        size = int(args[args.index('--size') + 1])
+        del args[args.index('--size'):args.index('--size') + 2]
+    for name in args or BENCHMARKS:
+        BENCHMARKS[name](size)
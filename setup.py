@@ -13,6 +13,7 @@ setuptools.setup(
     long_description_content_type='text/markdown',
     url='https://github.com/llpk79/AVLTree',
     packages=setuptools.find_packages(),
+    extras_require={'numpy': ['numpy']},
     classifiers=['Programming Language :: Python :: 3',
                  'License :: OSI Approved :: GNU General Public License v3 (GPLv3)',
                  'Operating System :: OS Independent'],
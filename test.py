@@ -1,7 +1,26 @@
 from AVLTree.AVLTree import AVLTree, Node
-from random import randint
+from AVLTree.BalancedTree import BalancedTree
+from AVLTree.ArrayAVLTree import ArrayAVLTree
+from AVLTree.WAVLTree import WAVLTree
+from AVLTree.BPlusTree import BPlusTree
+from AVLTree.AVLTreeMap import AVLTreeMap, Monoid, SUM, MAX
+from AVLTree.AVLMultiset import AVLMultiset
+from AVLTree.KeyedAVLTree import KeyedAVLTree
+from AVLTree.PersistentAVLTree import PersistentAVLTree
+from AVLTree.ConcurrentAVLTree import ConcurrentAVLTree
+from AVLTree.ShardedAVLTree import ShardedAVLTree
+from AVLTree.AsyncAVLTree import AsyncAVLTree
+from AVLTree.MappedAVLTree import MappedAVLTree
+from AVLTree.DurableAVLTree import DurableAVLTree
+from random import randint, sample
 from timeit import default_timer as timer
 from time import localtime as time
+from threading import Thread
+import asyncio
+import os
+import struct
+import tempfile
+import zlib
 
 
 def node_is_balanced(node: Node) -> bool:
@@ -361,6 +380,396 @@ print(is_avl_tree(tree.root))
 tree.clear_tree()
 
 
+# Deleting many nodes keeps the tree balanced.
+print('delete half')
+for data in range(2000):
+    tree.insert(data)
+for data in range(0, 2000, 2):
+    tree.delete(data)
+print(is_avl_tree(tree.root))
+print(tree.height() <= 15)
+tree.clear_tree()
+
+
+# Tree without parent pointers.
+print('lean nodes')
+lean = AVLTree(parent_pointers=False)
+for data in range(1000, 0, -1):
+    lean.insert(data)
+for data in range(3, 1000, 3):
+    lean.delete(data)
+print(is_avl_tree(lean.root))
+print(len(lean) == 667)
+print(lean.search(500), lean.search(501))
+
+
+# Bulk load.
+print('bulk load')
+values = sample(range(-5000, 5000), 3000)
+bulk = AVLTree.from_iterable(values + values[:100])
+print(is_avl_tree(bulk.root))
+print(len(bulk) == 3000)
+print(all(bulk.search(data) for data in values))
+bulk = AVLTree.from_sorted(sorted(values), parent_pointers=False)
+print(is_avl_tree(bulk.root))
+bulk.insert(values[0] + 10000)
+print(len(bulk) == 3001)
+
+
+# Batch insert and delete.
+print('batches')
+batch_tree = AVLTree.from_iterable(range(0, 3000, 2))
+print(batch_tree.insert_many(range(0, 30, 3)) == 5)
+print(batch_tree.insert_many(range(3000)) == 1495)
+print(is_avl_tree(batch_tree.root))
+print(batch_tree.delete_many(range(2000, 4000)) == 1000)
+print(batch_tree.delete_many([5, 7, 5000]) == 2)
+print(is_avl_tree(batch_tree.root))
+print(len(batch_tree) == 1998)
+
+
+# Order statistics.
+print('order statistics')
+stats_tree = AVLTree()
+stats_tree.insert(range(100, 0, -1))
+for data in range(1, 101, 4):
+    stats_tree.delete(data)
+remaining = sorted(set(range(1, 101)) - set(range(1, 101, 4)))
+print(stats_tree.root.size == len(stats_tree) == 75)
+print([stats_tree.select(i) for i in range(75)] == remaining)
+print(stats_tree[0] == 2 and stats_tree[-1] == 100)
+print(stats_tree.rank(1) == 0 and stats_tree.rank(50) == 36 and stats_tree.rank(1000) == 75)
+print(stats_tree.count_range(10, 20) == 9 and stats_tree.count_range(20, 10) == 0)
+
+
+# Statistics kept by every update.
+print('stats')
+depths = []
+level = [(stats_tree.root, 0)]
+while level:
+    depths += [depth for _, depth in level]
+    level = [(child, depth + 1) for cur_node, depth in level for child in (cur_node.left, cur_node.right) if child]
+stats = stats_tree.stats()
+print(stats['size'] == 75 and stats['height'] == stats_tree.root.height(stats_tree.root, 0) == stats_tree.height())
+print(stats['min'] == 2 and stats['max'] == 100 and sum(stats['rotations'].values()) > 0)
+print(stats['average_depth'] == sum(depths) / 75)
+print(stats['updates'] == 125 and stats['rotations_per_update'] <= 1 and stats['retraced_per_update'] < 4)
+print(AVLTree.from_sorted(range(7)).stats()['average_depth'] == 10 / 7)
+left, _, right = AVLTree.from_sorted(range(7)).split(3)
+print(left.stats()['average_depth'] is None and left.stats()['size'] == 3)
+print(AVLTree().stats()['height'] == 0)
+
+
+# Batch lookups, a descent per item for few items, one sweep for many.
+print('batch lookups')
+for probes in ([1, 2, 50, 1000], list(range(-5, 110)) * 3):
+    print(stats_tree.search_many(probes) == [data in remaining for data in probes])
+    print(stats_tree.rank_many(probes) == [stats_tree.rank(data) for data in probes])
+    print(stats_tree.floor_many(probes) == [remaining.index(stats_tree.floor(data)) if stats_tree.floor(data) else -1
+                                            for data in probes])
+
+
+# Lazy iteration.
+print('iteration')
+print(list(stats_tree) == remaining)
+print(list(reversed(stats_tree)) == remaining[::-1])
+print(list(stats_tree.irange(10, 20)) == [10, 11, 12, 14, 15, 16, 18, 19, 20])
+print(list(stats_tree.irange(10, 20, inclusive=(False, False), reverse=True)) == [19, 18, 16, 15, 14, 12, 11])
+print(list(stats_tree.islice(5, 10)) == remaining[5:10])
+print(list(stats_tree.islice(-3, reverse=True)) == [100, 99, 98])
+deep = AVLTree.from_sorted(range(200000))
+print(next(deep.irange(123456)) == 123456)
+
+
+# Nearest items.
+print('nearest')
+near = AVLTree.from_sorted(range(0, 100, 10))
+print(near.floor(35) == 30 and near.floor(30) == 30 and near.floor(-1) is None)
+print(near.ceiling(35) == 40 and near.ceiling(40) == 40 and near.ceiling(91) is None)
+print(near.lower(30) == 20 and near.higher(30) == 40 and near.lower(0) is None and near.higher(90) is None)
+print(near.min() == 0 and near.max() == 90)
+print(near.pop_min() == 0 and near.pop_max() == 90 and near.min() == 10 and near.max() == 80)
+near.insert([5, 95])
+near.delete(10)
+print(near.min() == 5 and near.max() == 95 and len(near) == 9)
+print(is_avl_tree(near.root))
+
+
+# Sorted map.
+print('map')
+mapping = AVLTreeMap({data: str(data) for data in range(0, 100, 2)})
+mapping[51] = 'fifty-one'
+mapping[50] = 'fifty'
+del mapping[0]
+print(is_avl_tree(mapping.root))
+print(len(mapping) == 50 and mapping[50] == 'fifty' and mapping.get(49) is None)
+print(mapping.setdefault(52, 'x') == '52' and mapping.setdefault(53, 'x') == 'x')
+print(mapping.pop(53) == 'x' and mapping.pop(53, None) is None and 53 not in mapping)
+print(list(mapping.irange_items(48, 52)) == [(48, '48'), (50, 'fifty'), (51, 'fifty-one'), (52, '52')])
+print(list(mapping.items())[:2] == [(2, '2'), (4, '4')] and list(mapping.values())[-1] == '98')
+print(mapping.popitem() == (2, '2') and mapping.select(0) == 4)
+
+
+# Range aggregates, each node summarizing the values below it.
+print('aggregate')
+totals = AVLTreeMap({data: data * 10 for data in range(200)}, monoid=SUM)
+for data in range(0, 200, 3):
+    del totals[data]
+totals[100] = 5
+print(is_avl_tree(totals.root) and totals.root.summary == sum(totals.values()))
+print(totals.aggregate(50, 150) == sum(value for key, value in totals.items() if 50 <= key <= 150))
+print(totals.aggregate(50, 150, inclusive=(False, False)) == totals.aggregate(51, 149) and totals.aggregate(5, 4) == 0)
+peaks = AVLTreeMap({data: (data * 37) % 101 for data in range(300)}, monoid=MAX)
+print(peaks.aggregate(10, 20) == max((data * 37) % 101 for data in range(10, 21)))
+words = AVLTreeMap({3: 'c', 1: 'a', 2: 'b', 4: 'd'}, monoid=Monoid(lambda first, second: first + second, ''))
+print(words.aggregate(2, None) == 'bcd' and words.aggregate() == 'abcd')
+
+
+# Multiset, repeats counted on one node.
+print('multiset')
+bag = AVLMultiset([data % 10 for data in range(1000)])
+bag.insert(3)
+bag.insert(10)
+print(is_avl_tree(bag.root) and bag.size == 11 and len(bag) == 1002)
+print(bag.count(3) == 101 and bag.count(10) == 1 and bag.count(11) == 0)
+print(bag.remove_one(3) and bag.remove_all(4) == 100 and not bag.remove_one(4) and bag.remove_one(10))
+print(len(bag) == 900 and list(bag.irange_counts(2, 5)) == [(2, 100), (3, 100), (5, 100)])
+print(bag.delete_many([0] * 99 + [1] * 200) == 199 and bag.pop_min() == 0 and bag.min() == 2)
+print(len(bag) == 700 == len(list(bag)) and is_avl_tree(bag.root))
+bag_path = os.path.join(tempfile.mkdtemp(), 'bag.avl')
+bag.dump(bag_path)
+print(list(AVLMultiset.load(bag_path)) == list(bag) == list(bag.freeze()))
+os.remove(bag_path)
+os.rmdir(os.path.dirname(bag_path))
+print(list(AVLMultiset([1, 2, 2, 2, 3]).union(AVLMultiset([2, 2, 3, 3, 4]))) == [1, 2, 2, 2, 3, 3, 4] and
+      list(AVLMultiset([1, 2, 2, 2, 3]).difference(AVLMultiset([2, 3, 3]))) == [1, 2, 2])
+
+
+# Elements ordered by a key function, keys computed once.
+print('keyed')
+records = [(data % 97, str(data)) for data in range(300)]
+keyed = KeyedAVLTree(records, key=lambda record: record[0])
+print(is_avl_tree(keyed.root) and len(keyed) == 97 and keyed.get(5) == (5, '5') and (5, 'x') in keyed)
+print(list(reversed(keyed))[:2] == [(96, '96'), (95, '95')] and keyed[0] == keyed.min() == (0, '0'))
+keyed.delete((96, 'x'))
+keyed.insert((96, 'ninety-six'))
+print(keyed.floor(50.5) == (50, '50') and list(keyed.irange(94, 96, reverse=True)) == [(96, 'ninety-six'), (95, '95'), (94, '94')])
+try:
+    keyed.dump(os.path.join(tempfile.gettempdir(), 'keyed.avl'))
+    print(False)
+except TypeError:
+    print(True)
+try:
+    KeyedAVLTree.load(os.path.join(tempfile.gettempdir(), 'keyed.avl'))
+    print(False)
+except TypeError:
+    print(True)
+
+
+# Array backed tree.
+print('array tree')
+for array_tree in (ArrayAVLTree(), ArrayAVLTree('q')):
+    values = sample(range(-5000, 5000), 3000)
+    array_tree.insert(values)
+    for data in values[::3]:
+        array_tree.delete(data)
+    remaining = set(values) - set(values[::3])
+    print(list(array_tree) == sorted(remaining))
+    print(len(array_tree) == len(remaining))
+    print(array_tree.height() <= 15)
+    print(all(array_tree.search(data) for data in remaining))
+    ordered = sorted(remaining)
+    print(list(reversed(array_tree)) == ordered[::-1] and array_tree.min() == ordered[0] and
+          array_tree.max() == ordered[-1])
+    print(list(array_tree.irange(-100, 100)) == [data for data in ordered if -100 <= data <= 100] and
+          list(array_tree.irange(-100, 100, (False, False), reverse=True)) ==
+          [data for data in ordered[::-1] if -100 < data < 100])
+
+
+# Weak AVL tree, nodes 1 or 2 taller than each child.
+print('wavl tree')
+wavl = WAVLTree()
+values = sample(range(-5000, 5000), 3000)
+wavl.insert(values)
+print(is_avl_tree(wavl.root))
+for data in values[::3] + values[1::3]:
+    wavl.delete(data)
+remaining = sorted(values[2::3])
+ranks = [(cur_node.tallness, cur_node.left, cur_node.right) for cur_node in wavl._in_order_nodes()]
+print(all({tallness - (child.tallness if child else 0) for child in (left, right)} <= {1, 2} and
+          (left or right or tallness == 1) for tallness, left, right in ranks))
+print(list(wavl) == remaining and len(wavl) == wavl.root.size == 1000 and wavl.height() <= 20)
+print(wavl.stats()['rotations_per_update'] < 1)
+
+
+# B+ tree, data in sorted leaves.
+print('b+ tree')
+b_plus = BPlusTree(fanout=8)
+b_plus.insert(values)
+for data in values[::3] + values[1::3]:
+    b_plus.delete(data)
+print(list(b_plus) == remaining and list(reversed(b_plus)) == remaining[::-1] and len(b_plus) == 1000)
+print(all(b_plus.search(data) for data in remaining) and not b_plus.search(values[0]))
+print(list(b_plus.irange(-100, 100)) == [data for data in remaining if -100 <= data <= 100])
+print(b_plus.min() == remaining[0] and b_plus.max() == remaining[-1] and b_plus.height() <= 6)
+print(all(isinstance(engine, BalancedTree) for engine in (b_plus, AVLTree(), WAVLTree(), ArrayAVLTree())))
+
+
+# Split, join and set algebra.
+print('set algebra')
+evens, thirds = set(range(0, 300, 2)), set(sample(range(300), 100))
+for name, expected in (('union', evens | thirds), ('intersection', evens & thirds),
+                       ('difference', evens - thirds), ('symmetric_difference', evens ^ thirds)):
+    result = getattr(AVLTree.from_iterable(evens), name)(AVLTree.from_iterable(thirds))
+    print(is_avl_tree(result.root) and list(result) == sorted(expected) and len(result) == len(expected))
+    print(result.min() == min(expected) and result.max() == max(expected))
+left_tree, found, right_tree = AVLTree.from_iterable(evens).split(150)
+print(found and list(left_tree) == list(range(0, 150, 2)) and list(right_tree) == list(range(152, 300, 2)))
+print(is_avl_tree(left_tree.root) and is_avl_tree(right_tree.root))
+joined = AVLTree.join(left_tree, 151, right_tree)
+print(is_avl_tree(joined.root) and len(joined) == 150 and joined.search(151) and len(left_tree) == 0)
+
+
+# Persistent tree.
+print('persistent')
+versioned = PersistentAVLTree.from_iterable(range(100))
+before = versioned.snapshot()
+for data in range(0, 100, 3):
+    versioned.delete(data)
+versioned.insert(range(100, 150))
+middle = versioned.snapshot()
+versioned.insert_many(range(200, 400))
+print(is_avl_tree(versioned.root) and is_avl_tree(middle.root) and is_avl_tree(before.root))
+print(list(before) == list(range(100)) and len(before) == 100)
+print(list(middle) == [data for data in range(150) if data % 3 or data >= 100] and len(versioned) == 316)
+print(middle.min() == 1 and middle.max() == 149 and versioned.max() == 399)
+
+
+# Concurrent tree, readers checking consistent views while writers insert and delete.
+print('concurrent')
+for shared in (ConcurrentAVLTree(), ConcurrentAVLTree(snapshot_reads=False)):
+    torn_reads = []
+
+    def write(offset: int) -> None:
+        for data in range(offset, offset + 2000):
+            shared.insert(data)
+        shared.delete_many(range(offset, offset + 2000, 2))
+
+    def read() -> None:
+        for _ in range(50):
+            view = shared.snapshot()
+            found = list(view)
+            if found != sorted(found) or len(found) != len(view) or not is_avl_tree(view.root):
+                torn_reads.append(found)
+            shared.search(5)
+
+    threads = [Thread(target=write, args=(offset,)) for offset in (0, 10000)] + [Thread(target=read) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(not torn_reads and len(shared) == 2000 and list(shared.irange(0, 6)) == [1, 3, 5])
+
+
+# Sharded tree, skewed data moving to fresh shards.
+print('sharded')
+with ShardedAVLTree(shards=3) as sharded:
+    values = sample(range(100000), 6000)
+    print(sharded.insert_many(values) == 6000 and sharded.insert_many(values[:10]) == 0)
+    print(max(sharded.sizes) < 4000 and len(sharded.boundaries) == 2)
+    print(sharded.delete_many(values[::2]) == 3000 and len(sharded) == 3000)
+    remaining = sorted(values[1::2])
+    print(list(sharded) == remaining and list(sharded.irange(remaining[10], remaining[20])) == remaining[10:21])
+    print(sharded.rank(remaining[1500]) == 1500 and sharded.select(2999) == remaining[-1])
+    probes = [values[0], remaining[5], values[0], remaining[5], remaining[2999]]
+    print(sharded.search_many(probes) == [False, True, False, True, True] and not sharded.search(values[0]))
+
+
+# asyncio front end, requests of one tick applied together, scans interleaved with writes.
+print('async')
+
+
+async def use_async_tree() -> list:
+    async_tree = AsyncAVLTree()
+    await asyncio.gather(*(async_tree.insert(data) for data in range(0, 3000, 3)))
+    found = await asyncio.gather(async_tree.search(3), async_tree.delete(3), async_tree.search(3), async_tree.search(4))
+
+    async def write() -> None:
+        for data in range(3000, 3100):
+            await async_tree.insert(data)
+
+    scanned, _ = await asyncio.gather(async_tree.range(), write())
+    return [found == [True, None, False, False], scanned == sorted(scanned) and len(scanned) >= 999,
+            len(async_tree) == 1099 and is_avl_tree(async_tree.tree.root)]
+
+print(*asyncio.run(use_async_tree()), sep='\n')
+
+
+# Binary dump, load and memory mapped tree.
+print('dump and load')
+dump_path = os.path.join(tempfile.mkdtemp(), 'tree.avl')
+for saved in (AVLTree.from_iterable(sample(range(-5000, 5000), 3000)), AVLTree.from_iterable(['b', 'a', 'ñ', 'c'])):
+    saved.dump(dump_path)
+    loaded = AVLTree.load(dump_path)
+    print(is_avl_tree(loaded.root) and list(loaded) == list(saved) and loaded.height() == saved.height())
+    with MappedAVLTree(dump_path) as mapped:
+        data = saved.select(len(saved) // 2)
+        print(list(mapped) == list(saved) and mapped.search(data) and mapped.floor(data) == data)
+        print(list(mapped.irange(saved[1], saved[3])) == [saved[1], saved[2], saved[3]] and mapped.max() == saved.max())
+try:
+    AVLTree.from_iterable([1, 2 ** 70]).dump(dump_path)
+except OverflowError:
+    pass
+print(list(AVLTree.load(dump_path)) == list(saved))
+os.remove(dump_path)
+
+
+# Frozen tree.
+print('frozen')
+for kept in (sample(range(-5000, 5000), 3000), [data / 4 for data in range(100)], ['b', 'a', 'c'], [2 ** 70, 1]):
+    unfrozen = AVLTree.from_iterable(kept)
+    frozen = unfrozen.freeze()
+    probes = sorted(kept)[::2] + [-6000, 6000] if not isinstance(kept[0], str) else ['a', 'ab', 'c', 'd']
+    print(list(frozen) == list(unfrozen) and list(frozen.search_many(probes)) == [data in kept for data in probes])
+    print(all(frozen.ceiling(data) == unfrozen.ceiling(data) for data in probes) and frozen.height() <= unfrozen.height())
+
+
+# Durable tree, recovered from snapshot and log after a torn write.
+print('durable')
+durable_path = tempfile.mkdtemp()
+with DurableAVLTree(durable_path, sync_every=8, snapshot_every=500) as durable:
+    durable.insert_many(range(300))
+    durable.insert(range(300, 700))
+    durable.delete_many(range(0, 700, 7))
+    durable.delete(1)
+kept = [data for data in range(2, 700) if data % 7]
+with open(os.path.join(durable_path, 'wal.log'), 'ab') as log:
+    log.write(b'\x09\x00\x00\x00torn')
+with DurableAVLTree(durable_path) as durable:
+    print(list(durable) == kept and is_avl_tree(durable.tree.root))
+    durable.insert(1000)
+with DurableAVLTree(durable_path) as durable:
+    print(list(durable) == kept + [1000] and os.path.exists(os.path.join(durable_path, 'snapshot.avl')))
+    try:
+        durable.insert('a')
+    except TypeError:
+        pass
+    durable.insert_many([2 ** 70, 2.5])
+    durable.snapshot()
+with DurableAVLTree(durable_path) as durable:
+    print(list(durable) == sorted(kept + [1000, 2 ** 70, 2.5]))
+with open(os.path.join(durable_path, 'wal.log'), 'ab') as log:
+    log.write(struct.pack('<IIc', 2, zlib.crc32(b'+sa'), b'+') + b'sa')
+try:
+    DurableAVLTree(durable_path)
+    print(False)
+except TypeError:
+    print(True)
+for name in os.listdir(durable_path):
+    os.remove(os.path.join(durable_path, name))
+os.rmdir(durable_path)
+
+
 # Check lookup speed.
 
 DATA_SIZE = 100000